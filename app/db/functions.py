@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, bindparam
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class utcnow(FunctionElement):
+    """
+    Current time for server-side timestamps (column defaults and onupdate), with microseconds.
+    now() on PostgreSQL. SQLite's clock is precise to the millisecond only, too coarse for ETags and sync
+    cursors (two writes in the same millisecond would get the same time): statements bind the current time
+    of the Python clock instead, evaluated on every execution. Column defaults in the schema (DDL, which
+    can't have parameters) use the SQLite clock with milliseconds, formatted as SQLAlchemy stores datetimes.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+def _current_time() -> datetime:
+    return datetime.now(timezone.utc)
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw) -> str:
+    return "now()"
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw) -> str:
+    if kw.get("literal_binds"):
+        # DDL (server_default): a bound time would be rendered as a constant.
+        return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+    # A callable parameter is evaluated when the statement is executed, also from the compiled cache.
+    # Occurrences share its name, so they get the same time (created_at == updated_at, like now()).
+    return compiler.process(bindparam("utcnow", callable_=_current_time, type_=DateTime()), **kw)
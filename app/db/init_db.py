@@ -1,6 +1,18 @@
+from sqlalchemy import Engine
+
+from app.db.migrations import run_migrations
 from app.db.session import Base, engine
 from app.models.bug import Bug # noqa
+from app.models.bug_tombstone import BugTombstone # noqa
+from app.models.bug_similarity import bug_similarity_buckets # noqa
+from app.models.idempotency_key import IdempotencyKey # noqa
 from app.models.tag import Tag # noqa
 
-def init_db():
-        Base.metadata.create_all(engine)
\ No newline at end of file
+def init_db(bind: Engine = engine) -> None:
+        Base.metadata.create_all(bind)
+        # Migrations first: they add columns that indexes of existing tables may refer to.
+        run_migrations(bind)
+        # create_all() skips indexes of tables that already exist, so add the missing ones explicitly.
+        for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                        index.create(bind, checkfirst=True)
@@ -0,0 +1,147 @@
+from typing import Callable, Union
+
+from sqlalchemy import Connection, Engine, text
+
+# Rows written without timestamps get the other one, or the current time. Uses ix_bugs_created_at_id and
+# ix_bugs_updated_at_id (NULLs are indexed), so it is cheap once there is nothing left to fill.
+BACKFILL_BUG_TIMESTAMPS = [
+    "UPDATE bugs SET created_at = coalesce(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL",
+    "UPDATE bugs SET updated_at = created_at WHERE updated_at IS NULL",
+]
+
+
+def add_sqlite_tag_bug_count(connection: Connection) -> None:
+    """
+    Per-tag bug counter (see app.services.tag.adjust_tag_counts), backfilled once when the column is added.
+    """
+    columns = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(tags)")}
+    if "bug_count" in columns:
+        return
+    connection.exec_driver_sql("ALTER TABLE tags ADD COLUMN bug_count INTEGER NOT NULL DEFAULT 0")
+    connection.exec_driver_sql(
+        "UPDATE tags SET bug_count = (SELECT count(*) FROM bug_tags WHERE bug_tags.tag_id = tags.id)"
+    )
+
+def cascade_sqlite_bug_tags(connection: Connection) -> None:
+    """
+    ON DELETE CASCADE of bug_tags.bug_id, for tables created before it was declared. SQLite can't alter
+    constraints, so the table is rebuilt (its index is recreated by init_db).
+    """
+    foreign_keys = connection.exec_driver_sql("PRAGMA foreign_key_list(bug_tags)").all()
+    # Rows: id, seq, table, from, to, on_update, on_delete, match.
+    if not any(row[2] == "bugs" and row[6] != "CASCADE" for row in foreign_keys):
+        return
+    connection.exec_driver_sql("""
+        CREATE TABLE bug_tags_rebuilt (
+            bug_id INTEGER NOT NULL REFERENCES bugs (id) ON DELETE CASCADE,
+            tag_id INTEGER NOT NULL REFERENCES tags (id),
+            PRIMARY KEY (bug_id, tag_id)
+        )
+    """)
+    connection.exec_driver_sql("INSERT INTO bug_tags_rebuilt (bug_id, tag_id) SELECT bug_id, tag_id FROM bug_tags")
+    connection.exec_driver_sql("DROP TABLE bug_tags")
+    connection.exec_driver_sql("ALTER TABLE bug_tags_rebuilt RENAME TO bug_tags")
+
+# Idempotent DDL applied on startup after create_all(), for schema parts the ORM models can't express
+# portably and for changes to tables that already exist: statements, or functions checking the schema
+# first where the dialect has no conditional DDL. Keyed by dialect name.
+MIGRATIONS: dict[str, list[Union[str, Callable[[Connection], None]]]] = {
+    "postgresql": [
+        # Full-text search over title and description (see app.services.search). Checked in the catalog first:
+        # ADD COLUMN IF NOT EXISTS locks the table before finding there is nothing to do.
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns WHERE table_name = 'bugs' AND column_name = 'search_vector'
+            ) THEN
+                ALTER TABLE bugs ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+                ) STORED;
+            END IF;
+            -- CREATE INDEX IF NOT EXISTS would also lock the table (against writes) on every startup.
+            IF to_regclass('ix_bugs_search_vector') IS NULL THEN
+                CREATE INDEX ix_bugs_search_vector ON bugs USING GIN (search_vector);
+            END IF;
+        END $$
+        """,
+        # Per-tag bug counter (see app.services.tag.adjust_tag_counts), backfilled once when the column is added.
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns WHERE table_name = 'tags' AND column_name = 'bug_count'
+            ) THEN
+                ALTER TABLE tags ADD COLUMN bug_count integer NOT NULL DEFAULT 0;
+                UPDATE tags SET bug_count = counts.bug_count
+                FROM (SELECT tag_id, count(*) AS bug_count FROM bug_tags GROUP BY tag_id) AS counts
+                WHERE tags.id = counts.tag_id;
+            END IF;
+        END $$
+        """,
+        # ON DELETE CASCADE of bug_tags.bug_id, for tables created before it was declared.
+        """
+        DO $$
+        DECLARE
+            fk_name text;
+        BEGIN
+            FOR fk_name IN
+                SELECT conname FROM pg_constraint
+                WHERE conrelid = 'bug_tags'::regclass AND confrelid = 'bugs'::regclass
+                    AND contype = 'f' AND confdeltype <> 'c'
+            LOOP
+                EXECUTE format('ALTER TABLE bug_tags DROP CONSTRAINT %I', fk_name);
+                ALTER TABLE bug_tags ADD CONSTRAINT bug_tags_bug_id_fkey
+                    FOREIGN KEY (bug_id) REFERENCES bugs (id) ON DELETE CASCADE;
+            END LOOP;
+        END $$
+        """,
+        # Server-side timestamps (see app.db.functions.utcnow) for tables created with client-side defaults.
+        # ALTER TABLE locks bugs even when nothing changes, so it only runs if the catalog says it has to.
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'bugs' AND column_name IN ('created_at', 'updated_at')
+                    AND column_default IS DISTINCT FROM 'now()'
+            ) THEN
+                ALTER TABLE bugs ALTER COLUMN created_at SET DEFAULT now(), ALTER COLUMN updated_at SET DEFAULT now();
+            END IF;
+        END $$
+        """,
+        *BACKFILL_BUG_TIMESTAMPS,
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'bugs' AND column_name IN ('created_at', 'updated_at') AND is_nullable = 'YES'
+            ) THEN
+                ALTER TABLE bugs ALTER COLUMN created_at SET NOT NULL, ALTER COLUMN updated_at SET NOT NULL;
+            END IF;
+        END $$
+        """,
+    ],
+    # SQLite can't alter column defaults: existing tables only get their missing timestamps filled.
+    "sqlite": [add_sqlite_tag_bug_count, cascade_sqlite_bug_tags, *BACKFILL_BUG_TIMESTAMPS],
+}
+
+def run_migrations(bind: Engine) -> None:
+    """
+    Apply MIGRATIONS for the dialect of given engine.
+
+    Args:
+        bind (Engine): Engine to migrate.
+    """
+    statements = MIGRATIONS.get(bind.dialect.name, [])
+    if not statements:
+        return
+    with bind.begin() as connection:
+        for statement in statements:
+            if callable(statement):
+                statement(connection)
+            else:
+                connection.execute(text(statement))
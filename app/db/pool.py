@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from sqlalchemy import make_url, exc
+from sqlalchemy.pool import Pool, QueuePool, AsyncAdaptedQueuePool
+from app.utils.metrics import Histogram
+
+# Seconds spent waiting for a connection checkout.
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """
+    Live checkout statistics of a connection pool.
+
+    Attributes:
+        wait_time (Histogram): Time spent in Pool.connect(), including connection creation.
+        checkout_failures (int): Checkouts that raised (timeouts included).
+        checkout_timeouts (int): Checkouts that gave up after pool_timeout.
+    """
+    def __init__(self):
+        self.wait_time = Histogram(WAIT_TIME_BUCKETS)
+        self.checkout_failures = 0
+        self.checkout_timeouts = 0
+        self._lock = threading.Lock()
+
+    def record_failure(self, timeout: bool) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+            if timeout:
+                self.checkout_timeouts += 1
+
+
+class InstrumentedPoolMixin:
+    """
+    Records PoolMetrics for every checkout of the pool it is mixed into.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_failure(timeout=True)
+            raise
+        except Exception:
+            self.metrics.record_failure(timeout=False)
+            raise
+        self.metrics.wait_time.observe(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Build create_engine()/create_async_engine() pool options from the environment.
+    Defaults match SQLAlchemy's. SQLite keeps its default pool, since its pooling semantics differ.
+
+    Env:
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds), DB_POOL_RECYCLE (seconds, -1 disables),
+        DB_POOL_PRE_PING (true/false).
+
+    Args:
+        url (str): Database URL.
+        is_async (bool): Whether options are meant for an async engine.
+
+    Returns:
+        dict: Keyword arguments for engine creation.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "-1")),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", False),
+    }
+
+def pool_stats(pool: Pool) -> dict:
+    """
+    Collect live statistics of a connection pool.
+
+    Args:
+        pool (Pool): Pool of an engine.
+
+    Returns:
+        dict: Pool class, occupancy (QueuePool only) and checkout metrics (instrumented pools only).
+    """
+    stats = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool reports not yet opened connections as negative overflow.
+            overflow=max(pool.overflow(), 0),
+        )
+
+    if isinstance(pool, InstrumentedPoolMixin):
+        stats.update(
+            checkout_failures=pool.metrics.checkout_failures,
+            checkout_timeouts=pool.metrics.checkout_timeouts,
+            wait_time=pool.metrics.wait_time.snapshot(),
+        )
+
+    return stats
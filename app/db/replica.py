@@ -0,0 +1,183 @@
+import logging
+import math
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import HTTPConnection
+
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# Replay delay of a PostgreSQL standby; 0 when it replayed everything it received (an idle primary does not
+# advance pg_last_xact_replay_timestamp()) or when the server is not a standby.
+REPLICA_LAG_QUERIES = {
+    "postgresql": """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """,
+}
+
+
+class ReplicaRouter:
+    """
+    Chooses the database of read-only requests: the replica, unless the client wrote recently
+    (read-your-own-writes, see ReadYourWritesMiddleware), the replica lags more than max_lag seconds,
+    or its lag can't be measured. Without a replica, everything goes to the primary.
+
+    Args:
+        primary (sessionmaker): Sessions of the primary database.
+        replica (sessionmaker | None): Sessions of the replica.
+        max_lag (float): Replica lag (seconds) above which reads go to the primary.
+        lag_check_interval (float): Seconds between two lag measurements (taken by the request that finds
+            the last one outdated).
+    """
+    def __init__(self, primary: sessionmaker, replica: Optional[sessionmaker] = None,
+                 max_lag: float = REPLICA_MAX_LAG_SECONDS, lag_check_interval: float = REPLICA_LAG_CHECK_SECONDS):
+        self.primary = primary
+        self.replica = replica
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.last_lag: Optional[float] = None
+        self._lag_checked_at = -math.inf
+        self._lag_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self.reads = {"replica": 0, "primary": 0}
+        self.primary_reasons = {"read_your_writes": 0, "lag": 0}
+
+    def measure_lag(self) -> Optional[float]:
+        """
+        Returns:
+            float | None: Replication lag of the replica in seconds, None if it can't be measured.
+        """
+        try:
+            with self.replica() as session:
+                query = REPLICA_LAG_QUERIES.get(session.get_bind().dialect.name)
+                return float(session.scalar(text(query))) if query is not None else 0.0
+        except Exception as e:
+            logging.warning(f"Unable to measure replica lag: {e}")
+            return None
+
+    def lag(self) -> Optional[float]:
+        """
+        Returns:
+            float | None: Last measured replica lag, measured again if older than lag_check_interval.
+        """
+        if time.monotonic() - self._lag_checked_at >= self.lag_check_interval:
+            # A single request measures, the others keep using the previous value meanwhile.
+            if self._lag_lock.acquire(blocking=False):
+                try:
+                    self.last_lag = self.measure_lag()
+                    self._lag_checked_at = time.monotonic()
+                finally:
+                    self._lag_lock.release()
+        return self.last_lag
+
+    def session_factory(self, connection: HTTPConnection) -> sessionmaker:
+        """
+        Args:
+            connection (HTTPConnection): Request to be served.
+
+        Returns:
+            sessionmaker: Sessions of the database to read from.
+        """
+        if self.replica is None:
+            return self.primary
+
+        reason = None
+        if read_primary_until(connection) > time.time():
+            reason = "read_your_writes"
+        else:
+            lag = self.lag()
+            if lag is None or lag > self.max_lag:
+                reason = "lag"
+
+        with self._counts_lock:
+            if reason is None:
+                self.reads["replica"] += 1
+                return self.replica
+            self.reads["primary"] += 1
+            self.primary_reasons[reason] += 1
+        return self.primary
+
+    def stats(self) -> dict:
+        with self._counts_lock:
+            return {
+                "configured": self.replica is not None,
+                "lag_seconds": self.last_lag,
+                "max_lag_seconds": self.max_lag,
+                "replica_reads": self.reads["replica"],
+                "primary_reads": self.reads["primary"],
+                "primary_reasons": dict(self.primary_reasons),
+            }
+
+    def render(self) -> str:
+        """
+        Returns:
+            str: Replica lag and read routing counters in the Prometheus text format.
+        """
+        stats = self.stats()
+        lines = ["# TYPE db_replica_lag_seconds gauge"]
+        lag = stats["lag_seconds"]
+        lines.append(f"db_replica_lag_seconds {lag if lag is not None else 'NaN'}")
+        lines.append("# TYPE db_reads_total counter")
+        lines.append(f'db_reads_total{{target="replica"}} {stats["replica_reads"]}')
+        lines.append(f'db_reads_total{{target="primary"}} {stats["primary_reads"]}')
+        lines.append("# TYPE db_primary_reads_total counter")
+        for reason, count in stats["primary_reasons"].items():
+            lines.append(f'db_primary_reads_total{{reason="{reason}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def read_primary_until(connection: HTTPConnection) -> float:
+    """
+    Args:
+        connection (HTTPConnection): Request.
+
+    Returns:
+        float: Time (epoch seconds) until which the client reads from the primary, 0 if not set.
+    """
+    try:
+        return float(connection.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware pinning clients to the primary after a successful write: responses of write requests
+    set a cookie with the time until which reads of the client are served by the primary (see ReplicaRouter),
+    long enough for the replica to catch up.
+
+    Args:
+        app: Wrapped ASGI application.
+        seconds (float): How long reads stay on the primary after a write.
+    """
+    READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, app, seconds: float = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.seconds
+                cookie = (f"{READ_PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.seconds)}; Path=/; "
+                          f"HttpOnly; SameSite=Lax")
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
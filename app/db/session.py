@@ -1,16 +1,102 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, event, Engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.requests import HTTPConnection
+from app.db.pool import engine_options
+from app.db.replica import ReplicaRouter
+from app.utils.instrumentation import INSTRUMENTATION_ENABLED, instrument_engine
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL") or os.getenv("TEST_DATABASE_URL")
+DB_ASYNC_MODE = os.getenv("DB_ASYNC_MODE", "false").lower() in ("1", "true", "yes")
+# Optional read replica of DATABASE_URL, serving read-only requests of the sync routers (see get_read_db).
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
 
-engine = create_engine(DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def to_async_url(url: str) -> str:
+    """
+    Swap the driver of a database URL for its asyncio counterpart (asyncpg / aiosqlite).
+
+    Args:
+        url (str): Sync database URL.
+
+    Returns:
+        str: Database URL usable with create_async_engine.
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+def enable_sqlite_foreign_keys(bind: Engine) -> None:
+    """
+    SQLite enforces foreign keys (and so ON DELETE CASCADE of bug_tags) only when enabled on each connection.
+
+    Args:
+        bind (Engine): Engine (sync_engine of an async one); other dialects are left untouched.
+    """
+    if bind.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(bind, "connect")
+    def set_foreign_keys_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+enable_sqlite_foreign_keys(engine)
+if INSTRUMENTATION_ENABLED:
+    instrument_engine(engine)
+
+# Attributes stay loaded after commit, so services return written objects without re-SELECTing them.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
+replica_engine = (
+    create_engine(DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL))
+    if DATABASE_REPLICA_URL else None
+)
+if replica_engine is not None:
+    enable_sqlite_foreign_keys(replica_engine)
+    if INSTRUMENTATION_ENABLED:
+        instrument_engine(replica_engine)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine)
+    if replica_engine is not None else None
+)
+replica_router = ReplicaRouter(SessionLocal, ReplicaSessionLocal)
+
+# The async engine is only created in async mode, so its driver is not required otherwise.
+async_engine = (
+    create_async_engine(to_async_url(DATABASE_URL), **engine_options(DATABASE_URL, is_async=True))
+    if DB_ASYNC_MODE else None
+)
+if async_engine is not None:
+    enable_sqlite_foreign_keys(async_engine.sync_engine)
+    if INSTRUMENTATION_ENABLED:
+        instrument_engine(async_engine.sync_engine)
+
+# Attributes stay loaded after commit: lazy loads are not possible outside of the event loop's awaits.
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_engine)
+
 def get_db():
     with SessionLocal() as session:
         yield session
+
+def get_read_db(connection: HTTPConnection):
+    """
+    Session of read-only endpoints: bound to the replica when one is configured and usable for the request,
+    to the primary otherwise (see ReplicaRouter).
+    """
+    with replica_router.session_factory(connection)() as session:
+        yield session
+
+async def get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -1,8 +1,18 @@
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from app.db.init_db import init_db
-from app.routers import bug_router, tag_router
+from app.db.replica import ReadYourWritesMiddleware
+from app.db.session import DATABASE_URL, DB_ASYNC_MODE, SessionLocal, async_engine, engine, replica_engine
+from app.routers import (
+    bug_router, tag_router, async_bug_router, async_tag_router, metrics_router, change_feed_router
+)
+from app.services.change_feed import CHANGE_FEED_NOTIFY, PostgresChangeRelay, change_feed
+from app.services.idempotency import purge_expired_idempotency_keys
+from app.services.similarity import backfill_similarity_index
+from app.services.tag import warm_tag_id_cache
+from app.utils.instrumentation import INSTRUMENTATION_ENABLED, InstrumentationMiddleware
 
 import logging
 logging.basicConfig(level=logging.INFO)
@@ -10,11 +20,40 @@ logging.basicConfig(level=logging.INFO)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    with SessionLocal() as session:
+        warm_tag_id_cache(session)
+        purge_expired_idempotency_keys(session)
+    # Bugs written before the similarity index existed are indexed in the background, without delaying startup.
+    threading.Thread(target=backfill_similarity_index, args=(engine,), name="similarity-backfill", daemon=True).start()
+    # With several workers, changes are broadcast through PostgreSQL so every worker's subscribers get them.
+    relay = None
+    if CHANGE_FEED_NOTIFY and engine.dialect.name == "postgresql":
+        relay = PostgresChangeRelay(change_feed, DATABASE_URL)
+        await relay.start()
     yield
+    if relay is not None:
+        await relay.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if replica_engine is not None:
+        replica_engine.dispose()
 
 app = FastAPI(lifespan=lifespan)
+if INSTRUMENTATION_ENABLED:
+    # Per-route statement counts and timings, exposed at GET /metrics.
+    app.add_middleware(InstrumentationMiddleware)
+if replica_engine is not None:
+    # Clients that just wrote read from the primary until the replica has caught up.
+    app.add_middleware(ReadYourWritesMiddleware)
+if DB_ASYNC_MODE:
+    # Registered first, so async handlers take precedence over sync ones for the same routes.
+    # Routes without an async counterpart (e.g. /bugs/export) keep being served by the sync routers.
+    app.include_router(async_bug_router.router)
+    app.include_router(async_tag_router.router)
 app.include_router(bug_router.router)
 app.include_router(tag_router.router)
+app.include_router(metrics_router.router)
+app.include_router(change_feed_router.router)
 
 @app.get("/")
 def root():
@@ -1,9 +1,12 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.db.session import Base
 
 bug_tags = Table(
     "bug_tags",
     Base.metadata,
-    Column("bug_id", Integer, ForeignKey("bugs.id"), primary_key=True),
-    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True)
+    # Deleting a bug deletes its associations in the database (a single DELETE in app.services.bug.delete_bug).
+    Column("bug_id", Integer, ForeignKey("bugs.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # Primary key covers lookups by bug_id; this one serves filtering bugs by tag.
+    Index("ix_bug_tags_tag_id_bug_id", "tag_id", "bug_id")
 )
\ No newline at end of file
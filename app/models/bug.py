@@ -1,13 +1,14 @@
-from datetime import datetime, timezone
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from app.models.association import bug_tags
+from app.db.functions import utcnow
 from app.db.session import Base
 from sqlalchemy import (
     Column,
     Integer,
     String,
     DateTime,
+    Index,
 )
 
 from app.schemas.bug import Status, Priority, Severity
@@ -25,11 +26,22 @@ class Bug(Base):
         priority (str): Priority level of the bug.
         severity (str): Severity level of the bug.
         submitter (str): User reporting the bug.
-        created_at (datetime): The time bug record was created.
-        updated_at (datetime): The time bug record was modified.
+        created_at (datetime): The time bug record was created (set by the database).
+        updated_at (datetime): The time bug record was modified (set by the database on every UPDATE).
         tags (list[str]): Corresponding tags to the bug record.
     """
     __tablename__ = "bugs"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), optionally narrowed by a single filter column.
+        Index("ix_bugs_created_at_id", "created_at", "id"),
+        Index("ix_bugs_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_bugs_priority_created_at_id", "priority", "created_at", "id"),
+        Index("ix_bugs_severity_created_at_id", "severity", "created_at", "id"),
+        Index("ix_bugs_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+        Index("ix_bugs_submitter_created_at_id", "submitter", "created_at", "id"),
+        # Incremental sync: keyset scan of bugs changed since a cursor.
+        Index("ix_bugs_updated_at_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -39,7 +51,12 @@ class Bug(Base):
     severity = Column(SQLAlchemyEnum(Severity), nullable=False)
     assigned_to = Column(String, nullable=True)
     submitter = Column(String, nullable=False, default="system")
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    # default renders utcnow() in INSERTs (microseconds on SQLite), server_default covers other writers.
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow(), server_default=utcnow(),
+                        onupdate=utcnow())
     tags = relationship("Tag", secondary=bug_tags, back_populates="bugs")
 
+    # Timestamps generated by the database are returned by INSERT/UPDATE ... RETURNING, not lazy loaded later.
+    __mapper_args__ = {"eager_defaults": True}
+
@@ -0,0 +1,14 @@
+from sqlalchemy import Table, Column, Integer, BigInteger, ForeignKey, Index
+from app.db.session import Base
+
+# LSH buckets of bugs' MinHash signatures (see app.services.similarity): bugs sharing a bucket are
+# candidate near-duplicates. Deleting a bug deletes its buckets in the database.
+bug_similarity_buckets = Table(
+    "bug_similarity_buckets",
+    Base.metadata,
+    # Primary key serves the lookup of bugs by bucket.
+    Column("bucket", BigInteger, primary_key=True),
+    Column("bug_id", Integer, ForeignKey("bugs.id", ondelete="CASCADE"), primary_key=True),
+    # Re-indexing a bug and the cascade of its deletion.
+    Index("ix_bug_similarity_buckets_bug_id", "bug_id"),
+)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, DateTime, Index
+from app.db.functions import utcnow
+from app.db.session import Base
+
+
+class BugTombstone(Base):
+    """
+    Records a deleted bug, so incremental sync (GET /bugs/changes) can tell clients to drop it.
+
+    Attributes:
+        bug_id (int): ID of the deleted bug (no foreign key, the bug row is gone).
+        deleted_at (datetime): The time bug record was deleted (set by the database, same clock as Bug.updated_at).
+    """
+    __tablename__ = "bug_tombstones"
+    __table_args__ = (
+        # Keyset scan of deletions since a sync cursor.
+        Index("ix_bug_tombstones_deleted_at_bug_id", "deleted_at", "bug_id"),
+    )
+
+    bug_id = Column(Integer, primary_key=True, autoincrement=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utcnow(), server_default=utcnow())
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, Index
+from app.db.session import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response of a write request sent with an Idempotency-Key header, replayed when the client retries it
+    (see app.services.idempotency).
+
+    Attributes:
+        client (str): Client the key belongs to, keys of different clients don't collide.
+        key (str): Idempotency-Key sent by the client.
+        request_hash (str): SHA-256 of the request body, a retry must send the same one.
+        status_code (int): Status of the stored response, None while the first request is still running.
+        response (bytes): JSON body of the stored response.
+        expires_at (datetime): The time after which the key may be reused and the row purged.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Purge of expired keys.
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    client = Column(String(255), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
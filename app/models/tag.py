@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index
 from sqlalchemy.orm import relationship
 from app.models.association import bug_tags
 from app.db.session import Base
@@ -10,10 +10,18 @@ class Tag(Base):
     Attributes:
         id (int): Primary key for the tag.
         name (str): Name of the tag.
+        bug_count (int): Number of bugs with the tag, maintained by the services on every tag change.
     """
     __tablename__ = "tags"
+    __table_args__ = (
+        # Prefix (LIKE 'abc%') lookups regardless of the database collation.
+        Index("ix_tags_name_pattern", "name", postgresql_ops={"name": "text_pattern_ops"}),
+        # Keyset pagination by usage.
+        Index("ix_tags_bug_count_id", "bug_count", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
+    bug_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     bugs = relationship("Bug", secondary=bug_tags, back_populates="tags")
\ No newline at end of file
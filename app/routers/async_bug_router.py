@@ -0,0 +1,186 @@
+from typing import Annotated, Optional
+from fastapi import HTTPException, Depends, Query, Header, Request, Response
+from fastapi import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.schemas.bug import BugResponse, BugCreate, BugUpdate, BugPage, BugFilter, BugCreateResponse
+from app.services.async_bug import (
+    create_bug, get_bugs_page, get_bugs_page_etag, get_bug_response, get_bug_etag, update_bug_partial, update_bug_full,
+    delete_bug
+)
+from app.services.async_idempotency import run_idempotent
+from app.services.async_similarity import suggest_duplicates
+from app.services.idempotency import idempotency_client, idempotent_response
+from app.services.bug import parse_bug_fields, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.etag import bug_etag, etag_matches
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.serialization import FastJSONResponse
+
+# Async (AsyncSession) handlers for the CRUD routes of app.routers.bug_router, used when DB_ASYNC_MODE is on.
+router = APIRouter(route_class=InstrumentedRoute)
+
+@router.post("/bugs", response_model=BugCreateResponse, status_code=201)
+async def create_bug_endpoint(bug: BugCreate, request: Request,
+                              idempotency_key: Annotated[Optional[str], Header()] = None,
+                              session: AsyncSession = Depends(get_async_db)) -> BugCreateResponse | Response:
+    """
+    Create a new bug record. The response lists open bugs it likely duplicates (similar).
+    With an Idempotency-Key header, retries of the request return the response of the first one.
+
+    Args:
+        bug (BugCreate): Data for the new bug.
+        request (Request): Request (identifies the owner of the Idempotency-Key).
+        idempotency_key (str, optional): Key of the request, unique per client.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If the Idempotency-Key is invalid (400), held by a request still in progress (409)
+            or was used for a different bug (422).
+
+    Returns:
+        BugCreateResponse | Response: Created bug and its likely duplicates.
+    """
+    async def create() -> BugCreateResponse:
+        new_bug = await create_bug(session, bug)
+        response = BugCreateResponse.model_validate(new_bug)
+        response.similar = await suggest_duplicates(session, new_bug)
+        return response
+
+    if idempotency_key is None:
+        return await create()
+
+    async def create_json() -> bytes:
+        return (await create()).model_dump_json().encode()
+
+    stored = await run_idempotent(session, idempotency_client(request), idempotency_key,
+                                  bug.model_dump_json().encode(), 201, create_json)
+    return idempotent_response(stored)
+
+@router.get("/bugs", response_model=BugPage, status_code=200)
+async def get_all_bugs_endpoint(
+        filters: Annotated[BugFilter, Depends()],
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+        session: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """
+    Retrieve a page of bug records (newest first), optionally filtered.
+    fields selects the fields of the bugs, e.g. fields=summary (BugSummary) or fields=id,title,tags.
+    The response carries an ETag of the page; a matching If-None-Match is answered with 304 Not Modified.
+
+    Args:
+        filters (BugFilter): Field filters (status, priority, severity, assigned_to, submitter, tag).
+        limit (int, optional): Maximum number of bugs on the page.
+        cursor (str, optional): Cursor from the previous page's next_cursor.
+        fields (str, optional): Comma-separated BugResponse fields, "summary" for the BugSummary ones.
+        if_none_match (str, optional): ETags of the page cached by the client.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If cursor is malformed or a field is unknown (400).
+
+    Returns:
+        Response: Bugs on the page and cursor for the next one (BugPage, next_cursor is null on the last page),
+            encoded straight from the DB rows.
+    """
+    bug_fields = parse_bug_fields(fields)
+    if if_none_match is not None:
+        etag = await get_bugs_page_etag(session, filters, limit, cursor, bug_fields)
+        if etag_matches(if_none_match, etag, weak=True):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    bugs, next_cursor, etag = await get_bugs_page(session, filters, limit, cursor, bug_fields)
+    return FastJSONResponse({"items": bugs, "next_cursor": next_cursor}, headers={"ETag": etag})
+
+@router.get("/bug/{bug_id}", response_model=BugResponse)
+async def get_bug_endpoint(bug_id: int, if_none_match: Annotated[Optional[str], Header()] = None,
+                           session: AsyncSession = Depends(get_async_db)) -> Response:
+    """
+    Get a bug by its ID (served from the response cache when possible).
+    The response carries the bug's ETag; a matching If-None-Match is answered with 304 Not Modified
+    without loading nor serializing the bug.
+
+    Args:
+        bug_id (int): ID of the bug.
+        if_none_match (str, optional): ETags of the bug cached by the client.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If bug not found (404).
+
+    Returns:
+        Response: Bug data (BugResponse).
+    """
+    if if_none_match is not None:
+        etag = await get_bug_etag(session, bug_id)
+        if etag is not None and etag_matches(if_none_match, etag, weak=True):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    bug_response = await get_bug_response(session, bug_id)
+    if bug_response is None:
+        raise HTTPException(status_code=404, detail=f"Bug with specified id:{bug_id} does not exist!")
+    etag, body = bug_response
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.patch("/bug/{bug_id}", status_code=204)
+async def update_bug_partial_endpoint(bug_id: int, bug_data: BugUpdate, response: Response,
+                                      if_match: Annotated[Optional[str], Header()] = None,
+                                      session: AsyncSession = Depends(get_async_db)) -> None:
+    """
+    Partially update a bug record. Returns blank response (204) No Content.
+
+    Args:
+        bug_id (int): ID of the bug.
+        bug_data (BugUpdate): Fields to update.
+        response (Response): Response, gets the new ETag of the bug.
+        if_match (str, optional): Update only if the bug's current ETag matches.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If bug not found, If-Match precondition fails (412) or validation error.
+    """
+    bug = await update_bug_partial(session, bug_id, bug_data, if_match)
+    response.headers["ETag"] = bug_etag(bug.id, bug.updated_at)
+
+@router.put("/bug/{bug_id}", response_model=BugResponse, status_code=200)
+async def update_bug_full_endpoint(bug_id: int, bug_data: BugCreate, response: Response,
+                                   if_match: Annotated[Optional[str], Header()] = None,
+                                   session: AsyncSession = Depends(get_async_db)) -> BugResponse:
+    """
+    Fully update a bug record (replace all fields).
+
+    Args:
+        bug_id (int): ID of the bug.
+        bug_data (BugCreate): New data for the bug.
+        response (Response): Response, gets the new ETag of the bug.
+        if_match (str, optional): Update only if the bug's current ETag matches.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If bug not found or If-Match precondition fails (412).
+
+    Returns:
+        BugResponse: Bug data.
+    """
+    bug = await update_bug_full(session, bug_id, bug_data, if_match)
+    response.headers["ETag"] = bug_etag(bug.id, bug.updated_at)
+    return BugResponse.model_validate(bug)
+
+@router.delete("/bug/{bug_id}", status_code=204)
+async def delete_bug_endpoint(bug_id: int, session: AsyncSession = Depends(get_async_db)) -> None:
+    """
+    Delete a bug record.
+
+    Args:
+        bug_id (int): ID of the bug.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If bug not found.
+
+    Returns:
+        None.
+    """
+    await delete_bug(session, bug_id)
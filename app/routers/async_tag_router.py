@@ -0,0 +1,50 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.schemas.bug import TagPage, TagSort
+from app.services.async_tag import get_tags_page
+from app.services.tag import tags_page_etag, DEFAULT_TAG_PAGE_SIZE, MAX_TAG_PAGE_SIZE
+from app.utils.etag import etag_matches
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.serialization import FastJSONResponse
+
+# Async (AsyncSession) handlers for the routes of app.routers.tag_router, used when DB_ASYNC_MODE is on.
+router = APIRouter(route_class=InstrumentedRoute)
+
+@router.get("/tags", response_model=TagPage, status_code=200)
+async def get_all_tags_endpoint(
+        prefix: Optional[str] = None,
+        sort: TagSort = TagSort.NAME,
+        limit: Annotated[int, Query(ge=1, le=MAX_TAG_PAGE_SIZE)] = DEFAULT_TAG_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+        session: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """
+    Retrieve a page of tag records with the number of bugs using each tag.
+    The response carries an ETag of the page; a matching If-None-Match is answered with 304 Not Modified.
+
+    Args:
+        prefix (str, optional): Only tags with names starting with prefix (autocomplete).
+        sort (TagSort, optional): Order by "name", or by "usage" (most used first).
+        limit (int, optional): Maximum number of tags on the page.
+        cursor (str, optional): Cursor from the previous page's next_cursor.
+        if_none_match (str, optional): ETags of the page cached by the client.
+        session (AsyncSession, optional): Async DB session.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        Response: Tags on the page and cursor for the next one (TagPage, next_cursor is null on the last page).
+    """
+    tags, next_cursor = await get_tags_page(session, prefix, sort, limit, cursor)
+    etag = tags_page_etag(tags, next_cursor)
+    if etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    items = [tag._asdict() for tag in tags]
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor}, headers={"ETag": etag})
@@ -1,96 +1,358 @@
-from typing import List
-from fastapi import HTTPException, Depends
+from datetime import datetime
+from typing import Annotated, Optional, List, Any
+from fastapi import HTTPException, Depends, Query, Header, Request, Response
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.schemas.bug import BugResponse, BugCreate, BugUpdate
-from app.services.bug import create_bug, get_all_bugs, get_bug_by_id, update_bug_partial, update_bug_full, delete_bug
+from app.db.session import get_db, get_read_db
+from app.schemas.bug import (
+    BugResponse, BugCreate, BugUpdate, BugPage, BugFilter, ExportFormat, BugBulkCreateResponse, BulkCreatedItem,
+    BugBulkUpdate, BugBulkUpdateResponse, BugSearchPage, BugStats, StatsInterval, BugChanges, BugCreateResponse,
+    SimilarBug
+)
+from app.services.bug import (
+    create_bug, create_bugs_bulk, get_bugs_page, get_bugs_page_etag, get_bug_response, get_bug_etag, update_bug_partial,
+    update_bug_full, delete_bug, update_bugs_bulk, parse_bug_fields,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_BULK_ITEMS
+)
+from app.services.helpers import validate_bulk_items
+from app.services.idempotency import run_idempotent, idempotency_client, idempotent_response
+from app.services.changes import get_changes, DEFAULT_CHANGES_PAGE_SIZE, MAX_CHANGES_PAGE_SIZE
+from app.services.search import search_bugs
+from app.services.similarity import get_similar_bugs, suggest_duplicates, SIMILARITY_THRESHOLD
+from app.services.stats import get_bug_stats_json
+from app.services.export import export_bugs, MEDIA_TYPES
+from app.utils.etag import bug_etag, etag_matches
+from app.utils.instrumentation import InstrumentedRoute
+from app.utils.serialization import FastJSONResponse, dump_json
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
-@router.post("/bugs", response_model=BugResponse, status_code=201)
-def create_bug_endpoint(bug: BugCreate, session: Session = Depends(get_db)) -> BugResponse:
+@router.post("/bugs", response_model=BugCreateResponse, status_code=201)
+def create_bug_endpoint(bug: BugCreate, request: Request, idempotency_key: Annotated[Optional[str], Header()] = None,
+                        session: Session = Depends(get_db)) -> BugCreateResponse | Response:
     """
-    Create a new bug record.
+    Create a new bug record. The response lists open bugs it likely duplicates (similar).
+    With an Idempotency-Key header, retries of the request return the response of the first one.
 
     Args:
         bug (BugCreate): Data for the new bug.
+        request (Request): Request (identifies the owner of the Idempotency-Key).
+        idempotency_key (str, optional): Key of the request, unique per client.
         session (Session, optional): DB session.
 
+    Raises:
+        HTTPException: If the Idempotency-Key is invalid (400), held by a request still in progress (409)
+            or was used for a different bug (422).
+
+    Returns:
+        BugCreateResponse | Response: Created bug and its likely duplicates.
+    """
+    def create() -> BugCreateResponse:
+        new_bug = create_bug(session, bug)
+        response = BugCreateResponse.model_validate(new_bug)
+        response.similar = suggest_duplicates(session, new_bug)
+        return response
+
+    if idempotency_key is None:
+        return create()
+    stored = run_idempotent(session, idempotency_client(request), idempotency_key, bug.model_dump_json().encode(),
+                            201, lambda: create().model_dump_json().encode())
+    return idempotent_response(stored)
+
+@router.post("/bugs/bulk", response_model=BugBulkCreateResponse, status_code=201)
+def create_bugs_bulk_endpoint(items: List[Any], request: Request,
+                              idempotency_key: Annotated[Optional[str], Header()] = None,
+                              session: Session = Depends(get_db)) -> BugBulkCreateResponse | Response:
+    """
+    Create many bug records at once. Each item is validated as BugCreate on its own:
+    invalid items are reported in errors, valid ones are created in a single transaction.
+    With an Idempotency-Key header, retries of the request return the response of the first one.
+
+    Args:
+        items (List[Any]): Data for the new bugs.
+        request (Request): Request (identifies the owner of the Idempotency-Key).
+        idempotency_key (str, optional): Key of the request, unique per client.
+        session (Session, optional): DB session.
+
+    Raises:
+        HTTPException: If there are more than MAX_BULK_ITEMS items (413), the Idempotency-Key is invalid (400),
+            held by a request still in progress (409) or was used for different items (422), or DB error occurs (500).
+
+    Returns:
+        BugBulkCreateResponse | Response: IDs of created bugs and per-item validation errors, both with item indexes.
+    """
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Bulk request may contain at most {MAX_BULK_ITEMS} items!")
+
+    def create() -> BugBulkCreateResponse:
+        valid_items, errors = validate_bulk_items(items, BugCreate)
+        bug_ids = create_bugs_bulk(session, [bug for _, bug in valid_items])
+
+        created = [BulkCreatedItem(index=index, id=bug_id) for (index, _), bug_id in zip(valid_items, bug_ids)]
+        return BugBulkCreateResponse(created=created, errors=errors)
+
+    if idempotency_key is None:
+        return create()
+    stored = run_idempotent(session, idempotency_client(request), idempotency_key, dump_json(items), 201,
+                            lambda: create().model_dump_json().encode())
+    return idempotent_response(stored)
+
+@router.patch("/bugs/bulk", response_model=BugBulkUpdateResponse, status_code=200)
+def update_bugs_bulk_endpoint(bulk_update: BugBulkUpdate, session: Session = Depends(get_db)) -> BugBulkUpdateResponse:
+    """
+    Partially update many bug records, selected either by IDs or by a filter.
+
+    Args:
+        bulk_update (BugBulkUpdate): Selection (ids or filter) and fields to update.
+        session (Session, optional): DB session.
+
+    Raises:
+        HTTPException: If there are more than MAX_BULK_ITEMS ids (413) or DB error occurs (500).
+
+    Returns:
+        BugBulkUpdateResponse: Number of updated bugs.
+    """
+    if bulk_update.ids is not None and len(bulk_update.ids) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Bulk request may contain at most {MAX_BULK_ITEMS} items!")
+
+    updated_ids = update_bugs_bulk(session, bulk_update.update, bulk_update.ids, bulk_update.filter)
+    return BugBulkUpdateResponse(updated=len(updated_ids))
+
+@router.get("/bugs", response_model=BugPage, status_code=200)
+def get_all_bugs_endpoint(
+        filters: Annotated[BugFilter, Depends()],
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+        session: Session = Depends(get_read_db)
+) -> Response:
+    """
+    Retrieve a page of bug records (newest first), optionally filtered.
+    fields selects the fields of the bugs, e.g. fields=summary (BugSummary) or fields=id,title,tags.
+    The response carries an ETag of the page; a matching If-None-Match is answered with 304 Not Modified.
+
+    Args:
+        filters (BugFilter): Field filters (status, priority, severity, assigned_to, submitter, tag).
+        limit (int, optional): Maximum number of bugs on the page.
+        cursor (str, optional): Cursor from the previous page's next_cursor.
+        fields (str, optional): Comma-separated BugResponse fields, "summary" for the BugSummary ones.
+        if_none_match (str, optional): ETags of the page cached by the client.
+        session (Session, optional): DB session (replica if configured).
+
+    Raises:
+        HTTPException: If cursor is malformed or a field is unknown (400).
+
+    Returns:
+        Response: Bugs on the page and cursor for the next one (BugPage, next_cursor is null on the last page),
+            encoded straight from the DB rows.
+    """
+    bug_fields = parse_bug_fields(fields)
+    if if_none_match is not None:
+        etag = get_bugs_page_etag(session, filters, limit, cursor, bug_fields)
+        if etag_matches(if_none_match, etag, weak=True):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    bugs, next_cursor, etag = get_bugs_page(session, filters, limit, cursor, bug_fields)
+    return FastJSONResponse({"items": bugs, "next_cursor": next_cursor}, headers={"ETag": etag})
+
+@router.get("/bugs/search", response_model=BugSearchPage, status_code=200)
+def search_bugs_endpoint(
+        q: Annotated[str, Query(min_length=1)],
+        filters: Annotated[BugFilter, Depends()],
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+        offset: Annotated[int, Query(ge=0)] = 0,
+        session: Session = Depends(get_read_db)
+) -> BugSearchPage:
+    """
+    Full-text search over bug titles and descriptions, best match first.
+
+    Args:
+        q (str): Search phrase.
+        filters (BugFilter): Field filters (status, priority, severity, assigned_to, submitter, tag).
+        limit (int, optional): Maximum number of bugs on the page.
+        offset (int, optional): Number of matches to skip (next_offset of the previous page).
+        session (Session, optional): DB session (replica if configured).
+
     Returns:
-        BugResponse: Created bug.
+        BugSearchPage: Matching bugs and offset of the next page (null on the last page).
     """
-    new_bug = create_bug(session, bug)
-    return new_bug
+    bugs, next_offset = search_bugs(session, q, filters, limit, offset)
+    return BugSearchPage(items=[BugResponse.model_validate(bug) for bug in bugs], next_offset=next_offset)
 
-@router.get("/bugs", response_model=List[BugResponse], status_code=200)
-def get_all_bugs_endpoint(session: Session = Depends(get_db)) -> List[BugResponse]:
+# On the primary: a lagging replica would expose changes after cursors already returned past them.
+@router.get("/bugs/changes", response_model=BugChanges, status_code=200)
+def get_bug_changes_endpoint(
+        since: Optional[str] = None,
+        limit: Annotated[int, Query(ge=1, le=MAX_CHANGES_PAGE_SIZE)] = DEFAULT_CHANGES_PAGE_SIZE,
+        session: Session = Depends(get_db)
+) -> Response:
     """
-    Retrieve all bug records.
+    Incremental sync: bugs modified and IDs of bugs deleted since a cursor, oldest change first.
+    Without since, all bugs are returned (page by page). Clients apply deleted, then upsert bugs,
+    store next_cursor and call again with it: immediately while has_more, later to poll.
+    Changes may be delivered more than once; applying them is idempotent.
 
     Args:
+        since (str, optional): next_cursor of the previous call.
+        limit (int, optional): Maximum number of changes (bugs and deletions) in the response.
         session (Session, optional): DB session.
 
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
     Returns:
-        List[BugResponse]: List of all bugs or empty list if none exist.
+        Response: Changes (BugChanges), encoded straight from the DB rows.
     """
-    bugs = get_all_bugs(session)
-    if not bugs:
-        return []
-    return [BugResponse.model_validate(bug) for bug in bugs]
+    return FastJSONResponse(get_changes(session, since, limit))
 
+@router.get("/bugs/stats", response_model=BugStats, status_code=200)
+def get_bug_stats_endpoint(
+        filters: Annotated[BugFilter, Depends()],
+        interval: Optional[StatsInterval] = None,
+        since: Optional[datetime] = None,
+        cached: bool = False,
+        session: Session = Depends(get_read_db)
+) -> Response:
+    """
+    Bug counts by status, priority, severity, assignee and tag, aggregated in the database.
+
+    Args:
+        filters (BugFilter): Field filters (status, priority, severity, assigned_to, submitter, tag).
+        interval (StatsInterval, optional): Also count bugs opened/closed per "day".
+        since (datetime, optional): Start of the per-day counts.
+        cached (bool, optional): Accept counts up to STATS_CACHE_TTL_SECONDS old (cheap dashboard refreshes).
+        session (Session, optional): DB session (replica if configured).
+
+    Returns:
+        Response: Aggregated counts (BugStats).
+    """
+    body = get_bug_stats_json(session, filters, interval, since, cached)
+    return Response(content=body, media_type="application/json")
+
+@router.get("/bugs/export", response_class=StreamingResponse, status_code=200)
+def export_bugs_endpoint(
+        filters: Annotated[BugFilter, Depends()],
+        export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+        session: Session = Depends(get_read_db)
+) -> StreamingResponse:
+    """
+    Stream all (optionally filtered) bug records as NDJSON or CSV.
+
+    Args:
+        filters (BugFilter): Field filters (status, priority, severity, assigned_to, submitter, tag).
+        export_format (ExportFormat, optional): Output format, "ndjson" or "csv".
+        session (Session, optional): DB session (replica if configured).
+
+    Returns:
+        StreamingResponse: Export body, written batch by batch.
+    """
+    return StreamingResponse(
+        export_bugs(session.get_bind(), filters, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=bugs.{export_format.value}"}
+    )
+
+# On the primary: misses fill the shared response cache, which must not get versions older than the last write.
 @router.get("/bug/{bug_id}", response_model=BugResponse)
-def get_bug_endpoint(bug_id: int, session: Session = Depends(get_db)) -> BugResponse:
+def get_bug_endpoint(bug_id: int, if_none_match: Annotated[Optional[str], Header()] = None,
+                     session: Session = Depends(get_db)) -> Response:
     """
-    Get a bug by its ID.
+    Get a bug by its ID (served from the response cache when possible).
+    The response carries the bug's ETag; a matching If-None-Match is answered with 304 Not Modified
+    without loading nor serializing the bug.
 
     Args:
         bug_id (int): ID of the bug.
+        if_none_match (str, optional): ETags of the bug cached by the client.
         session (Session, optional): DB session.
 
     Raises:
         HTTPException: If bug not found (404).
 
     Returns:
-        BugResponse: Bug data.
+        Response: Bug data (BugResponse).
     """
-    bug = get_bug_by_id(session, bug_id)
-    if not bug:
+    if if_none_match is not None:
+        etag = get_bug_etag(session, bug_id)
+        if etag is not None and etag_matches(if_none_match, etag, weak=True):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    bug_response = get_bug_response(session, bug_id)
+    if bug_response is None:
         raise HTTPException(status_code=404, detail=f"Bug with specified id:{bug_id} does not exist!")
-    return BugResponse.model_validate(bug)
+    etag, body = bug_response
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/bug/{bug_id}/similar", response_model=List[SimilarBug], status_code=200)
+def get_similar_bugs_endpoint(
+        bug_id: int,
+        limit: Annotated[int, Query(ge=1, le=50)] = 10,
+        threshold: Annotated[float, Query(gt=0, le=1)] = SIMILARITY_THRESHOLD,
+        session: Session = Depends(get_read_db)
+) -> List[SimilarBug]:
+    """
+    Retrieve likely duplicates of a bug (any status): bugs whose title and description are at least
+    threshold similar, found through the similarity index without scanning all bugs.
+
+    Args:
+        bug_id (int): ID of the bug.
+        limit (int, optional): Maximum number of bugs.
+        threshold (float, optional): Minimum similarity (Jaccard index of word bigrams, 1 for identical texts).
+        session (Session, optional): DB session (replica if configured).
+
+    Raises:
+        HTTPException: If bug not found (404).
+
+    Returns:
+        List[SimilarBug]: Similar bugs, most similar first.
+    """
+    return get_similar_bugs(session, bug_id, limit, threshold)
 
 @router.patch("/bug/{bug_id}", status_code=204)
-def update_bug_partial_endpoint(bug_id: int, bug_data: BugUpdate, session: Session = Depends(get_db)) -> None:
+def update_bug_partial_endpoint(bug_id: int, bug_data: BugUpdate, response: Response,
+                                if_match: Annotated[Optional[str], Header()] = None,
+                                session: Session = Depends(get_db)) -> None:
     """
     Partially update a bug record. Returns blank response (204) No Content.
 
     Args:
         bug_id (int): ID of the bug.
         bug_data (BugUpdate): Fields to update.
+        response (Response): Response, gets the new ETag of the bug.
+        if_match (str, optional): Update only if the bug's current ETag matches.
         session (Session, optional): DB session.
 
     Raises:
-        HTTPException: If bug not found or validation error.
+        HTTPException: If bug not found, If-Match precondition fails (412) or validation error.
     """
-    update_bug_partial(session, bug_id, bug_data)
+    bug = update_bug_partial(session, bug_id, bug_data, if_match)
+    response.headers["ETag"] = bug_etag(bug.id, bug.updated_at)
 
 @router.put("/bug/{bug_id}", response_model=BugResponse, status_code=200)
-def update_bug_full_endpoint(bug_id: int, bug_data: BugCreate, session: Session = Depends(get_db)) -> BugResponse:
+def update_bug_full_endpoint(bug_id: int, bug_data: BugCreate, response: Response,
+                             if_match: Annotated[Optional[str], Header()] = None,
+                             session: Session = Depends(get_db)) -> BugResponse:
     """
     Fully update a bug record (replace all fields).
 
     Args:
         bug_id (int): ID of the bug.
         bug_data (BugCreate): New data for the bug.
+        response (Response): Response, gets the new ETag of the bug.
+        if_match (str, optional): Update only if the bug's current ETag matches.
         session (Session, optional): DB session.
 
     Raises:
-        HTTPException: If bug not found.
+        HTTPException: If bug not found or If-Match precondition fails (412).
 
     Returns:
         BugResponse: Bug data.
     """
-    return update_bug_full(session, bug_id, bug_data)
+    bug = update_bug_full(session, bug_id, bug_data, if_match)
+    response.headers["ETag"] = bug_etag(bug.id, bug.updated_at)
+    return bug
 
 @router.delete("/bug/{bug_id}", status_code=204)
 def delete_bug_endpoint(bug_id: int, session: Session = Depends(get_db)) -> None:
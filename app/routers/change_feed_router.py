@@ -0,0 +1,67 @@
+import asyncio
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.services.change_feed import change_feed, format_sse, CHANGE_FEED_HEARTBEAT_SECONDS
+
+# Long-lived streams: not instrumented, their duration would swamp the latency histograms.
+router = APIRouter()
+
+@router.get("/bugs/events", response_class=StreamingResponse, status_code=200)
+async def stream_bug_changes_endpoint(
+        last_event_id: Annotated[Optional[str], Header()] = None
+) -> StreamingResponse:
+    """
+    Stream bug changes (created, updated, deleted) as server-sent events.
+    Each event carries the bug ID only; clients fetch the bug itself when they need it (GET /bug/{id}, cached).
+    Reconnecting clients send the Last-Event-ID header to receive the events they missed; when those
+    are no longer available, the stream starts with a "reset" event.
+
+    Args:
+        last_event_id (str, optional): ID of the last event received (sent by EventSource on reconnect).
+
+    Returns:
+        StreamingResponse: text/event-stream of events and heartbeat comments.
+    """
+    events = change_feed.subscribe(last_event_id, heartbeat=CHANGE_FEED_HEARTBEAT_SECONDS)
+
+    async def stream():
+        async for event in events:
+            yield format_sse(event)
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/bugs/events/ws")
+async def bug_changes_websocket_endpoint(websocket: WebSocket, last_event_id: Optional[str] = None) -> None:
+    """
+    Stream bug changes over a WebSocket, one JSON message per event: {"id": ..., "type": ..., "bug_id": ...}.
+    Same events and resuming (last_event_id query parameter) as GET /bugs/events. The server closes the
+    connection (code 1013, try again later) when the client does not keep up.
+
+    Args:
+        websocket (WebSocket): Connection.
+        last_event_id (str, optional): ID of the last event received before reconnecting.
+    """
+    events = change_feed.subscribe(last_event_id)
+    await websocket.accept()
+
+    async def forward() -> None:
+        async for event in events:
+            await websocket.send_text(event.data.decode())
+        await websocket.close(code=1013)
+
+    forwarding = asyncio.create_task(forward())
+    try:
+        # Messages from the client are ignored; receiving notices the disconnect.
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        forwarding.cancel()
+        await asyncio.gather(forwarding, return_exceptions=True)
@@ -0,0 +1,64 @@
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.pool import pool_stats
+from app.db.session import engine, async_engine, replica_engine, replica_router
+from app.schemas.metrics import PoolStats, CacheStats, ReplicaStats
+from app.services.cache import bug_cache, stats_cache, tag_id_cache, idempotency_cache
+from app.utils.instrumentation import request_metrics
+
+router = APIRouter()
+
+@router.get("/metrics/pool", response_model=Dict[str, PoolStats], status_code=200)
+def get_pool_metrics_endpoint() -> Dict[str, PoolStats]:
+    """
+    Retrieve live connection pool statistics of the application engines.
+
+    Returns:
+        Dict[str, PoolStats]: Statistics keyed by engine ("sync", plus "async" in async mode, "replica" if configured).
+    """
+    stats = {"sync": PoolStats.model_validate(pool_stats(engine.pool))}
+    if async_engine is not None:
+        stats["async"] = PoolStats.model_validate(pool_stats(async_engine.sync_engine.pool))
+    if replica_engine is not None:
+        stats["replica"] = PoolStats.model_validate(pool_stats(replica_engine.pool))
+    return stats
+
+@router.get("/metrics/cache", response_model=Dict[str, CacheStats], status_code=200)
+def get_cache_metrics_endpoint() -> Dict[str, CacheStats]:
+    """
+    Retrieve response cache, tag ID cache and idempotency cache counters.
+
+    Returns:
+        Dict[str, CacheStats]: Statistics keyed by cache namespace.
+    """
+    caches = (bug_cache, stats_cache, tag_id_cache, idempotency_cache)
+    return {cache.namespace: CacheStats.model_validate(cache.stats()) for cache in caches}
+
+@router.get("/metrics/replica", response_model=ReplicaStats, status_code=200)
+def get_replica_metrics_endpoint() -> ReplicaStats:
+    """
+    Retrieve the last measured replica lag and how many reads were served by the replica and the primary
+    (with the reasons of reads sent to the primary).
+
+    Returns:
+        ReplicaStats: Replica statistics (configured is false without DATABASE_REPLICA_URL).
+    """
+    return ReplicaStats.model_validate(replica_router.stats())
+
+@router.get("/metrics", response_class=PlainTextResponse, status_code=200)
+def get_request_metrics_endpoint() -> PlainTextResponse:
+    """
+    Per-route request metrics in the Prometheus text format: SQL statement counts, DB time,
+    serialization time and latency histograms (recorded with INSTRUMENTATION_ENABLED=true),
+    plus replica lag and read routing when a replica is configured.
+
+    Returns:
+        PlainTextResponse: Prometheus exposition.
+    """
+    body = request_metrics.render()
+    if replica_engine is not None:
+        body += replica_router.render()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,7 +1,7 @@
-from typing import List, Annotated, Optional
+from typing import List, Annotated, Optional, Any
 from pydantic import BaseModel, AfterValidator, model_validator, ConfigDict
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, date
 
 from app.utils.validators import (
     title_must_not_be_empty,
@@ -23,6 +23,24 @@ class Severity(str, Enum):
     MAJOR="MAJOR"
     CRITICAL="CRITICAL"
 
+class ExportFormat(str, Enum):
+    NDJSON="ndjson"
+    CSV="csv"
+
+class ChangeType(str, Enum):
+    CREATED="created"
+    UPDATED="updated"
+    DELETED="deleted"
+    # The subscriber missed events and has to reload the bugs it mirrors.
+    RESET="reset"
+
+class StatsInterval(str, Enum):
+    DAY="day"
+
+class TagSort(str, Enum):
+    NAME="name"
+    USAGE="usage"
+
 class TagCreate(BaseModel):
     name: Annotated[str, AfterValidator(tag_name_must_not_be_empty)]
 
@@ -32,6 +50,13 @@ class TagResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TagUsage(TagResponse):
+    bug_count: int
+
+class TagPage(BaseModel):
+    items: List[TagUsage]
+    next_cursor: str | None
+
 class BugCreate(BaseModel):
     title: Annotated[str, AfterValidator(title_must_not_be_empty)]
     description: Annotated[str, AfterValidator(description_must_not_be_empty)]
@@ -57,6 +82,59 @@ class BugResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class BugSummary(BaseModel):
+    # Compact projection of list views, GET /bugs?fields=summary.
+    id: int
+    title: str
+    status: Status
+    priority: Priority
+    assigned_to: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SimilarBug(BugSummary):
+    # Jaccard index of title and description word bigrams, 1.0 for identical texts.
+    similarity: float
+
+class BugCreateResponse(BugResponse):
+    # Open bugs the created one likely duplicates, most similar first.
+    similar: List[SimilarBug] = []
+
+class BugPage(BaseModel):
+    items: List[BugResponse]
+    next_cursor: str | None
+
+class BugChanges(BaseModel):
+    # Clients apply deleted before bugs, then resume from next_cursor (right away while has_more).
+    bugs: List[BugResponse]
+    deleted: List[int]
+    next_cursor: str
+    has_more: bool
+
+class BugSearchPage(BaseModel):
+    items: List[BugResponse]
+    next_offset: int | None
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: List[dict[str, Any]]
+
+class BulkCreatedItem(BaseModel):
+    index: int
+    id: int
+
+class BugBulkCreateResponse(BaseModel):
+    created: List[BulkCreatedItem]
+    errors: List[BulkItemError]
+
+class BugFilter(BaseModel):
+    status: Optional[Status] = None
+    priority: Optional[Priority] = None
+    severity: Optional[Severity] = None
+    assigned_to: Optional[str] = None
+    submitter: Optional[str] = None
+    tag: Optional[str] = None
+
 class BugUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -74,3 +152,37 @@ class BugUpdate(BaseModel):
         return values
 
 
+
+class BugBulkUpdate(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[BugFilter] = None
+    update: BugUpdate
+
+    @model_validator(mode="after")
+    def exactly_one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Bulk update requires either ids or filter!")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("Bulk update filter requires at least one field!")
+        return self
+
+class BugBulkUpdateResponse(BaseModel):
+    updated: int
+
+class StatsBucket(BaseModel):
+    value: str | None
+    count: int
+
+class DailyBugStats(BaseModel):
+    day: date
+    opened: int
+    closed: int
+
+class BugStats(BaseModel):
+    total: int
+    by_status: List[StatsBucket]
+    by_priority: List[StatsBucket]
+    by_severity: List[StatsBucket]
+    by_assignee: List[StatsBucket]
+    by_tag: List[StatsBucket]
+    daily: List[DailyBugStats] | None = None
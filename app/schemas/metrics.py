@@ -0,0 +1,35 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: Dict[str, int]
+    count: int
+    sum: float
+
+class PoolStats(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    checkout_failures: Optional[int] = None
+    checkout_timeouts: Optional[int] = None
+    wait_time: Optional[HistogramSnapshot] = None
+
+class ReplicaStats(BaseModel):
+    configured: bool
+    lag_seconds: Optional[float] = None
+    max_lag_seconds: float
+    replica_reads: int
+    primary_reads: int
+    primary_reasons: Dict[str, int]
+
+class CacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    invalidations: int
+    entries: Optional[int] = None
+    evictions: Optional[int] = None
+    expirations: Optional[int] = None
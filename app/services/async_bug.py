@@ -0,0 +1,361 @@
+from fastapi import HTTPException
+from collections import Counter
+from typing import List, Optional, Tuple, Sequence
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.db.functions import utcnow
+from app.models.association import bug_tags
+from app.models.bug import Bug
+from app.schemas.bug import BugCreate, BugUpdate, BugFilter, ChangeType
+from app.services.bug import (
+    select_bugs_page, split_page, select_bug_tags, bug_response_dicts, pack_bug_response, unpack_bug_response,
+    check_if_match, lock_bug_version, record_tombstone, bug_columns, page_etag, DEFAULT_PAGE_SIZE
+)
+from app.services.cache import bug_cache
+from app.services.change_feed import change_feed
+from app.services.search_index import fallback_search_index
+from app.services.async_similarity import index_bugs
+from app.services.async_tag import adjust_tag_counts, resolve_tag_ids
+from app.services.tag import tag_count_deltas, release_bug_tags, tag_references
+from app.utils.etag import bug_etag
+import logging
+
+from app.services.helpers import apply_bug_data_to_model, Operation, assign_tags_to_bug, dialect_insert
+
+
+async def sync_tags(session: AsyncSession, bug: Bug, tag_names: list[str],
+                    operation: Operation = Operation.CREATE) -> None:
+    """
+    Async counterpart of app.services.bug.sync_tags.
+
+    Args:
+        session (AsyncSession): Async DB session
+        bug (Bug): Bug ORM object (tags must be loaded unless bug is new)
+        tag_names (list[str]): list of tag names
+        operation (Operation): Determines how to apply data (CREATE, PATCH, PUT).
+    """
+    try:
+        tags = tag_references(session, await resolve_tag_ids(session, tag_names))
+
+        tag_ids_before = [tag.id for tag in bug.tags]
+        assign_tags_to_bug(bug, tags, operation)
+        await adjust_tag_counts(session, tag_count_deltas(tag_ids_before, (tag.id for tag in bug.tags)))
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to assign tags to bug record: {e}. Rolling back.")
+        await session.rollback()
+        raise e
+
+async def create_bug(session: AsyncSession, bug: BugCreate) -> Bug:
+    """
+    Async counterpart of app.services.bug.create_bug.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug (BugCreate): Data for creating a bug.
+
+    Returns:
+        Bug: The created Bug ORM object.
+    """
+    try:
+        # Initialized collection: once flushed, replacing it must not trigger a lazy load.
+        bug_record = Bug(tags=[])
+        apply_bug_data_to_model(bug_record, bug, Operation.CREATE)
+
+        session.add(bug_record)
+
+        if bug.tags:
+            await sync_tags(session, bug_record, bug.tags, Operation.CREATE)
+
+        await session.flush()
+        await index_bugs(session, [(bug_record.id, bug_record.title, bug_record.description)])
+
+        # Sessions don't expire on commit, so no refresh round-trip is needed.
+        await session.commit()
+
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to create Bug record: {e}. Rolling back.")
+        await session.rollback()
+        raise e
+
+    bug_cache.invalidate(bug_record.id)
+    fallback_search_index.add(bug_record.id, bug_record.title, bug_record.description)
+    change_feed.publish(ChangeType.CREATED, [bug_record.id])
+    return bug_record
+
+async def get_bugs_page(session: AsyncSession, filters: Optional[BugFilter] = None, limit: int = DEFAULT_PAGE_SIZE,
+                        cursor: Optional[str] = None,
+                        fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], str]:
+    """
+    Async counterpart of app.services.bug.get_bugs_page.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        filters (BugFilter | None): Requested filters.
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+        fields (Sequence[str] | None): Fields of bugs on the page, None for all fields.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        Tuple[List[dict], Optional[str], str]: BugResponse-shaped bugs, cursor for the next page (None on last
+            page) and ETag of the page.
+    """
+    stmt = select_bugs_page(filters, limit, cursor).with_only_columns(*bug_columns(fields))
+
+    try:
+        fetched = (await session.execute(stmt)).all()
+        rows, next_cursor = split_page(fetched, limit)
+        tag_rows = []
+        if rows and (fields is None or "tags" in fields):
+            tag_rows = (await session.execute(select_bug_tags([row.id for row in rows]))).all()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug records page {e}.")
+        raise e
+
+    return bug_response_dicts(rows, tag_rows, fields), next_cursor, page_etag(fetched, fields)
+
+async def get_bugs_page_etag(session: AsyncSession, filters: Optional[BugFilter] = None,
+                             limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                             fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Async counterpart of app.services.bug.get_bugs_page_etag.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        filters (BugFilter | None): Requested filters.
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+        fields (Sequence[str] | None): Fields of bugs on the page, None for all fields.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        str: ETag of the page.
+    """
+    stmt = select_bugs_page(filters, limit, cursor).with_only_columns(Bug.id, Bug.updated_at)
+
+    try:
+        result = await session.execute(stmt)
+        rows = result.all()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug records page version {e}.")
+        raise e
+
+    return page_etag(rows, fields)
+
+async def get_bug_by_id(session: AsyncSession, bug_id: int, for_update: bool = False) -> Optional[Bug]:
+    """
+    Async counterpart of app.services.bug.get_bug_by_id.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug_id (int): ID of the Bug object.
+        for_update (bool): Lock the bug row until the end of transaction (SELECT ... FOR UPDATE).
+
+    Returns:
+        Bug | None: The Bug ORM object with tags loaded, None if it does not exist.
+    """
+    try:
+        stmt = select(Bug).options(joinedload(Bug.tags)).where(Bug.id == bug_id)
+        if for_update:
+            stmt = stmt.with_for_update(of=Bug)
+        result = await session.execute(stmt)
+        return result.unique().scalars().first()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug record with ID:{bug_id}")
+        raise e
+
+async def get_bug_response(session: AsyncSession, bug_id: int) -> Optional[Tuple[str, bytes]]:
+    """
+    Async counterpart of app.services.bug.get_bug_response.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug_id (int): ID of the Bug object.
+
+    Returns:
+        Tuple[str, bytes] | None: ETag and JSON body of BugResponse, None if bug does not exist.
+    """
+    entry, token = bug_cache.lookup(bug_id)
+    if entry is None:
+        bug = await get_bug_by_id(session, bug_id)
+        if bug is None:
+            return None
+        entry = pack_bug_response(bug)
+        bug_cache.store(bug_id, entry, token)
+    return unpack_bug_response(entry)
+
+async def get_bug_etag(session: AsyncSession, bug_id: int) -> Optional[str]:
+    """
+    Async counterpart of app.services.bug.get_bug_etag.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug_id (int): ID of the Bug object.
+
+    Returns:
+        str | None: ETag of the bug, None if bug does not exist.
+    """
+    entry, _ = bug_cache.lookup(bug_id)
+    if entry is not None:
+        return unpack_bug_response(entry)[0]
+
+    try:
+        updated_at = await session.scalar(select(Bug.updated_at).where(Bug.id == bug_id))
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug record version with ID:{bug_id}")
+        raise e
+    if updated_at is None:
+        return None
+    return bug_etag(bug_id, updated_at)
+
+async def add_tags_to_bugs(session: AsyncSession, bug_ids: List[int], tag_names: List[str]) -> None:
+    """
+    Async counterpart of app.services.bug.add_tags_to_bugs.
+
+    Args:
+        session (AsyncSession): Async DB session (not committed here).
+        bug_ids (List[int]): IDs of bugs to tag.
+        tag_names (List[str]): Names of tags to add (created if missing).
+    """
+    tag_ids = set((await resolve_tag_ids(session, tag_names)).values())
+    association_rows = [{"bug_id": bug_id, "tag_id": tag_id} for bug_id in bug_ids for tag_id in tag_ids]
+    inserted_tag_ids = await session.scalars(
+        dialect_insert(session, bug_tags).on_conflict_do_nothing().returning(bug_tags.c.tag_id),
+        association_rows
+    )
+    await adjust_tag_counts(session, Counter(inserted_tag_ids.all()))
+
+async def update_bug_partial(session: AsyncSession, bug_id: int, bug_data: BugUpdate,
+                             if_match: Optional[str] = None) -> Bug:
+    """
+    Async counterpart of app.services.bug.update_bug_partial.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug_id (int): ID of the bug to update.
+        bug_data (BugUpdate): Data with fields to update.
+        if_match (str | None): If-Match header value, update only if it matches the bug's ETag.
+
+    Raises:
+        HTTPException: If bug not found, precondition fails (412) or DB error occurs.
+
+    Returns:
+        Bug: The updated Bug ORM object (tags not loaded).
+    """
+    values = bug_data.model_dump(exclude_unset=True, exclude={"tags"})
+
+    try:
+        if if_match is not None:
+            updated_at = await session.scalar(lock_bug_version(bug_id))
+            if updated_at is None:
+                raise HTTPException(status_code=404, detail="Bug not found")
+            check_if_match(bug_id, updated_at, if_match)
+
+        stmt = (
+            update(Bug)
+            .where(Bug.id == bug_id)
+            .values(**values)
+            .returning(Bug)
+            .execution_options(synchronize_session=False)
+        )
+        bug_from_db = (await session.scalars(stmt)).first()
+        if not bug_from_db:
+            raise HTTPException(status_code=404, detail="Bug not found")
+
+        if bug_data.tags:
+            await add_tags_to_bugs(session, [bug_id], bug_data.tags)
+
+        if "title" in values or "description" in values:
+            await index_bugs(session, [(bug_id, bug_from_db.title, bug_from_db.description)], replace=True)
+
+        await session.commit()
+
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logging.error(f"Unable to PATCH Bug record with ID:{bug_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    bug_cache.invalidate(bug_id)
+    fallback_search_index.add(bug_from_db.id, bug_from_db.title, bug_from_db.description)
+    change_feed.publish(ChangeType.UPDATED, [bug_id])
+    return bug_from_db
+
+async def update_bug_full(session: AsyncSession, bug_id: int, bug_data: BugCreate,
+                          if_match: Optional[str] = None) -> Bug:
+    """
+    Async counterpart of app.services.bug.update_bug_full.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug_id (int): ID of the bug to update.
+        bug_data (BugCreate): Full data to replace the bug with.
+        if_match (str | None): If-Match header value, update only if it matches the bug's ETag.
+
+    Raises:
+        HTTPException: If bug not found, precondition fails (412) or DB error occurs.
+
+    Returns:
+        Bug: The updated Bug ORM object.
+    """
+    try:
+        bug_from_db = await get_bug_by_id(session, bug_id, for_update=if_match is not None)
+        if not bug_from_db:
+            raise HTTPException(status_code=404, detail="Bug not found")
+        check_if_match(bug_from_db.id, bug_from_db.updated_at, if_match)
+
+        text_before = (bug_from_db.title, bug_from_db.description)
+        apply_bug_data_to_model(bug_from_db, bug_data, Operation.PUT)
+        bug_from_db.updated_at = utcnow()
+
+        if bug_data.tags is not None:
+            await sync_tags(session, bug_from_db, bug_data.tags)
+
+        if (bug_from_db.title, bug_from_db.description) != text_before:
+            await index_bugs(session, [(bug_id, bug_from_db.title, bug_from_db.description)], replace=True)
+
+        await session.commit()
+
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logging.error(f"Unable to PUT Bug record with ID:{bug_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    bug_cache.invalidate(bug_id)
+    fallback_search_index.add(bug_from_db.id, bug_from_db.title, bug_from_db.description)
+    change_feed.publish(ChangeType.UPDATED, [bug_id])
+    return bug_from_db
+
+async def delete_bug(session: AsyncSession, bug_id: int) -> None:
+    """
+    Async counterpart of app.services.bug.delete_bug.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug_id (int): ID of the bug.
+
+    Raises:
+        HTTPException: If bug not found.
+    """
+    try:
+        if await session.scalar(lock_bug_version(bug_id)) is None:
+            await session.rollback()
+            raise HTTPException(status_code=404, detail=f"Bug with ID:{bug_id} not found!")
+        released_tag_ids = (await session.scalars(release_bug_tags(bug_id))).all()
+        await adjust_tag_counts(session, {tag_id: -1 for tag_id in released_tag_ids})
+        await session.execute(delete(Bug).where(Bug.id == bug_id).execution_options(synchronize_session=False))
+        await session.execute(record_tombstone(session, bug_id))
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logging.error(f"Unable to DELETE Bug record with ID:{bug_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    bug_cache.invalidate(bug_id)
+    fallback_search_index.remove(bug_id)
+    change_feed.publish(ChangeType.DELETED, [bug_id])
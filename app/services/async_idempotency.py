@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.cache import idempotency_cache, IDEMPOTENCY_TTL_SECONDS
+from app.services.idempotency import (
+    StoredResponse, IDEMPOTENCY_LEASE_SECONDS, validate_idempotency_key, request_hash, cached_response,
+    select_idempotency_key, stored_response, claim_idempotency_key, store_idempotent_response, release_idempotency_key,
+    pack_stored_response, purge_expired_statement, purge_due
+)
+
+
+async def run_idempotent(session: AsyncSession, client: str, key: str, body: bytes, status_code: int,
+                         handler: Callable[[], Awaitable[bytes]]) -> StoredResponse:
+    """
+    Async counterpart of app.services.idempotency.run_idempotent.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        client (str): Owner of the key (see idempotency_client).
+        key (str): Idempotency-Key header.
+        body (bytes): Canonical request body; a retry with another body is rejected.
+        status_code (int): HTTP status of handler's response.
+        handler (Callable[[], Awaitable[bytes]]): Runs the request (committing its writes) and returns the JSON body.
+
+    Raises:
+        HTTPException: If the key is invalid (400), reused for a different body (422), held by a request
+            still in progress (409) or DB error occurs (500).
+
+    Returns:
+        StoredResponse: Response of handler or the stored one.
+    """
+    validate_idempotency_key(key)
+    hash_, now = request_hash(body), datetime.now(timezone.utc)
+    cached = cached_response(client, key, hash_, now)
+    if cached is not None:
+        return cached
+
+    try:
+        row = (await session.execute(select_idempotency_key(client, key, now))).first()
+        if row is not None:
+            await session.rollback()
+            return stored_response(client, key, hash_, row)
+        claimed = await session.scalar(claim_idempotency_key(
+            session, client, key, hash_, now, now + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+        ))
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logging.error(f"Unable to claim Idempotency-Key {key!r} of client {client!r}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if claimed is None:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress!")
+
+    try:
+        response = await handler()
+    except Exception:
+        try:
+            await session.execute(release_idempotency_key(client, key))
+            await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logging.error(f"Unable to release Idempotency-Key {key!r} of client {client!r}: {e}")
+        raise
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    try:
+        await session.execute(store_idempotent_response(client, key, hash_, status_code, response, expires_at))
+        if purge_due():
+            await session.execute(purge_expired_statement(now))
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logging.error(f"Unable to store response of Idempotency-Key {key!r} of client {client!r}: {e}")
+        return StoredResponse(status_code, response)
+    idempotency_cache.put((client, key), pack_stored_response(status_code, hash_, response, expires_at))
+    return StoredResponse(status_code, response)
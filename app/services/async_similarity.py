@@ -0,0 +1,55 @@
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bug import Bug
+from app.models.bug_similarity import bug_similarity_buckets
+from app.schemas.bug import SimilarBug
+from app.services.similarity import (
+    shingles, lsh_buckets, bucket_rows, unindex_statement, select_similar_candidates, rank_similar,
+    DUPLICATE_SUGGESTIONS, SIMILARITY_THRESHOLD
+)
+
+
+async def index_bugs(session: AsyncSession, bugs: Sequence[Tuple[int, Optional[str], Optional[str]]],
+                     replace: bool = False) -> None:
+    """
+    Async counterpart of app.services.similarity.index_bugs.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bugs (Sequence[Tuple[int, str, str]]): ID, title and description of bugs.
+        replace (bool): Whether the bugs are already indexed (their previous buckets are deleted first).
+    """
+    if replace and bugs:
+        await session.execute(unindex_statement([bug_id for bug_id, _, _ in bugs]))
+    rows = bucket_rows(bugs)
+    if rows:
+        await session.execute(insert(bug_similarity_buckets), rows)
+
+async def suggest_duplicates(session: AsyncSession, bug: Bug) -> List[SimilarBug]:
+    """
+    Async counterpart of app.services.similarity.suggest_duplicates.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        bug (Bug): Created bug.
+
+    Returns:
+        List[SimilarBug]: Up to DUPLICATE_SUGGESTIONS open bugs, most similar first.
+    """
+    if DUPLICATE_SUGGESTIONS <= 0:
+        return []
+    shingle_set = shingles(bug.title, bug.description)
+    buckets = lsh_buckets(shingle_set)
+    if not buckets:
+        return []
+    try:
+        stmt = select_similar_candidates(buckets, exclude_bug_id=bug.id, open_only=True)
+        candidates = (await session.execute(stmt)).all()
+    except SQLAlchemyError:
+        await session.rollback()
+        return []
+    return rank_similar(shingle_set, candidates, SIMILARITY_THRESHOLD, DUPLICATE_SUGGESTIONS)
@@ -0,0 +1,86 @@
+import logging
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select, Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.tag import Tag
+from app.schemas.bug import TagSort
+from app.services.cache import tag_id_cache
+from app.services.tag import (
+    select_tags_page, split_tags_page, insert_missing_tags, remember_tag_ids, ADJUST_TAG_COUNT, DEFAULT_TAG_PAGE_SIZE
+)
+
+
+async def get_tags_page(session: AsyncSession, prefix: Optional[str] = None, sort: TagSort = TagSort.NAME,
+                        limit: int = DEFAULT_TAG_PAGE_SIZE,
+                        cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+    """
+    Async counterpart of app.services.tag.get_tags_page.
+
+    Args:
+        session (AsyncSession): Async DB session.
+        prefix (str | None): Only tags with names starting with prefix (autocomplete).
+        sort (TagSort): Order by name, or by number of bugs (most used first).
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+
+    Raises:
+        HTTPException: If cursor is malformed (400) or DB error occurs (500).
+
+    Returns:
+        Tuple[List[Row], Optional[str]]: Tag rows and cursor for the next page (None on last page).
+    """
+    try:
+        result = await session.execute(select_tags_page(prefix, sort, limit, cursor))
+        tags = list(result.all())
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch tags page!: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return split_tags_page(tags, limit, sort)
+
+async def adjust_tag_counts(session: AsyncSession, deltas: dict[int, int]) -> None:
+    """
+    Async counterpart of app.services.tag.adjust_tag_counts.
+
+    Args:
+        session (AsyncSession): Async DB session (not committed here).
+        deltas (dict[int, int]): Count delta by tag ID.
+    """
+    params = [{"tag_id": tag_id, "delta": delta} for tag_id, delta in sorted(deltas.items()) if delta]
+    if params:
+        await session.execute(ADJUST_TAG_COUNT, params)
+
+async def resolve_tag_ids(session: AsyncSession, tag_names: Iterable[str]) -> dict[str, int]:
+    """
+    Async counterpart of app.services.tag.resolve_tag_ids.
+
+    Args:
+        session (AsyncSession): Async DB session (not committed here).
+        tag_names (Iterable[str]): Tag names, duplicates allowed.
+
+    Returns:
+        dict[str, int]: Tag ID for every requested name.
+    """
+    names = set(tag_names)
+    tag_ids = tag_id_cache.get_many(names)
+
+    missing = names - tag_ids.keys()
+    if not missing:
+        return tag_ids
+
+    result = await session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing)))
+    loaded = dict(result.all())
+    missing -= loaded.keys()
+    if missing:
+        stmt = insert_missing_tags(session, missing).returning(Tag.name, Tag.id)
+        loaded.update((await session.execute(stmt)).all())
+
+        missing -= loaded.keys()
+        if missing:
+            result = await session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing)))
+            loaded.update(result.all())
+
+    remember_tag_ids(session, loaded)
+    tag_ids.update(loaded)
+    return tag_ids
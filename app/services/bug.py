@@ -1,19 +1,43 @@
+from collections import Counter
 from fastapi import HTTPException
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple, Sequence
+from sqlalchemy import select, insert, update, delete, tuple_, Select, ColumnElement, Row, Insert
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import joinedload, selectinload, Session
+from app.db.functions import utcnow
+from app.models.association import bug_tags
 from app.models.bug import Bug
+from app.models.bug_tombstone import BugTombstone
 from app.models.tag import Tag
-from app.schemas.bug import BugCreate, BugUpdate
+from app.schemas.bug import BugCreate, BugUpdate, BugFilter, BugResponse, BugSummary, ChangeType
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.etag import bug_etag, version_etag, etag_matches
 import logging
 
-from app.services.helpers import apply_bug_data_to_model, Operation, assign_tags_to_bug
+from app.services.helpers import apply_bug_data_to_model, Operation, assign_tags_to_bug, dialect_insert
+from app.services.cache import bug_cache
+from app.services.change_feed import change_feed
+from app.services.search_index import fallback_search_index
+from app.services.similarity import index_bugs
+from app.services.tag import resolve_tag_ids, tag_references, adjust_tag_counts, tag_count_deltas, release_bug_tags
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BULK_ITEMS = 10_000
+
+# Columns of BugResponse (tags aside), in its field order.
+BUG_RESPONSE_COLUMNS = (
+    Bug.id, Bug.created_at, Bug.updated_at, Bug.submitter, Bug.title, Bug.description,
+    Bug.status, Bug.priority, Bug.severity, Bug.assigned_to,
+)
 
 
 def sync_tags(session: Session, bug: Bug, tag_names: list[str], operation: Operation = Operation.CREATE) -> None:
     """
     Synchronize bug.tags with tag objects for given tag_names.
-    Creates new Tag objects if they don't exist.
+    Tag IDs come from the tag cache or are resolved (and missing tags created) with resolve_tag_ids;
+    the tags are attached by ID, without loading them. Adjusts bug counts of added/removed tags.
 
     Args:
         session (Session): DB session
@@ -22,18 +46,11 @@ def sync_tags(session: Session, bug: Bug, tag_names: list[str], operation: Opera
         operation (Operation): Determines how to apply data (CREATE, PATCH, PUT).
     """
     try:
-        existing_tags = session.query(Tag).filter(Tag.name.in_(tag_names)).all()
-        existing_tag_names = {tag.name for tag in existing_tags}
+        tags = tag_references(session, resolve_tag_ids(session, tag_names))
 
-        new_tag_names = set(tag_names) - existing_tag_names
-        new_tags = [Tag(name=name) for name in new_tag_names]
-
-        session.add_all(new_tags)
-        session.flush()
-
-        all_new_tags = existing_tags + new_tags
-
-        assign_tags_to_bug(bug, all_new_tags, operation)
+        tag_ids_before = [tag.id for tag in bug.tags]
+        assign_tags_to_bug(bug, tags, operation)
+        adjust_tag_counts(session, tag_count_deltas(tag_ids_before, (tag.id for tag in bug.tags)))
     except SQLAlchemyError as e:
         logging.error(f"Unable to assign tags to bug record: {e}. Rolling back.")
         session.rollback()
@@ -51,7 +68,8 @@ def create_bug(session: Session, bug: BugCreate) -> Bug:
         Bug: The created Bug ORM object.
     """
     try:
-        bug_record = Bug()
+        # Initialized collection: once flushed, reading or replacing it must not trigger a lazy load.
+        bug_record = Bug(tags=[])
         apply_bug_data_to_model(bug_record, bug, Operation.CREATE)
 
         session.add(bug_record)
@@ -59,83 +77,535 @@ def create_bug(session: Session, bug: BugCreate) -> Bug:
         if bug.tags:
             sync_tags(session, bug_record, bug.tags, Operation.CREATE)
 
+        session.flush()
+        index_bugs(session, [(bug_record.id, bug_record.title, bug_record.description)])
+
+        # Sessions don't expire on commit and the INSERT returns the ID, so no refresh round-trip is needed.
         session.commit()
-        session.refresh(bug_record)
 
     except SQLAlchemyError as e:
         logging.error(f"Unable to create Bug record: {e}. Rolling back.")
         session.rollback()
         raise e
 
+    bug_cache.invalidate(bug_record.id)
+    fallback_search_index.add(bug_record.id, bug_record.title, bug_record.description)
+    change_feed.publish(ChangeType.CREATED, [bug_record.id])
     return bug_record
 
-def get_all_bugs(session: Session) -> List[Bug]:
+def create_bugs_bulk(session: Session, bugs: List[BugCreate]) -> List[int]:
+    """
+    Create many Bug records in a single transaction.
+    All tag names are resolved at once, bugs and bug_tags rows are inserted with multi-row INSERTs.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bugs (List[BugCreate]): Data for creating bugs.
+
+    Raises:
+        HTTPException: If DB error occurs (whole batch is rolled back).
+
+    Returns:
+        List[int]: IDs of created bugs, in the order of given data.
+    """
+    if not bugs:
+        return []
+
+    try:
+        tag_ids = resolve_tag_ids(session, (name for bug in bugs for name in bug.tags or []))
+
+        rows = []
+        for bug in bugs:
+            row = bug.model_dump(exclude={"tags"})
+            if row["submitter"] is None:
+                # Leave it to the column default.
+                del row["submitter"]
+            rows.append(row)
+
+        bug_ids = session.scalars(insert(Bug).returning(Bug.id, sort_by_parameter_order=True), rows).all()
+
+        association_rows = [
+            {"bug_id": bug_id, "tag_id": tag_ids[name]}
+            for bug_id, bug in zip(bug_ids, bugs)
+            for name in set(bug.tags or [])
+        ]
+        if association_rows:
+            session.execute(insert(bug_tags), association_rows)
+            adjust_tag_counts(session, Counter(row["tag_id"] for row in association_rows))
+
+        index_bugs(session, [(bug_id, bug.title, bug.description) for bug_id, bug in zip(bug_ids, bugs)])
+
+        session.commit()
+
+    except SQLAlchemyError as e:
+        session.rollback()
+        logging.error(f"Unable to bulk create Bug records: {e}. Rolling back.")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    for bug_id, bug in zip(bug_ids, bugs):
+        fallback_search_index.add(bug_id, bug.title, bug.description)
+    change_feed.publish(ChangeType.CREATED, bug_ids)
+    return list(bug_ids)
+
+def bug_filter_conditions(filters: Optional[BugFilter]) -> List[ColumnElement[bool]]:
+    """
+    Translate BugFilter into SQL WHERE conditions.
+
+    Args:
+        filters (BugFilter | None): Requested filters, unset fields are ignored.
+
+    Returns:
+        List[ColumnElement[bool]]: Conditions to be AND-ed together.
+    """
+    if filters is None:
+        return []
+
+    conditions = []
+    for field in ("status", "priority", "severity", "assigned_to", "submitter"):
+        value = getattr(filters, field)
+        if value is not None:
+            conditions.append(getattr(Bug, field) == value)
+
+    if filters.tag is not None:
+        conditions.append(Bug.tags.any(Tag.name == filters.tag))
+
+    return conditions
+
+def select_bugs(filters: Optional[BugFilter] = None) -> Select:
+    """
+    Build the base SELECT for Bug records matching given filters.
+
+    Args:
+        filters (BugFilter | None): Requested filters.
+
+    Returns:
+        Select: Statement selecting Bug ORM objects.
+    """
+    return select(Bug).where(*bug_filter_conditions(filters))
+
+def get_all_bugs(session: Session, filters: Optional[BugFilter] = None) -> List[Bug]:
     """
     Get list of all Bug records from the database.
+    Tags are loaded by a second query per 500 bugs (selectinload): a JOIN would repeat every bug row once per tag.
 
     Args:
         session (Session): SQLAlchemy database session.
+        filters (BugFilter | None): Requested filters.
 
     Returns:
         List[Bug]: The list of all Bug ORM object.
     """
     try:
-        bugs_list = session.query(Bug).options(joinedload(Bug.tags)).all()
+        stmt = select_bugs(filters).options(selectinload(Bug.tags))
+        bugs_list = session.execute(stmt).scalars().all()
         return bugs_list
 
     except SQLAlchemyError as e:
         logging.error(f"Unable to fetch Bug records {e}.")
         raise e
 
-def get_bug_by_id(session: Session, bug_id: int) -> Bug:
+def select_bugs_page(filters: Optional[BugFilter] = None, limit: int = DEFAULT_PAGE_SIZE,
+                     cursor: Optional[str] = None) -> Select:
+    """
+    Build the SELECT for a single page of Bug records, newest first, keyset-paginated on (created_at, id).
+    Fetches one row more than limit, which tells whether another page exists (see split_page).
+
+    Args:
+        filters (BugFilter | None): Requested filters.
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        Select: Statement selecting Bug ORM objects.
+    """
+    stmt = select_bugs(filters).order_by(Bug.created_at.desc(), Bug.id.desc())
+
+    if cursor is not None:
+        try:
+            created_at, bug_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor!")
+        stmt = stmt.where(tuple_(Bug.created_at, Bug.id) < tuple_(created_at, bug_id))
+
+    return stmt.limit(limit + 1)
+
+def split_page(bugs: List[Bug | Row], limit: int) -> Tuple[List[Bug | Row], Optional[str]]:
+    """
+    Trim the look-ahead row fetched by select_bugs_page and compute the next cursor.
+
+    Args:
+        bugs (List[Bug | Row]): Bugs or rows (with created_at and id) fetched with select_bugs_page.
+        limit (int): Page size used to build the statement.
+
+    Returns:
+        Tuple[List[Bug | Row], Optional[str]]: Bugs on the page and cursor for the next page (None on last page).
+    """
+    if len(bugs) <= limit:
+        return bugs, None
+    bugs = bugs[:limit]
+    return bugs, encode_cursor(bugs[-1].created_at, bugs[-1].id)
+
+def parse_bug_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse the fields parameter of bug lists: comma-separated BugResponse field names,
+    "summary" standing for the fields of BugSummary.
+
+    Args:
+        fields (str | None): Parameter value, None for all fields.
+
+    Raises:
+        HTTPException: If a field is unknown (400).
+
+    Returns:
+        Tuple[str, ...] | None: Requested fields in BugResponse order, None for all fields.
+    """
+    if fields is None:
+        return None
+
+    names = set()
+    for name in fields.split(","):
+        name = name.strip()
+        if name == "summary":
+            names.update(BugSummary.model_fields)
+        elif name in BugResponse.model_fields:
+            names.add(name)
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name!r}!")
+    return tuple(name for name in BugResponse.model_fields if name in names)
+
+def bug_columns(fields: Optional[Sequence[str]] = None) -> Tuple:
+    """
+    Columns to select for the requested fields of bugs on a page. created_at and id are always selected:
+    they are the keyset of pagination; updated_at too, for the page ETag.
+
+    Args:
+        fields (Sequence[str] | None): Requested fields (see parse_bug_fields), None for all fields.
+
+    Returns:
+        Tuple: Columns of BUG_RESPONSE_COLUMNS.
+    """
+    if fields is None:
+        return BUG_RESPONSE_COLUMNS
+    names = {"id", "created_at", "updated_at", *fields}
+    return tuple(column for column in BUG_RESPONSE_COLUMNS if column.key in names)
+
+def select_bug_tags(bug_ids: List[int]) -> Select:
+    """
+    Build the SELECT for the tags of given bugs as (bug_id, id, name) rows, without ORM hydration.
+
+    Args:
+        bug_ids (List[int]): IDs of the bugs.
+
+    Returns:
+        Select: Statement selecting (bug_id, tag ID, tag name) rows.
+    """
+    return (
+        select(bug_tags.c.bug_id, Tag.id, Tag.name)
+        .join(Tag, Tag.id == bug_tags.c.tag_id)
+        .where(bug_tags.c.bug_id.in_(bug_ids))
+        .order_by(Tag.id)
+    )
+
+def bug_response_dicts(rows: List[Row], tag_rows: List[Row], fields: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Assemble BugResponse-shaped dicts from rows of BUG_RESPONSE_COLUMNS (or bug_columns) and select_bug_tags,
+    ready to be JSON-encoded without validation.
+
+    Args:
+        rows (List[Row]): Bug rows.
+        tag_rows (List[Row]): (bug_id, tag ID, tag name) rows of the same bugs.
+        fields (Sequence[str] | None): Fields to keep (see parse_bug_fields), None for all fields.
+
+    Returns:
+        List[dict]: Bugs with their tags, in the order of rows.
+    """
+    tags_by_bug: dict[int, List[dict]] = {}
+    for bug_id, tag_id, name in tag_rows:
+        tags_by_bug.setdefault(bug_id, []).append({"id": tag_id, "name": name})
+    if fields is None:
+        return [{**row._asdict(), "tags": tags_by_bug.get(row.id, [])} for row in rows]
+    return [
+        {name: tags_by_bug.get(row.id, []) if name == "tags" else row._mapping[name] for name in fields}
+        for row in rows
+    ]
+
+def page_etag(rows: Sequence[Row], fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Args:
+        rows (Sequence[Row]): Rows with id and updated_at fetched by select_bugs_page (look-ahead row included).
+        fields (Sequence[str] | None): Fields of bugs on the page (see parse_bug_fields), None for all fields:
+            every representation of the page has its own ETag.
+
+    Returns:
+        str: ETag of the page.
+    """
+    return version_etag("bugs", [fields, *(bug_etag(row.id, row.updated_at) for row in rows)])
+
+def get_bugs_page(session: Session, filters: Optional[BugFilter] = None, limit: int = DEFAULT_PAGE_SIZE,
+                  cursor: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], str]:
+    """
+    Get a single page of bugs, newest first, using keyset pagination on (created_at, id).
+    Bugs and their tags are read as plain rows (no ORM objects) and returned as BugResponse-shaped dicts,
+    so the page is converted only once, when it is encoded to JSON.
+    Only columns of the requested fields are read; tags are not queried unless requested.
+    The page ETag is computed from the same rows (equal to get_bugs_page_etag, without another query).
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        filters (BugFilter | None): Requested filters.
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+        fields (Sequence[str] | None): Fields of bugs on the page (see parse_bug_fields), None for all fields.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        Tuple[List[dict], Optional[str], str]: Bugs, cursor for the next page (None on last page) and ETag of
+            the page.
+    """
+    stmt = select_bugs_page(filters, limit, cursor).with_only_columns(*bug_columns(fields))
+
+    try:
+        fetched = session.execute(stmt).all()
+        rows, next_cursor = split_page(fetched, limit)
+        tag_rows = []
+        if rows and (fields is None or "tags" in fields):
+            tag_rows = session.execute(select_bug_tags([row.id for row in rows])).all()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug records page {e}.")
+        raise e
+
+    return bug_response_dicts(rows, tag_rows, fields), next_cursor, page_etag(fetched, fields)
+
+def get_bugs_page_etag(session: Session, filters: Optional[BugFilter] = None, limit: int = DEFAULT_PAGE_SIZE,
+                       cursor: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Compute the ETag of a page of Bug records without loading them.
+    Only (id, updated_at) of rows on the page are read, so it is cheap to evaluate If-None-Match
+    (requests without it get the ETag from get_bugs_page instead).
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        filters (BugFilter | None): Requested filters.
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+        fields (Sequence[str] | None): Fields of bugs on the page (see parse_bug_fields), None for all fields.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        str: ETag of the page.
+    """
+    stmt = select_bugs_page(filters, limit, cursor).with_only_columns(Bug.id, Bug.updated_at)
+
+    try:
+        rows = session.execute(stmt).all()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug records page version {e}.")
+        raise e
+
+    return page_etag(rows, fields)
+
+def get_bug_by_id(session: Session, bug_id: int, for_update: bool = False) -> Bug:
     """
     Get a Bug record from the database by ID.
 
     Args:
         session (Session): SQLAlchemy database session.
         bug_id (int): ID of the Bug object.
+        for_update (bool): Lock the bug row until the end of transaction (SELECT ... FOR UPDATE).
 
     Returns:
         Bug: The created Bug ORM object.
     """
     try:
-        bug = session.query(Bug).options(joinedload(Bug.tags)).filter(Bug.id == bug_id).first()
+        query = session.query(Bug).options(joinedload(Bug.tags)).filter(Bug.id == bug_id)
+        if for_update:
+            query = query.with_for_update(of=Bug)
+        bug = query.first()
         return bug
     except SQLAlchemyError as e:
         logging.error(f"Unable to fetch Bug record with ID:{bug_id}")
         raise e
 
-def update_bug_partial(session: Session, bug_id: int, bug_data: BugUpdate) -> None:
+def pack_bug_response(bug: Bug) -> bytes:
+    """
+    Encode a Bug ORM object as a bug_cache entry: ETag and JSON body of BugResponse.
+
+    Args:
+        bug (Bug): Bug ORM object with tags.
+
+    Returns:
+        bytes: Cache entry (see unpack_bug_response).
+    """
+    etag = bug_etag(bug.id, bug.updated_at)
+    return etag.encode() + b"\n" + BugResponse.model_validate(bug).model_dump_json().encode()
+
+def unpack_bug_response(entry: bytes) -> Tuple[str, bytes]:
+    """
+    Args:
+        entry (bytes): Cache entry created by pack_bug_response.
+
+    Returns:
+        Tuple[str, bytes]: ETag and JSON body of BugResponse.
+    """
+    etag, body = entry.split(b"\n", 1)
+    return etag.decode(), body
+
+def get_bug_response(session: Session, bug_id: int) -> Optional[Tuple[str, bytes]]:
+    """
+    Get ETag and encoded BugResponse of a Bug record, served from bug_cache when possible.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bug_id (int): ID of the Bug object.
+
+    Returns:
+        Tuple[str, bytes] | None: ETag and JSON body of BugResponse, None if bug does not exist.
+    """
+    def load() -> Optional[bytes]:
+        bug = get_bug_by_id(session, bug_id)
+        if bug is None:
+            return None
+        return pack_bug_response(bug)
+
+    entry = bug_cache.get_or_load(bug_id, load)
+    if entry is None:
+        return None
+    return unpack_bug_response(entry)
+
+def get_bug_etag(session: Session, bug_id: int) -> Optional[str]:
+    """
+    Get the current ETag of a Bug record, without loading nor serializing the bug on a cache miss.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bug_id (int): ID of the Bug object.
+
+    Returns:
+        str | None: ETag of the bug, None if bug does not exist.
+    """
+    entry, _ = bug_cache.lookup(bug_id)
+    if entry is not None:
+        return unpack_bug_response(entry)[0]
+
+    try:
+        updated_at = session.scalar(select(Bug.updated_at).where(Bug.id == bug_id))
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug record version with ID:{bug_id}")
+        raise e
+    if updated_at is None:
+        return None
+    return bug_etag(bug_id, updated_at)
+
+def check_if_match(bug_id: int, updated_at: datetime, if_match: Optional[str]) -> None:
+    """
+    Evaluate If-Match precondition of a write against the current version of the bug.
+
+    Args:
+        bug_id (int): ID of the bug.
+        updated_at (datetime): Modification time of the bug, as currently stored.
+        if_match (str | None): If-Match header value (no precondition if None).
+
+    Raises:
+        HTTPException: If precondition fails (412).
+    """
+    if if_match is not None and not etag_matches(if_match, bug_etag(bug_id, updated_at)):
+        raise HTTPException(status_code=412, detail="Bug was modified by another request!")
+
+def lock_bug_version(bug_id: int) -> Select:
+    """
+    Build the SELECT of a bug's modification time, locking the row until the end of transaction.
+
+    Args:
+        bug_id (int): ID of the bug.
+
+    Returns:
+        Select: Statement selecting Bug.updated_at.
+    """
+    return select(Bug.updated_at).where(Bug.id == bug_id).with_for_update()
+
+def add_tags_to_bugs(session: Session, bug_ids: List[int], tag_names: List[str]) -> None:
+    """
+    Add tags to bugs with a single INSERT into bug_tags, skipping existing associations.
+    Bug counts are adjusted only for associations that were actually inserted.
+
+    Args:
+        session (Session): SQLAlchemy database session (not committed here).
+        bug_ids (List[int]): IDs of bugs to tag.
+        tag_names (List[str]): Names of tags to add (created if missing).
+    """
+    tag_ids = set(resolve_tag_ids(session, tag_names).values())
+    association_rows = [{"bug_id": bug_id, "tag_id": tag_id} for bug_id in bug_ids for tag_id in tag_ids]
+    inserted_tag_ids = session.scalars(
+        dialect_insert(session, bug_tags).on_conflict_do_nothing().returning(bug_tags.c.tag_id),
+        association_rows
+    ).all()
+    adjust_tag_counts(session, Counter(inserted_tag_ids))
+
+def update_bug_partial(session: Session, bug_id: int, bug_data: BugUpdate, if_match: Optional[str] = None) -> Bug:
     """
     Partially update a bug record with given fields.
+    Fields are written by a single UPDATE ... RETURNING, the bug is not loaded beforehand.
 
     Args:
         session (Session): SQLAlchemy database session.
         bug_id (int): ID of the bug to update.
         bug_data (BugUpdate): Data with fields to update.
+        if_match (str | None): If-Match header value, update only if it matches the bug's ETag.
 
     Raises:
-        HTTPException: If bug not found or DB error occurs.
+        HTTPException: If bug not found, precondition fails (412) or DB error occurs.
+
+    Returns:
+        Bug: The updated Bug ORM object (tags not loaded).
     """
+    # updated_at is set by the column's onupdate, also when only tags change.
+    values = bug_data.model_dump(exclude_unset=True, exclude={"tags"})
 
     try:
-        bug_from_db = get_bug_by_id(session, bug_id)
+        if if_match is not None:
+            updated_at = session.scalar(lock_bug_version(bug_id))
+            if updated_at is None:
+                raise HTTPException(status_code=404, detail="Bug not found")
+            check_if_match(bug_id, updated_at, if_match)
+
+        stmt = (
+            update(Bug)
+            .where(Bug.id == bug_id)
+            .values(**values)
+            .returning(Bug)
+            .execution_options(synchronize_session=False)
+        )
+        bug_from_db = session.scalars(stmt).first()
         if not bug_from_db:
             raise HTTPException(status_code=404, detail="Bug not found")
 
-        apply_bug_data_to_model(bug_from_db, bug_data, Operation.PATCH)
-        if bug_data.tags is not None:
-            sync_tags(session, bug_from_db, bug_data.tags, Operation.PATCH)
+        if bug_data.tags:
+            add_tags_to_bugs(session, [bug_id], bug_data.tags)
+
+        if "title" in values or "description" in values:
+            index_bugs(session, [(bug_id, bug_from_db.title, bug_from_db.description)], replace=True)
 
         session.commit()
-        session.refresh(bug_from_db)
 
     except SQLAlchemyError as e:
         session.rollback()
         logging.error(f"Unable to PATCH Bug record with ID:{bug_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-def update_bug_full(session: Session, bug_id: int, bug_data: BugCreate) -> Bug:
+    bug_cache.invalidate(bug_id)
+    fallback_search_index.add(bug_from_db.id, bug_from_db.title, bug_from_db.description)
+    change_feed.publish(ChangeType.UPDATED, [bug_id])
+    return bug_from_db
+
+def update_bug_full(session: Session, bug_id: int, bug_data: BugCreate, if_match: Optional[str] = None) -> Bug:
     """
     Fully update a bug record with new data.
 
@@ -143,36 +613,118 @@ def update_bug_full(session: Session, bug_id: int, bug_data: BugCreate) -> Bug:
         session (Session): SQLAlchemy database session.
         bug_id (int): ID of the bug to update.
         bug_data (BugCreate): Full data to replace the bug with.
+        if_match (str | None): If-Match header value, update only if it matches the bug's ETag.
 
     Raises:
-        HTTPException: If bug not found or DB error occurs.
+        HTTPException: If bug not found, precondition fails (412) or DB error occurs.
 
     Returns:
         Bug: The updated Bug ORM object.
     """
     try:
-        bug_from_db = get_bug_by_id(session, bug_id)
+        bug_from_db = get_bug_by_id(session, bug_id, for_update=if_match is not None)
         if not bug_from_db:
             raise HTTPException(status_code=404, detail="Bug not found")
+        check_if_match(bug_from_db.id, bug_from_db.updated_at, if_match)
 
+        text_before = (bug_from_db.title, bug_from_db.description)
         apply_bug_data_to_model(bug_from_db, bug_data, Operation.PUT)
+        # Bumped even if only tags change (no column would be updated otherwise).
+        bug_from_db.updated_at = utcnow()
 
         if bug_data.tags is not None:
             sync_tags(session, bug_from_db, bug_data.tags)
 
+        if (bug_from_db.title, bug_from_db.description) != text_before:
+            index_bugs(session, [(bug_id, bug_from_db.title, bug_from_db.description)], replace=True)
+
+        # The loaded bug (with tags) stays valid after commit, it is the response.
         session.commit()
-        session.refresh(bug_from_db)
 
     except SQLAlchemyError as e:
         session.rollback()
         logging.error(f"Unable to PUT Bug record with ID:{bug_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    bug_cache.invalidate(bug_id)
+    fallback_search_index.add(bug_from_db.id, bug_from_db.title, bug_from_db.description)
+    change_feed.publish(ChangeType.UPDATED, [bug_id])
     return bug_from_db
 
+def update_bugs_bulk(session: Session, bug_data: BugUpdate, bug_ids: Optional[List[int]] = None,
+                     filters: Optional[BugFilter] = None) -> List[int]:
+    """
+    Partially update many bug records with a single set-based UPDATE.
+    Tags are added (PATCH semantics) with a single INSERT into bug_tags, skipping existing associations.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bug_data (BugUpdate): Data with fields to update.
+        bug_ids (List[int] | None): IDs of bugs to update.
+        filters (BugFilter | None): Filters selecting bugs to update (used if bug_ids is None).
+
+    Raises:
+        HTTPException: If DB error occurs.
+
+    Returns:
+        List[int]: IDs of updated bugs.
+    """
+    conditions = [Bug.id.in_(bug_ids)] if bug_ids is not None else bug_filter_conditions(filters)
+
+    values = bug_data.model_dump(exclude_unset=True, exclude={"tags"})
+    text_changed = "title" in values or "description" in values
+
+    try:
+        stmt = (
+            update(Bug)
+            .where(*conditions)
+            .values(**values)
+            .returning(Bug.id, Bug.title, Bug.description)
+            .execution_options(synchronize_session=False)
+        )
+        updated = session.execute(stmt).all()
+        updated_ids = [row.id for row in updated]
+
+        if bug_data.tags and updated_ids:
+            add_tags_to_bugs(session, updated_ids, bug_data.tags)
+
+        if text_changed and updated:
+            index_bugs(session, updated, replace=True)
+
+        session.commit()
+
+    except SQLAlchemyError as e:
+        session.rollback()
+        logging.error(f"Unable to bulk PATCH Bug records: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    bug_cache.invalidate(*updated_ids)
+    if text_changed:
+        # Only one of the indexed fields may be known here, rebuild on next search instead.
+        fallback_search_index.clear()
+    change_feed.publish(ChangeType.UPDATED, updated_ids)
+    return list(updated_ids)
+
+def record_tombstone(session: Session, bug_id: int) -> Insert:
+    """
+    Build the INSERT of a deleted bug's tombstone (replacing an older one if the ID was reused).
+
+    Args:
+        session (Session): DB session (used to detect the dialect).
+        bug_id (int): ID of the deleted bug.
+
+    Returns:
+        Insert: Upsert of the BugTombstone row.
+    """
+    stmt = dialect_insert(session, BugTombstone).values(bug_id=bug_id)
+    return stmt.on_conflict_do_update(index_elements=["bug_id"], set_={"deleted_at": utcnow()})
+
 def delete_bug(session: Session, bug_id: int) -> None:
     """
     Delete Bug record from the database. (Does not delete related Tag objects - only references).
+    The bug is not loaded, only its row locked: its bug_tags rows are deleted first (and their tag counts
+    decremented), so tags added concurrently can't be removed by ON DELETE CASCADE without being counted.
+    A tombstone is recorded in the same transaction, for incremental sync.
 
     Args:
         bug_id (int): ID of the bug.
@@ -185,14 +737,19 @@ def delete_bug(session: Session, bug_id: int) -> None:
         None.
     """
     try:
-        bug_from_db = get_bug_by_id(session, bug_id)
-        if not bug_from_db:
+        if session.scalar(lock_bug_version(bug_id)) is None:
+            session.rollback()
             raise HTTPException(status_code=404, detail=f"Bug with ID:{bug_id} not found!")
-
-        bug_from_db.tags.clear()
-        session.delete(bug_from_db)
+        released_tag_ids = session.scalars(release_bug_tags(bug_id)).all()
+        adjust_tag_counts(session, {tag_id: -1 for tag_id in released_tag_ids})
+        session.execute(delete(Bug).where(Bug.id == bug_id).execution_options(synchronize_session=False))
+        session.execute(record_tombstone(session, bug_id))
         session.commit()
     except SQLAlchemyError as e:
         session.rollback()
         logging.error(f"Unable to DELETE Bug record with ID:{bug_id}: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    bug_cache.invalidate(bug_id)
+    fallback_search_index.remove(bug_id)
+    change_feed.publish(ChangeType.DELETED, [bug_id])
@@ -0,0 +1,379 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+
+class CacheBackend:
+    """
+    Storage of a ResponseCache. Implementations must be thread-safe.
+    """
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def get_versioned(self, key: str) -> tuple[Optional[bytes], Any]:
+        """
+        Args:
+            key (str): Key.
+
+        Returns:
+            tuple[bytes | None, Any]: Value (None if missing) and version of the key, which changes whenever
+                the key is deleted or the backend cleared (in all processes sharing the backend).
+        """
+        raise NotImplementedError
+
+    def set_if_version(self, key: str, value: bytes, version: Any) -> None:
+        """
+        Set a value unless the key was deleted or the backend cleared since get_versioned() returned version.
+        The check and the write are atomic.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process cache bounded by number of entries (least recently used are evicted) and entry age.
+
+    Attributes:
+        max_entries (int): Maximum number of entries.
+        ttl_seconds (float): Entry lifetime.
+    """
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        # One version for all keys: a deletion fails the writes in flight of any key, rare enough in-process.
+        self._version = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def get_versioned(self, key: str) -> tuple[Optional[bytes], Any]:
+        with self._lock:
+            version = self._version
+        return self.get(key), version
+
+    def set_if_version(self, key: str, value: bytes, version: Any) -> None:
+        with self._lock:
+            if self._version == version:
+                self._set(key, value)
+
+    def _set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "evictions": self.evictions, "expirations": self.expirations}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared between processes, stored in Redis (requires the optional `redis` package).
+    Expiry is handled by Redis. Versions are stored next to the values, so a worker can't cache a value
+    it loaded before another worker invalidated it: a version key per deleted key, counting its deletions,
+    and a counter of clears.
+    """
+    name = "redis"
+
+    # Compare-and-set of set_if_version: KEYS = key, its version key, clears key;
+    # ARGV = value, key version and clears read by get_versioned ('' when missing), TTL in ms.
+    SET_IF_VERSION_SCRIPT = """
+        local versions = redis.call('MGET', KEYS[2], KEYS[3])
+        if (versions[1] or '') == ARGV[2] and (versions[2] or '') == ARGV[3] then
+            redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[4])
+        end
+    """
+    # Version keys outlive any load in flight, so a missing version can't hide a deletion.
+    VERSION_TTL_MARGIN_SECONDS = 60
+
+    def __init__(self, url: str, ttl_seconds: float = 60.0, prefix: str = "bug-tracker:"):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._set_if_version = self._client.register_script(self.SET_IF_VERSION_SCRIPT)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._clears_key = prefix + "clears"
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.prefix}version:{key}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._client.set(self.prefix + key, value, px=int(self.ttl_seconds * 1000))
+
+    def delete(self, key: str) -> None:
+        pipeline = self._client.pipeline()
+        pipeline.incr(self._version_key(key))
+        pipeline.pexpire(self._version_key(key), int((self.ttl_seconds + self.VERSION_TTL_MARGIN_SECONDS) * 1000))
+        pipeline.delete(self.prefix + key)
+        pipeline.execute()
+
+    def clear(self) -> None:
+        self._client.incr(self._clears_key)
+        keys = [key for key in self._client.scan_iter(match=self.prefix + "*") if key != self._clears_key.encode()]
+        if keys:
+            self._client.delete(*keys)
+
+    def get_versioned(self, key: str) -> tuple[Optional[bytes], Any]:
+        value, version, clears = self._client.mget(self.prefix + key, self._version_key(key), self._clears_key)
+        return value, (version or b"", clears or b"")
+
+    def set_if_version(self, key: str, value: bytes, version: Any) -> None:
+        key_version, clears = version
+        self._set_if_version(keys=[self.prefix + key, self._version_key(key), self._clears_key],
+                             args=[value, key_version, clears, int(self.ttl_seconds * 1000)])
+
+
+class ResponseCache:
+    """
+    Read-through cache of encoded responses with explicit invalidation, counting hits and misses.
+
+    Attributes:
+        backend (CacheBackend): Storage, may be replaced at runtime.
+        namespace (str): Prefix of keys, so caches can share a backend.
+    """
+    def __init__(self, backend: CacheBackend, namespace: str):
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def lookup(self, key) -> tuple[Optional[bytes], Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key (unique within the namespace).
+
+        Returns:
+            tuple[bytes | None, Any]: Cached value (None on miss) and a token to pass to store() after a miss.
+        """
+        value, version = self.backend.get_versioned(self._key(key))
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value, version
+
+    def store(self, key, value: bytes, token: Any) -> None:
+        """
+        Cache a value loaded after a miss, unless the key was invalidated since the lookup, by any process
+        sharing the backend (the loaded value could be stale then).
+
+        Args:
+            key: Cache key (unique within the namespace).
+            value (bytes): Loaded value.
+            token (Any): Token returned by lookup().
+        """
+        self.backend.set_if_version(self._key(key), value, token)
+
+    def put(self, key, value: bytes) -> None:
+        """
+        Cache a value unconditionally, for entries that never go stale (nothing invalidates them).
+
+        Args:
+            key: Cache key (unique within the namespace).
+            value (bytes): Value.
+        """
+        self.backend.set(self._key(key), value)
+
+    def get_or_load(self, key, loader: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """
+        Return the cached value, or load and cache it. None from loader is not cached.
+
+        Args:
+            key: Cache key (unique within the namespace).
+            loader (Callable[[], Optional[bytes]]): Produces the value on a miss.
+
+        Returns:
+            bytes | None: Cached or loaded value.
+        """
+        value, token = self.lookup(key)
+        if value is not None:
+            return value
+        value = loader()
+        if value is not None:
+            self.store(key, value, token)
+        return value
+
+    def invalidate(self, *keys) -> None:
+        with self._lock:
+            self.invalidations += 1
+        for key in keys:
+            self.backend.delete(self._key(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "backend": self.backend.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+
+class TagIdCache:
+    """
+    Process-wide map of tag names to IDs, bounded by number of entries (least recently used are evicted).
+    The API never renames nor deletes tags, so entries don't expire; the services only publish IDs of
+    committed tags (see app.services.tag).
+
+    Attributes:
+        max_entries (int): Maximum number of entries.
+        namespace (str): Name of the cache in metrics.
+    """
+    def __init__(self, max_entries: int = 10_000, namespace: str = "tag_ids"):
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get_many(self, names: Iterable[str]) -> dict[str, int]:
+        """
+        Args:
+            names (Iterable[str]): Tag names, without duplicates.
+
+        Returns:
+            dict[str, int]: IDs of the cached names; the others are missing from the result.
+        """
+        tag_ids = {}
+        with self._lock:
+            for name in names:
+                tag_id = self._entries.get(name)
+                if tag_id is None:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                self._entries.move_to_end(name)
+                tag_ids[name] = tag_id
+        return tag_ids
+
+    def put_many(self, tag_ids: dict[str, int]) -> None:
+        with self._lock:
+            for name, tag_id in tag_ids.items():
+                self._entries[name] = tag_id
+                self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+            }
+
+
+def create_cache_backend(ttl_seconds: Optional[float] = None) -> CacheBackend:
+    """
+    Build the cache backend configured in the environment.
+
+    Env:
+        CACHE_BACKEND ("memory" or "redis"), CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, CACHE_REDIS_URL.
+
+    Args:
+        ttl_seconds (float | None): Entry lifetime, CACHE_TTL_SECONDS if None.
+
+    Returns:
+        CacheBackend: Configured backend.
+    """
+    if ttl_seconds is None:
+        ttl_seconds = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    if os.getenv("CACHE_BACKEND", "memory") == "redis":
+        return RedisCacheBackend(os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"), ttl_seconds)
+    return LRUCacheBackend(int(os.getenv("CACHE_MAX_ENTRIES", "10000")), ttl_seconds)
+
+
+# Encoded BugResponse bodies keyed by bug ID.
+bug_cache = ResponseCache(create_cache_backend(), "bug")
+# Encoded BugStats bodies keyed by request parameters. Not invalidated on writes: entries live
+# STATS_CACHE_TTL_SECONDS, so dashboards see counts at most that old.
+stats_cache = ResponseCache(create_cache_backend(float(os.getenv("STATS_CACHE_TTL_SECONDS", "10"))), "stats")
+# Tag IDs by name, used to resolve tags of writes without querying the tags table.
+tag_id_cache = TagIdCache(int(os.getenv("TAG_CACHE_MAX_ENTRIES", "10000")))
+# Front of the idempotency_keys table (see app.services.idempotency), always per process: a retry reaching the
+# same worker is answered without querying the database.
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+idempotency_cache = ResponseCache(
+    LRUCacheBackend(int(os.getenv("IDEMPOTENCY_CACHE_MAX_ENTRIES", "10000")), IDEMPOTENCY_TTL_SECONDS), "idempotency"
+)
@@ -0,0 +1,331 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+import secrets
+import threading
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+from sqlalchemy import make_url
+
+from app.schemas.bug import ChangeType
+from app.utils.serialization import dump_json
+
+CHANGE_FEED_HISTORY = int(os.getenv("CHANGE_FEED_HISTORY", "1000"))
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "256"))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+CHANGE_FEED_NOTIFY = os.getenv("CHANGE_FEED_NOTIFY", "false").lower() in ("1", "true", "yes")
+CHANGE_FEED_CHANNEL = "bug_changes"
+# Delays between attempts to reconnect the LISTEN connection of PostgresChangeRelay.
+RELAY_RECONNECT_DELAY_SECONDS = 1.0
+RELAY_RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+
+class ChangeEvent:
+    """
+    A published change, encoded once for all subscribers.
+
+    Attributes:
+        id (str): Event ID, "{generation}-{sequence}".
+        sequence (int): Position in the feed of this process.
+        type (ChangeType): Kind of change.
+        data (bytes): JSON of the event: {"id": ..., "type": ..., "bug_id": ...}.
+    """
+    __slots__ = ("id", "sequence", "type", "data")
+
+    def __init__(self, event_id: str, sequence: int, change_type: ChangeType, data: bytes):
+        self.id = event_id
+        self.sequence = sequence
+        self.type = change_type
+        self.data = data
+
+
+class Subscription:
+    """
+    Bounded queue of events of a single subscriber, filled on the subscriber's event loop.
+    A subscriber which falls behind by more than the queue size is disconnected (its queue receives None)
+    and resumes from the history on reconnect.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue[Optional[ChangeEvent]] = asyncio.Queue(maxsize=queue_size)
+        self.last_sequence = 0
+
+    def overflow(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class ChangeFeed:
+    """
+    Per-process fan-out of bug changes to subscribers (SSE and WebSocket clients).
+
+    Events are numbered and kept in a bounded history, so subscribers can resume after the last event
+    they received. publish() may be called from any thread (sync endpoints run in a threadpool);
+    subscriber queues are only touched from the event loop each subscriber runs on.
+
+    Attributes:
+        history_size (int): Number of events kept for resuming.
+        queue_size (int): Maximum number of undelivered events per subscriber.
+        generation (str): Random prefix of event IDs, so IDs of another process (or of a previous run)
+            are recognized as unknown instead of being mistaken for local ones.
+        relay (Callable | None): When set (see PostgresChangeRelay), published changes are handed to it
+            on its event loop instead of being dispatched; it dispatches them back in every process.
+    """
+    def __init__(self, history_size: int = CHANGE_FEED_HISTORY, queue_size: int = CHANGE_FEED_QUEUE_SIZE):
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self.generation = secrets.token_hex(4)
+        self.relay: Optional[Callable[[dict], None]] = None
+        self.relay_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._history: deque[ChangeEvent] = deque(maxlen=history_size)
+        self._sequence = 0
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self.dropped_subscribers = 0
+
+    def publish(self, change_type: ChangeType, bug_ids: Iterable[int]) -> None:
+        """
+        Publish changes of committed bugs.
+
+        Args:
+            change_type (ChangeType): Kind of change.
+            bug_ids (Iterable[int]): IDs of the changed bugs.
+        """
+        for bug_id in bug_ids:
+            change = {"type": change_type.value, "bug_id": bug_id}
+            if self.relay is not None:
+                self.relay_loop.call_soon_threadsafe(self.relay, change)
+            else:
+                self.dispatch(change)
+
+    def dispatch(self, change: dict) -> ChangeEvent:
+        """
+        Number a change, add it to the history and queue it for the subscribers.
+
+        Args:
+            change (dict): {"type": ..., "bug_id": ...}.
+
+        Returns:
+            ChangeEvent: The event.
+        """
+        with self._lock:
+            self._sequence += 1
+            event = self._event(self._sequence, change)
+            self._history.append(event)
+            # Scheduled under the lock, so events reach each loop in sequence order.
+            for subscription in list(self._subscribers):
+                try:
+                    subscription.loop.call_soon_threadsafe(self._deliver, subscription, event)
+                except RuntimeError:
+                    # The subscriber's event loop is closed.
+                    self._subscribers.discard(subscription)
+        return event
+
+    def reset(self) -> None:
+        """
+        Dispatch a RESET event: subscribers may have missed changes and must reload the bugs they mirror.
+        """
+        self.dispatch({"type": ChangeType.RESET.value, "bug_id": None})
+
+    def _event(self, sequence: int, change: dict) -> ChangeEvent:
+        event_id = f"{self.generation}-{sequence}"
+        return ChangeEvent(event_id, sequence, ChangeType(change["type"]), dump_json({"id": event_id, **change}))
+
+    def _deliver(self, subscription: Subscription, event: ChangeEvent) -> None:
+        if event.sequence <= subscription.last_sequence or subscription not in self._subscribers:
+            return
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure: a slow subscriber must not hold events of the others nor grow memory.
+            with self._lock:
+                self._subscribers.discard(subscription)
+                self.dropped_subscribers += 1
+            subscription.overflow()
+            logging.warning("Change feed subscriber fell behind, disconnecting it.")
+
+    def _open(self, last_event_id: Optional[str]) -> tuple[Subscription, Optional[list[ChangeEvent]]]:
+        with self._lock:
+            subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+            self._subscribers.add(subscription)
+            subscription.last_sequence = self._sequence
+            if last_event_id is None:
+                return subscription, []
+
+            generation, _, sequence = last_event_id.rpartition("-")
+            oldest = self._history[0].sequence if self._history else self._sequence + 1
+            if generation != self.generation or not sequence.isdigit() or int(sequence) < oldest - 1:
+                # Events were missed: the subscriber has to resynchronize.
+                return subscription, None
+            return subscription, [event for event in self._history if event.sequence > int(sequence)]
+
+    def subscribe(self, last_event_id: Optional[str] = None,
+                  heartbeat: Optional[float] = None) -> AsyncIterator[Optional[ChangeEvent]]:
+        """
+        Subscribe to events after last_event_id (or to new events only). The subscription starts
+        immediately, so no event is missed between the call and the first iteration.
+        If events after last_event_id are no longer in the history, the stream starts with a RESET event:
+        the subscriber missed changes and must reload the bugs it mirrors.
+        The stream ends if the subscriber falls behind by more than queue_size events.
+
+        Args:
+            last_event_id (str | None): ID of the last event received before reconnecting.
+            heartbeat (float | None): Yield None after this many seconds without events.
+
+        Returns:
+            AsyncIterator[ChangeEvent | None]: Events (None for heartbeats).
+        """
+        subscription, backlog = self._open(last_event_id)
+        if backlog is None:
+            backlog = [self._event(subscription.last_sequence, {"type": ChangeType.RESET.value, "bug_id": None})]
+        return self._stream(subscription, backlog, heartbeat)
+
+    async def _stream(self, subscription: Subscription, backlog: list[ChangeEvent],
+                      heartbeat: Optional[float]) -> AsyncIterator[Optional[ChangeEvent]]:
+        try:
+            for event in backlog:
+                yield event
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return
+                subscription.last_sequence = event.sequence
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "last_sequence": self._sequence,
+                "history": len(self._history),
+                "dropped_subscribers": self.dropped_subscribers,
+            }
+
+
+class PostgresChangeRelay:
+    """
+    Broadcasts changes to every process through PostgreSQL LISTEN/NOTIFY: published changes are sent with
+    pg_notify() and each process (the publishing one included) dispatches the notifications it receives.
+    Uses a dedicated asyncpg connection.
+
+    If the connection drops or a notification can't be sent, subscribers get a RESET event (they miss the
+    changes of other processes) and changes are dispatched locally until the connection is reestablished.
+    A RESET is then broadcast, as the other processes missed the changes dispatched only locally meanwhile.
+
+    Args:
+        feed (ChangeFeed): Feed of this process.
+        database_url (str): SQLAlchemy URL of the PostgreSQL database.
+        channel (str): Notification channel.
+    """
+    def __init__(self, feed: ChangeFeed, database_url: str, channel: str = CHANGE_FEED_CHANNEL):
+        self.feed = feed
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._connection = None
+        self._pending: set[asyncio.Task] = set()
+        self._reconnecting: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    async def start(self) -> None:
+        self._stopped = False
+        await self._connect()
+        self.feed.relay_loop = asyncio.get_running_loop()
+        self.feed.relay = self.notify
+
+    async def stop(self) -> None:
+        self._stopped = True
+        self.feed.relay = None
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+            self._reconnecting = None
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        await connection.add_listener(self.channel, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+
+    def notify(self, change: dict) -> None:
+        if self._connection is None:
+            # Scheduled before the connection was lost.
+            self.feed.dispatch(change)
+            return
+        task = asyncio.ensure_future(
+            self._connection.execute("SELECT pg_notify($1, $2)", self.channel, json.dumps(change))
+        )
+        self._pending.add(task)
+        task.add_done_callback(functools.partial(self._notified, change))
+
+    def _notified(self, change: dict, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        logging.error(f"Unable to send change notification: {task.exception()}")
+        self._connection_lost()
+        self.feed.dispatch(change)
+
+    def _on_termination(self, connection) -> None:
+        if connection is self._connection and not self._stopped:
+            logging.error("Change notification connection closed.")
+            self._connection_lost()
+
+    def _connection_lost(self) -> None:
+        if self._reconnecting is not None or self._stopped:
+            return
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            connection.terminate()
+        self.feed.relay = None
+        self.feed.reset()
+        self._reconnecting = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        import asyncpg
+
+        delay = RELAY_RECONNECT_DELAY_SECONDS
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+                break
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logging.error(f"Unable to reconnect change notifications: {e}")
+                delay = min(delay * 2, RELAY_RECONNECT_MAX_DELAY_SECONDS)
+        self._reconnecting = None
+        self.feed.relay = self.notify
+        self.notify({"type": ChangeType.RESET.value, "bug_id": None})
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.feed.dispatch(json.loads(payload))
+
+
+def format_sse(event: Optional[ChangeEvent]) -> bytes:
+    """
+    Args:
+        event (ChangeEvent | None): Event, None for a heartbeat.
+
+    Returns:
+        bytes: Event (or a comment keeping the connection alive) in the server-sent events format.
+    """
+    if event is None:
+        return b": heartbeat\n\n"
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event.id.encode(), event.type.value.encode(), event.data)
+
+
+change_feed = ChangeFeed()
@@ -0,0 +1,103 @@
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_, literal, union_all, Select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.db.functions import utcnow
+from app.models.bug import Bug
+from app.models.bug_tombstone import BugTombstone
+from app.services.bug import BUG_RESPONSE_COLUMNS, select_bug_tags, bug_response_dicts
+from app.utils.cursor import encode_cursor, decode_cursor
+
+DEFAULT_CHANGES_PAGE_SIZE = 100
+MAX_CHANGES_PAGE_SIZE = 1000
+# Writes are stamped (by the database clock, at the start of the transaction on PostgreSQL) before they
+# commit, so a change may become visible with a time older than changes already returned. Once caught up,
+# clients resume this far back and receive such late commits (again).
+CHANGES_SETTLE_SECONDS = float(os.getenv("CHANGES_SETTLE_SECONDS", "5"))
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes, stored values are UTC.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+def select_changes(position: Optional[tuple[datetime, int]], limit: int) -> Select:
+    """
+    Build the SELECT of the next changes after a keyset position, oldest first: modified bugs by
+    (updated_at, id) merged with tombstones by (deleted_at, bug_id). Each side is an index range scan
+    limited to the page size, so the work depends on the number of changes, not on the size of the table.
+
+    Args:
+        position (tuple[datetime, int] | None): Time and ID of the last change seen (None for all changes).
+        limit (int): Maximum number of changes on the page (one more is fetched, see get_changes).
+
+    Returns:
+        Select: Statement selecting (changed_at, id, deleted) rows.
+    """
+    bug_changes = select(Bug.updated_at.label("changed_at"), Bug.id.label("id"), literal(False).label("deleted"))
+    tombstones = select(
+        BugTombstone.deleted_at.label("changed_at"), BugTombstone.bug_id.label("id"), literal(True).label("deleted")
+    )
+    if position is not None:
+        bug_changes = bug_changes.where(tuple_(Bug.updated_at, Bug.id) > tuple_(*position))
+        tombstones = tombstones.where(tuple_(BugTombstone.deleted_at, BugTombstone.bug_id) > tuple_(*position))
+
+    bug_changes = bug_changes.order_by(Bug.updated_at, Bug.id).limit(limit + 1).subquery()
+    tombstones = tombstones.order_by(BugTombstone.deleted_at, BugTombstone.bug_id).limit(limit + 1).subquery()
+    changes = union_all(select(bug_changes), select(tombstones)).subquery()
+    return select(changes).order_by(changes.c.changed_at, changes.c.id).limit(limit + 1)
+
+def get_changes(session: Session, since: Optional[str] = None, limit: int = DEFAULT_CHANGES_PAGE_SIZE) -> dict:
+    """
+    Get bugs modified and IDs of bugs deleted after a sync cursor (everything if since is None).
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        since (str | None): Cursor returned by the previous call.
+        limit (int): Maximum number of changes (bugs and deletions) returned.
+
+    Raises:
+        HTTPException: If cursor is malformed (400) or DB error occurs (500).
+
+    Returns:
+        dict: BugChanges-shaped dict, bugs ordered by modification time.
+    """
+    position = None
+    if since is not None:
+        try:
+            changed_at, bug_id = decode_cursor(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor!")
+        position = (_utc(changed_at), bug_id)
+
+    try:
+        changes = session.execute(select_changes(position, limit)).all()
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        bug_ids = [change.id for change in changes if not change.deleted]
+        rows = tag_rows = []
+        if bug_ids:
+            stmt = select(*BUG_RESPONSE_COLUMNS).where(Bug.id.in_(bug_ids)).order_by(Bug.updated_at, Bug.id)
+            rows = session.execute(stmt).all()
+            tag_rows = session.execute(select_bug_tags(bug_ids)).all()
+        now = None if has_more else _utc(session.scalar(select(utcnow())))
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch Bug changes: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if changes:
+        position = (_utc(changes[-1].changed_at), changes[-1].id)
+    if now is not None:
+        settled = (now - timedelta(seconds=CHANGES_SETTLE_SECONDS), 0)
+        position = min(position, settled) if position is not None else settled
+
+    return {
+        "bugs": bug_response_dicts(rows, tag_rows),
+        "deleted": [change.id for change in changes if change.deleted],
+        "next_cursor": encode_cursor(*position),
+        "has_more": has_more,
+    }
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import logging
+from enum import Enum
+from datetime import datetime
+from typing import Iterator, Optional, List
+from sqlalchemy import Engine, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models.association import bug_tags
+from app.models.bug import Bug
+from app.models.tag import Tag
+from app.schemas.bug import BugFilter, ExportFormat
+from app.services.bug import select_bugs
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id", "created_at", "updated_at", "submitter", "title", "description",
+    "status", "priority", "severity", "assigned_to",
+)
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def fetch_tags_for_bugs(session: Session, bug_ids: List[int]) -> dict[int, list[dict]]:
+    """
+    Fetch tags of many bugs in a single query.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bug_ids (List[int]): IDs of the bugs.
+
+    Returns:
+        dict[int, list[dict]]: Tags ({"id", "name"}) keyed by bug ID. Bugs without tags are missing.
+    """
+    stmt = (
+        select(bug_tags.c.bug_id, Tag.id, Tag.name)
+        .join(Tag, Tag.id == bug_tags.c.tag_id)
+        .where(bug_tags.c.bug_id.in_(bug_ids))
+    )
+    tags_by_bug: dict[int, list[dict]] = {}
+    for bug_id, tag_id, tag_name in session.execute(stmt):
+        tags_by_bug.setdefault(bug_id, []).append({"id": tag_id, "name": tag_name})
+    return tags_by_bug
+
+def iter_bug_batches(session: Session, filters: Optional[BugFilter] = None,
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[dict]]:
+    """
+    Stream Bug records in batches using a server-side cursor. Tags are fetched once per batch.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        filters (BugFilter | None): Requested filters.
+        batch_size (int): Number of rows fetched from the cursor at once.
+
+    Yields:
+        List[dict]: Plain bug rows (with "tags") of at most batch_size elements.
+    """
+    columns = [getattr(Bug, name) for name in EXPORT_COLUMNS]
+    stmt = (
+        select_bugs(filters)
+        .with_only_columns(*columns)
+        .order_by(Bug.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for partition in session.execute(stmt).mappings().partitions():
+        rows = [{name: _plain(value) for name, value in row.items()} for row in partition]
+        tags_by_bug = fetch_tags_for_bugs(session, [row["id"] for row in rows])
+        for row in rows:
+            row["tags"] = tags_by_bug.get(row["id"], [])
+        yield rows
+
+def _encode_ndjson(rows: List[dict]) -> str:
+    return "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+def _encode_csv(rows: List[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        tag_names = ";".join(tag["name"] for tag in row["tags"])
+        writer.writerow([row[name] for name in EXPORT_COLUMNS] + [tag_names])
+    return buffer.getvalue()
+
+def _encode_csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(list(EXPORT_COLUMNS) + ["tags"])
+    return buffer.getvalue()
+
+def export_bugs(bind: Engine, filters: Optional[BugFilter] = None,
+                export_format: ExportFormat = ExportFormat.NDJSON) -> Iterator[str]:
+    """
+    Generate an export of Bug records chunk by chunk.
+    Uses its own session, since request-scoped sessions are closed before a streamed body is sent.
+
+    Args:
+        bind (Engine): Engine to read from.
+        filters (BugFilter | None): Requested filters.
+        export_format (ExportFormat): NDJSON (one BugResponse-shaped object per line) or CSV.
+
+    Yields:
+        str: Encoded chunk, one per fetched batch (CSV header is sent first).
+    """
+    if export_format == ExportFormat.CSV:
+        yield _encode_csv_header()
+        encode = _encode_csv
+    else:
+        encode = _encode_ndjson
+
+    with Session(bind) as session:
+        try:
+            for rows in iter_bug_batches(session, filters):
+                yield encode(rows)
+        except SQLAlchemyError as e:
+            logging.error(f"Unable to export Bug records: {e}.")
+            raise e
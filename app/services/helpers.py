@@ -1,9 +1,13 @@
 from enum import Enum
-from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Any, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
 from app.models.bug import Bug
 from app.models.tag import Tag
-from app.schemas.bug import BugCreate, BugUpdate
+from app.schemas.bug import BugCreate, BugUpdate, BulkItemError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
 
 class Operation(Enum):
@@ -14,7 +18,7 @@ class Operation(Enum):
 def apply_bug_data_to_model(bug_obj: Bug, data: Optional[BugCreate | BugUpdate], operation: Operation = Operation.CREATE) -> None:
     """
     Applies BugCreate data to a Bug model instance.
-    Tags are handled separately.
+    Tags are handled separately, timestamps are set by the database.
     Args:
         bug_obj (Bug): Bug ORM object to update.
         data (BugCreate | BugUpdate): Incoming data from the request.
@@ -25,7 +29,6 @@ def apply_bug_data_to_model(bug_obj: Bug, data: Optional[BugCreate | BugUpdate],
     """
     if operation == Operation.PATCH:
         data_dict = data.model_dump(exclude_unset=True)
-        bug_obj.updated_at = datetime.now(timezone.utc)
     else:
         data_dict = data.model_dump()
 
@@ -52,3 +55,43 @@ def assign_tags_to_bug(bug: Bug, tags: List[Tag], operation: Operation = Operati
         bug.tags.extend(new_tags)
     else:
         bug.tags = tags
+
+def dialect_insert(session: Session, target):
+    """
+    Returns a dialect-specific INSERT construct, which supports ON CONFLICT clauses.
+
+    Args:
+        session (Session): DB session (used to detect the dialect).
+        target: Table or ORM entity to insert into.
+
+    Raises:
+        NotImplementedError: For databases other than PostgreSQL and SQLite.
+
+    Returns:
+        Insert: postgresql.insert() or sqlite.insert() construct.
+    """
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(target)
+    if dialect_name == "sqlite":
+        return sqlite.insert(target)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported for {dialect_name}")
+
+def validate_bulk_items(items: List[Any], model: Type[ModelT]) -> Tuple[List[Tuple[int, ModelT]], List[BulkItemError]]:
+    """
+    Validates each item of a bulk request separately, so a single invalid item does not reject the whole batch.
+
+    Args:
+        items (List[Any]): Raw items from the request body.
+        model (Type[BaseModel]): Pydantic model to validate items against.
+
+    Returns:
+        Tuple[List[Tuple[int, BaseModel]], List[BulkItemError]]: Valid items with their indexes and per-item errors.
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as e:
+            errors.append(BulkItemError(index=index, errors=e.errors(include_url=False, include_context=False)))
+    return valid, errors
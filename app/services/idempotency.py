@@ -0,0 +1,306 @@
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, delete, Select, Update, Delete, Insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+
+from app.models.idempotency_key import IdempotencyKey
+from app.services.cache import idempotency_cache, IDEMPOTENCY_TTL_SECONDS
+from app.services.helpers import dialect_insert
+from app.utils.serialization import FastJSONResponse
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+CLIENT_ID_HEADER = "X-Client-ID"
+REPLAYED_HEADER = "Idempotent-Replayed"
+# How long a request holds its key before retries may run it again (its placeholder row is then taken over):
+# longer than requests take, short enough for retries to succeed soon after a crash.
+IDEMPOTENCY_LEASE_SECONDS = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+# Expired keys are purged at startup and along with every PURGE_INTERVAL-th stored response.
+PURGE_INTERVAL = 1000
+
+_claims = 0
+
+
+class StoredResponse(NamedTuple):
+    """
+    Response of an idempotent request.
+
+    Attributes:
+        status_code (int): HTTP status.
+        body (bytes): JSON body.
+        replayed (bool): Whether it was stored by an earlier request with the same key.
+    """
+    status_code: int
+    body: bytes
+    replayed: bool = False
+
+
+def idempotency_client(connection: HTTPConnection) -> str:
+    """
+    Args:
+        connection (HTTPConnection): Request.
+
+    Returns:
+        str: Owner of the request's Idempotency-Key: the X-Client-ID header, the client address without it.
+    """
+    client = connection.headers.get(CLIENT_ID_HEADER)
+    if client:
+        return client[:255]
+    return connection.client.host if connection.client is not None else ""
+
+def request_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+def validate_idempotency_key(key: str) -> None:
+    """
+    Raises:
+        HTTPException: If the key is empty or longer than MAX_IDEMPOTENCY_KEY_LENGTH (400).
+    """
+    if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(
+            status_code=400, detail=f"Idempotency-Key must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters long!"
+        )
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+def pack_stored_response(status_code: int, hash_: str, body: bytes, expires_at: datetime) -> bytes:
+    """
+    Encode a stored response as an idempotency_cache entry.
+
+    Args:
+        status_code (int): HTTP status.
+        hash_ (str): Request hash.
+        body (bytes): JSON body.
+        expires_at (datetime): Expiry of the key.
+
+    Returns:
+        bytes: Cache entry (see unpack_stored_response).
+    """
+    return f"{status_code} {hash_} {as_utc(expires_at).timestamp()}\n".encode() + body
+
+def unpack_stored_response(entry: bytes) -> tuple[int, str, float, bytes]:
+    """
+    Args:
+        entry (bytes): Cache entry created by pack_stored_response.
+
+    Returns:
+        tuple[int, str, float, bytes]: HTTP status, request hash, expiry (epoch seconds) and JSON body.
+    """
+    header, body = entry.split(b"\n", 1)
+    status_code, hash_, expires_at = header.decode().split(" ")
+    return int(status_code), hash_, float(expires_at), body
+
+def check_request_hash(stored_hash: str, hash_: str) -> None:
+    """
+    Raises:
+        HTTPException: If the key was used for a different request body (422).
+    """
+    if stored_hash != hash_:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request!")
+
+def cached_response(client: str, key: str, hash_: str, now: datetime) -> Optional[StoredResponse]:
+    """
+    Args:
+        client (str): Owner of the key.
+        key (str): Idempotency-Key.
+        hash_ (str): Request hash.
+        now (datetime): Current time.
+
+    Raises:
+        HTTPException: If the key was used for a different request body (422).
+
+    Returns:
+        StoredResponse | None: Response held by the front cache, None if not cached or expired.
+    """
+    entry, _ = idempotency_cache.lookup((client, key))
+    if entry is None:
+        return None
+    status_code, stored_hash, expires_at, body = unpack_stored_response(entry)
+    if expires_at <= now.timestamp():
+        return None
+    check_request_hash(stored_hash, hash_)
+    return StoredResponse(status_code, body, replayed=True)
+
+def select_idempotency_key(client: str, key: str, now: datetime) -> Select:
+    return select(
+        IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response, IdempotencyKey.expires_at
+    ).where(IdempotencyKey.client == client, IdempotencyKey.key == key, IdempotencyKey.expires_at > now)
+
+def stored_response(client: str, key: str, hash_: str, row) -> StoredResponse:
+    """
+    Args:
+        client (str): Owner of the key.
+        key (str): Idempotency-Key.
+        hash_ (str): Request hash.
+        row (Row): Result of select_idempotency_key.
+
+    Raises:
+        HTTPException: If the key was used for a different request body (422),
+            or the request that first used it has not finished yet (409).
+
+    Returns:
+        StoredResponse: Stored response, also put into the front cache.
+    """
+    check_request_hash(row.request_hash, hash_)
+    if row.status_code is None:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress!")
+    entry = pack_stored_response(row.status_code, row.request_hash, row.response, row.expires_at)
+    idempotency_cache.put((client, key), entry)
+    return StoredResponse(row.status_code, row.response, replayed=True)
+
+def claim_idempotency_key(session: Session, client: str, key: str, hash_: str, now: datetime,
+                          expires_at: datetime) -> Insert:
+    """
+    Build the INSERT of an in-progress placeholder, replacing an expired row of the same key: a stored
+    response past its TTL, or a placeholder past its lease (its request crashed or failed to store the response).
+    Returns the key when the placeholder was written, nothing when another request holds the key.
+
+    Args:
+        session (Session): DB session (used to detect the dialect).
+        client (str): Owner of the key.
+        key (str): Idempotency-Key.
+        hash_ (str): Request hash.
+        now (datetime): Current time.
+        expires_at (datetime): End of the placeholder's lease.
+
+    Returns:
+        Insert: Upsert of the IdempotencyKey row.
+    """
+    values = {"request_hash": hash_, "status_code": None, "response": None, "expires_at": expires_at}
+    stmt = dialect_insert(session, IdempotencyKey).values(client=client, key=key, **values)
+    return stmt.on_conflict_do_update(
+        index_elements=["client", "key"], set_=values, where=IdempotencyKey.expires_at <= now
+    ).returning(IdempotencyKey.key)
+
+def store_idempotent_response(client: str, key: str, hash_: str, status_code: int, body: bytes,
+                              expires_at: datetime) -> Update:
+    # Only into the placeholder of the request: not over the response of one that took over an expired lease.
+    return update(IdempotencyKey).where(
+        IdempotencyKey.client == client, IdempotencyKey.key == key, IdempotencyKey.request_hash == hash_,
+        IdempotencyKey.status_code.is_(None)
+    ).values(status_code=status_code, response=body, expires_at=expires_at)
+
+def release_idempotency_key(client: str, key: str) -> Delete:
+    # Only the placeholder: a failed request leaves the key free for a retry.
+    return delete(IdempotencyKey).where(
+        IdempotencyKey.client == client, IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+    )
+
+def purge_expired_statement(now: datetime) -> Delete:
+    return delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+
+def purge_due() -> bool:
+    global _claims
+    _claims += 1
+    return _claims % PURGE_INTERVAL == 0
+
+def idempotent_response(stored: StoredResponse) -> FastJSONResponse:
+    """
+    Args:
+        stored (StoredResponse): Response of an idempotent request.
+
+    Returns:
+        FastJSONResponse: The response, with the Idempotent-Replayed header on replays.
+    """
+    headers = {REPLAYED_HEADER: "true"} if stored.replayed else None
+    return FastJSONResponse(stored.body, status_code=stored.status_code, headers=headers)
+
+def purge_expired_idempotency_keys(session: Session) -> int:
+    """
+    Delete expired IdempotencyKey rows.
+
+    Args:
+        session (Session): DB session.
+
+    Returns:
+        int: Number of deleted rows.
+    """
+    try:
+        deleted = session.execute(purge_expired_statement(datetime.now(timezone.utc))).rowcount
+        session.commit()
+        return deleted
+    except SQLAlchemyError as e:
+        session.rollback()
+        logging.error(f"Unable to purge expired idempotency keys: {e}")
+        return 0
+
+def run_idempotent(session: Session, client: str, key: str, body: bytes, status_code: int,
+                   handler: Callable[[], bytes]) -> StoredResponse:
+    """
+    Run a write request at most once per client and Idempotency-Key: retries get the stored response
+    (from the front cache, or a single SELECT) without running any writes.
+
+    The key is claimed with a committed placeholder row before handler runs, so concurrent retries are
+    rejected instead of running it too; the placeholder is removed if handler fails. It is leased for
+    IDEMPOTENCY_LEASE_SECONDS only, the response is kept for IDEMPOTENCY_TTL_SECONDS once stored.
+
+    Args:
+        session (Session): DB session.
+        client (str): Owner of the key (see idempotency_client).
+        key (str): Idempotency-Key header.
+        body (bytes): Canonical request body; a retry with another body is rejected.
+        status_code (int): HTTP status of handler's response.
+        handler (Callable[[], bytes]): Runs the request (committing its writes) and returns the JSON body.
+
+    Raises:
+        HTTPException: If the key is invalid (400), reused for a different body (422), held by a request
+            still in progress (409) or DB error occurs (500).
+
+    Returns:
+        StoredResponse: Response of handler or the stored one.
+    """
+    validate_idempotency_key(key)
+    hash_, now = request_hash(body), datetime.now(timezone.utc)
+    cached = cached_response(client, key, hash_, now)
+    if cached is not None:
+        return cached
+
+    try:
+        row = session.execute(select_idempotency_key(client, key, now)).first()
+        if row is not None:
+            session.rollback()
+            return stored_response(client, key, hash_, row)
+        claimed = session.scalar(claim_idempotency_key(
+            session, client, key, hash_, now, now + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+        ))
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        logging.error(f"Unable to claim Idempotency-Key {key!r} of client {client!r}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if claimed is None:
+        # Another request claimed the key between the SELECT and the INSERT.
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress!")
+
+    try:
+        response = handler()
+    except Exception:
+        try:
+            session.execute(release_idempotency_key(client, key))
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            logging.error(f"Unable to release Idempotency-Key {key!r} of client {client!r}: {e}")
+        raise
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    try:
+        session.execute(store_idempotent_response(client, key, hash_, status_code, response, expires_at))
+        if purge_due():
+            session.execute(purge_expired_statement(now))
+        session.commit()
+    except SQLAlchemyError as e:
+        # The writes are committed, so the request succeeded; a retry gets 409 until the lease expires.
+        session.rollback()
+        logging.error(f"Unable to store response of Idempotency-Key {key!r} of client {client!r}: {e}")
+        return StoredResponse(status_code, response)
+    idempotency_cache.put((client, key), pack_stored_response(status_code, hash_, response, expires_at))
+    return StoredResponse(status_code, response)
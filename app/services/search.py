@@ -0,0 +1,73 @@
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+from app.models.bug import Bug
+from app.schemas.bug import BugFilter
+from app.services.bug import bug_filter_conditions, DEFAULT_PAGE_SIZE
+from app.services.search_index import fallback_search_index
+
+
+def _search_postgres(session: Session, q: str, filters: Optional[BugFilter],
+                     limit: int, offset: int) -> List[Bug]:
+    query = func.websearch_to_tsquery("english", q)
+    search_vector = literal_column("bugs.search_vector")
+    rank = func.ts_rank(search_vector, query)
+
+    stmt = (
+        select(Bug)
+        .where(search_vector.op("@@")(query), *bug_filter_conditions(filters))
+        .order_by(rank.desc(), Bug.id)
+        .offset(offset)
+        .limit(limit + 1)
+        .options(selectinload(Bug.tags))
+    )
+    return list(session.scalars(stmt).all())
+
+def _search_fallback(session: Session, q: str, filters: Optional[BugFilter],
+                     limit: int, offset: int) -> List[Bug]:
+    if not fallback_search_index.built:
+        fallback_search_index.build(session)
+
+    ranked_ids = [bug_id for bug_id, _ in fallback_search_index.search(q)]
+    if filters is not None:
+        matching = set(session.scalars(
+            select(Bug.id).where(Bug.id.in_(ranked_ids), *bug_filter_conditions(filters))
+        ).all())
+        ranked_ids = [bug_id for bug_id in ranked_ids if bug_id in matching]
+
+    page_ids = ranked_ids[offset:offset + limit + 1]
+    bugs = session.scalars(select(Bug).where(Bug.id.in_(page_ids)).options(selectinload(Bug.tags))).all()
+    bugs_by_id = {bug.id: bug for bug in bugs}
+    # Bugs removed by another process may still be indexed here, skip them.
+    return [bugs_by_id[bug_id] for bug_id in page_ids if bug_id in bugs_by_id]
+
+def search_bugs(session: Session, q: str, filters: Optional[BugFilter] = None, limit: int = DEFAULT_PAGE_SIZE,
+                offset: int = 0) -> Tuple[List[Bug], Optional[int]]:
+    """
+    Full-text search over bug titles and descriptions, best match first.
+    Uses the tsvector column on PostgreSQL and the in-process inverted index elsewhere.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        q (str): Search phrase (websearch syntax on PostgreSQL, all words must match).
+        filters (BugFilter | None): Requested filters.
+        limit (int): Maximum number of records on the page.
+        offset (int): Number of matches to skip.
+
+    Returns:
+        Tuple[List[Bug], Optional[int]]: Matching Bug ORM objects and offset of the next page (None on last page).
+    """
+    try:
+        if session.get_bind().dialect.name == "postgresql":
+            bugs = _search_postgres(session, q, filters, limit, offset)
+        else:
+            bugs = _search_fallback(session, q, filters, limit, offset)
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to search Bug records: {e}.")
+        raise e
+
+    if len(bugs) > limit:
+        return bugs[:limit], offset + limit
+    return bugs, None
@@ -0,0 +1,152 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import List, Optional, Tuple
+from sqlalchemy import select, event
+from sqlalchemy.orm import Session
+from app.models.bug import Bug
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# Title matches weigh more than description ones, like setweight 'A'/'B' on PostgreSQL.
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over bug titles and descriptions.
+    Fallback for databases without full-text search (SQLite), so the feature works in tests and local runs.
+    It is built from the database on first search and kept up to date by the bug services afterwards;
+    it is not shared between processes.
+    """
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = {}
+        self._documents: dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        # Writes made while a build reads the database, replayed on its result (None when not building).
+        self._pending: Optional[List[Tuple[int, Optional[Tuple[str, str]]]]] = None
+        self._generation = 0
+        self.built = False
+
+    def clear(self) -> None:
+        """
+        Drop all entries. The index is rebuilt from the database on next search.
+        """
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._generation += 1
+            self.built = False
+
+    def build(self, session: Session) -> None:
+        """
+        (Re)build the index from all Bug records. Bugs written while the records are read (committed after
+        the SELECT started) are indexed from their add()/remove() calls, buffered meanwhile.
+
+        Args:
+            session (Session): DB session.
+        """
+        stmt = select(Bug.id, Bug.title, Bug.description).execution_options(yield_per=1000)
+        with self._build_lock:
+            try:
+                while True:
+                    with self._lock:
+                        self._pending = []
+                        generation = self._generation
+                    rows = session.execute(stmt).all()
+                    with self._lock:
+                        # Cleared meanwhile (e.g. by a bulk update): the rows may be stale, read them again.
+                        if self._generation != generation:
+                            continue
+                        self._postings.clear()
+                        self._documents.clear()
+                        for bug_id, title, description in rows:
+                            self._add(bug_id, title, description)
+                        for bug_id, text in self._pending:
+                            self._remove(bug_id)
+                            if text is not None:
+                                self._add(bug_id, *text)
+                        self.built = True
+                        return
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def add(self, bug_id: int, title: str, description: str) -> None:
+        """
+        Index (or re-index) a bug. No-op until the index is built, buffered while it is being built.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((bug_id, (title, description)))
+                return
+            if not self.built:
+                return
+            self._remove(bug_id)
+            self._add(bug_id, title, description)
+
+    def remove(self, bug_id: int) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((bug_id, None))
+                return
+            self._remove(bug_id)
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """
+        Find bugs containing all query terms.
+
+        Args:
+            query (str): Search phrase.
+
+        Returns:
+            List[Tuple[int, float]]: Bug IDs with TF-IDF scores, best match first.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            total = len(self._documents)
+            candidates = set.intersection(*(set(posting) for posting in postings))
+            scores = {
+                bug_id: sum(posting[bug_id] * math.log(1 + total / len(posting)) for posting in postings)
+                for bug_id in candidates
+            }
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def _add(self, bug_id: int, title: str, description: str) -> None:
+        counts = Counter(tokenize(description or ""))
+        for term in tokenize(title or ""):
+            counts[term] += TITLE_WEIGHT
+        self._documents[bug_id] = counts
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[bug_id] = count
+
+    def _remove(self, bug_id: int) -> None:
+        counts = self._documents.pop(bug_id, None)
+        if counts is None:
+            return
+        for term in counts:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(bug_id, None)
+                if not posting:
+                    del self._postings[term]
+
+
+fallback_search_index = InvertedIndex()
+
+@event.listens_for(Bug.__table__, "after_create")
+def _clear_index_on_create(*args, **kwargs) -> None:
+    # A freshly created table invalidates anything indexed before (e.g. between test runs).
+    fallback_search_index.clear()
@@ -0,0 +1,284 @@
+import hashlib
+import logging
+import os
+import re
+import struct
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Engine, select, insert, delete, exists, func, Select, Delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.bug import Bug
+from app.models.bug_similarity import bug_similarity_buckets
+from app.schemas.bug import SimilarBug, Status
+from app.services.helpers import dialect_insert
+from app.services.search_index import tokenize
+
+# Jaccard similarity of word shingles above which bugs are reported as near-duplicates.
+SIMILARITY_THRESHOLD = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.6"))
+# Open near-duplicates returned by POST /bugs; 0 skips the lookup.
+DUPLICATE_SUGGESTIONS = int(os.getenv("DUPLICATE_SUGGESTIONS", "5"))
+
+# 16 bands of 4 MinHash values: bugs with similarity 0.5 share a bucket with probability 0.64, 0.7 with 0.99.
+BANDS = 16
+ROWS_PER_BAND = 4
+# Shingles come from the first tokens only, which bounds the cost of a signature on the write path.
+MAX_SHINGLE_TOKENS = 200
+# Bugs sharing most buckets with the searched one, verified by their exact similarity.
+MAX_CANDIDATES = 50
+BACKFILL_BATCH_SIZE = 1000
+
+NUMBER_PATTERN = re.compile(r"\d")
+# A shingle's values under the BANDS * ROWS_PER_BAND hash functions of the signature: one SHAKE-128 digest
+# split into 32-bit integers (buckets are stored, so they must not depend on the process or platform).
+_SHINGLE_VALUES = struct.Struct(f">{BANDS * ROWS_PER_BAND}I")
+_BAND_FORMAT = struct.Struct(f">H{ROWS_PER_BAND}I")
+
+
+def shingles(title: Optional[str], description: Optional[str]) -> Set[str]:
+    """
+    Word bigrams of a bug's title and description. Tokens containing digits (addresses, line numbers,
+    counts) are replaced by one placeholder, so reports differing only in them are identical.
+
+    Args:
+        title (str | None): Bug title.
+        description (str | None): Bug description.
+
+    Returns:
+        Set[str]: Shingles, empty for a bug without words.
+    """
+    tokens = [
+        "#" if NUMBER_PATTERN.search(token) else token
+        for token in (tokenize(title or "") + tokenize(description or ""))[:MAX_SHINGLE_TOKENS]
+    ]
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{first} {second}" for first, second in zip(tokens, tokens[1:])}
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+def minhash(shingle_set: Set[str]) -> List[int]:
+    """
+    Args:
+        shingle_set (Set[str]): Non-empty result of shingles().
+
+    Returns:
+        List[int]: MinHash signature, the minimum value of the shingles under each hash function.
+    """
+    values = [_SHINGLE_VALUES.unpack(hashlib.shake_128(shingle.encode()).digest(_SHINGLE_VALUES.size))
+              for shingle in shingle_set]
+    return list(map(min, zip(*values)))
+
+def lsh_buckets(shingle_set: Set[str]) -> List[int]:
+    """
+    Args:
+        shingle_set (Set[str]): Result of shingles().
+
+    Returns:
+        List[int]: One signed 64-bit bucket per band of the MinHash signature, none without shingles.
+    """
+    if not shingle_set:
+        return []
+    signature = minhash(shingle_set)
+    buckets = []
+    for band in range(BANDS):
+        values = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(_BAND_FORMAT.pack(band, *values), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+def bucket_rows(bugs: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> List[dict]:
+    """
+    Args:
+        bugs (Iterable[Tuple[int, str, str]]): ID, title and description of bugs.
+
+    Returns:
+        List[dict]: bug_similarity_buckets rows of the bugs.
+    """
+    return [
+        {"bucket": bucket, "bug_id": bug_id}
+        for bug_id, title, description in bugs
+        for bucket in set(lsh_buckets(shingles(title, description)))
+    ]
+
+def unindex_statement(bug_ids: List[int]) -> Delete:
+    return delete(bug_similarity_buckets).where(bug_similarity_buckets.c.bug_id.in_(bug_ids))
+
+def select_similar_candidates(buckets: List[int], exclude_bug_id: Optional[int] = None,
+                              open_only: bool = False, limit: int = MAX_CANDIDATES) -> Select:
+    """
+    Args:
+        buckets (List[int]): Buckets of the searched text.
+        exclude_bug_id (int | None): Bug not to return (the searched one).
+        open_only (bool): Skip closed bugs.
+        limit (int): Maximum number of candidates.
+
+    Returns:
+        Select: Bugs sharing at least one bucket, those sharing most first (a single lookup by primary key
+            per bucket, whatever the number of bugs).
+    """
+    table = bug_similarity_buckets
+    stmt = (
+        select(Bug.id, Bug.title, Bug.description, Bug.status, Bug.priority, Bug.assigned_to)
+        .join(table, table.c.bug_id == Bug.id)
+        .where(table.c.bucket.in_(buckets))
+        .group_by(Bug.id)
+        .order_by(func.count().desc(), Bug.id.desc())
+        .limit(limit)
+    )
+    if exclude_bug_id is not None:
+        stmt = stmt.where(Bug.id != exclude_bug_id)
+    if open_only:
+        stmt = stmt.where(Bug.status != Status.CLOSED)
+    return stmt
+
+def rank_similar(shingle_set: Set[str], candidates: Iterable, threshold: float, limit: int) -> List[SimilarBug]:
+    """
+    Args:
+        shingle_set (Set[str]): Shingles of the searched text.
+        candidates (Iterable[Row]): Result of select_similar_candidates.
+        threshold (float): Minimum similarity.
+        limit (int): Maximum number of bugs.
+
+    Returns:
+        List[SimilarBug]: Candidates at least threshold similar, most similar (then newest) first.
+    """
+    similar = []
+    for row in candidates:
+        similarity = jaccard(shingle_set, shingles(row.title, row.description))
+        if similarity >= threshold:
+            similar.append(SimilarBug(id=row.id, title=row.title, status=row.status, priority=row.priority,
+                                      assigned_to=row.assigned_to, similarity=round(similarity, 3)))
+    similar.sort(key=lambda bug: (-bug.similarity, -bug.id))
+    return similar[:limit]
+
+def index_bugs(session: Session, bugs: Sequence[Tuple[int, Optional[str], Optional[str]]],
+               replace: bool = False) -> None:
+    """
+    Add bugs to the similarity index, in the transaction writing them (not committed here).
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bugs (Sequence[Tuple[int, str, str]]): ID, title and description of bugs.
+        replace (bool): Whether the bugs are already indexed (their previous buckets are deleted first).
+    """
+    if replace and bugs:
+        session.execute(unindex_statement([bug_id for bug_id, _, _ in bugs]))
+    rows = bucket_rows(bugs)
+    if rows:
+        session.execute(insert(bug_similarity_buckets), rows)
+
+def find_similar_bugs(session: Session, title: Optional[str], description: Optional[str],
+                      exclude_bug_id: Optional[int] = None, open_only: bool = False, limit: int = 10,
+                      threshold: float = SIMILARITY_THRESHOLD) -> List[SimilarBug]:
+    """
+    Find near-duplicates of a text in the similarity index (MinHash signatures, LSH buckets).
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        title (str | None): Title to compare.
+        description (str | None): Description to compare.
+        exclude_bug_id (int | None): Bug not to return (the searched one).
+        open_only (bool): Skip closed bugs.
+        limit (int): Maximum number of bugs.
+        threshold (float): Minimum similarity (Jaccard index of word bigrams).
+
+    Returns:
+        List[SimilarBug]: Similar bugs, most similar first.
+    """
+    shingle_set = shingles(title, description)
+    buckets = lsh_buckets(shingle_set)
+    if not buckets:
+        return []
+    try:
+        candidates = session.execute(select_similar_candidates(buckets, exclude_bug_id, open_only)).all()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to look up similar Bug records: {e}")
+        raise e
+    return rank_similar(shingle_set, candidates, threshold, limit)
+
+def get_similar_bugs(session: Session, bug_id: int, limit: int = 10,
+                     threshold: float = SIMILARITY_THRESHOLD) -> List[SimilarBug]:
+    """
+    Find near-duplicates of a bug.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bug_id (int): ID of the bug.
+        limit (int): Maximum number of bugs.
+        threshold (float): Minimum similarity.
+
+    Raises:
+        HTTPException: If bug not found (404).
+
+    Returns:
+        List[SimilarBug]: Similar bugs, most similar first.
+    """
+    bug = session.execute(select(Bug.title, Bug.description).where(Bug.id == bug_id)).first()
+    if bug is None:
+        raise HTTPException(status_code=404, detail=f"Bug with ID:{bug_id} not found!")
+    return find_similar_bugs(session, bug.title, bug.description, exclude_bug_id=bug_id, limit=limit,
+                             threshold=threshold)
+
+def suggest_duplicates(session: Session, bug: Bug) -> List[SimilarBug]:
+    """
+    Open bugs a newly created one likely duplicates. The bug is already committed, so a failed lookup
+    is logged and yields no suggestions instead of failing the request.
+
+    Args:
+        session (Session): SQLAlchemy database session.
+        bug (Bug): Created bug.
+
+    Returns:
+        List[SimilarBug]: Up to DUPLICATE_SUGGESTIONS open bugs, most similar first.
+    """
+    if DUPLICATE_SUGGESTIONS <= 0:
+        return []
+    try:
+        return find_similar_bugs(session, bug.title, bug.description, exclude_bug_id=bug.id, open_only=True,
+                                 limit=DUPLICATE_SUGGESTIONS)
+    except SQLAlchemyError:
+        session.rollback()
+        return []
+
+def backfill_similarity_index(bind: Engine, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Index bugs that have no buckets yet (created before the index existed, or by bulk loads bypassing the
+    services), one committed batch at a time. Safe to run from several processes at once.
+
+    Args:
+        bind (Engine): Engine of the database.
+        batch_size (int): Bugs per batch.
+
+    Returns:
+        int: Number of indexed bugs.
+    """
+    table = bug_similarity_buckets
+    indexed, last_id = 0, 0
+    while True:
+        with Session(bind) as session:
+            try:
+                bugs = session.execute(
+                    select(Bug.id, Bug.title, Bug.description)
+                    .where(Bug.id > last_id, ~exists().where(table.c.bug_id == Bug.id))
+                    .order_by(Bug.id)
+                    .limit(batch_size)
+                ).all()
+                if not bugs:
+                    return indexed
+                rows = bucket_rows(bugs)
+                if rows:
+                    session.execute(dialect_insert(session, table).on_conflict_do_nothing(), rows)
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                logging.error(f"Unable to backfill the similarity index: {e}")
+                return indexed
+        # Bugs without words get no buckets, the keyset makes sure they are read only once.
+        last_id = bugs[-1].id
+        indexed += len(bugs)
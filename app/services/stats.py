@@ -0,0 +1,141 @@
+import logging
+from datetime import date, datetime
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import select, func, cast, Date, ColumnElement
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models.association import bug_tags
+from app.models.bug import Bug
+from app.models.tag import Tag
+from app.schemas.bug import BugFilter, BugStats, StatsBucket, DailyBugStats, StatsInterval, Status
+from app.services.bug import bug_filter_conditions
+from app.services.cache import stats_cache
+
+
+def day_of(session: Session, column) -> ColumnElement:
+    """
+    Truncate a timestamp column to its day, in the dialect of the session.
+
+    Args:
+        session (Session): DB session (used to detect the dialect).
+        column: Timestamp column.
+
+    Returns:
+        ColumnElement: Date expression (ISO string on SQLite).
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+def _group_counts(session: Session, column, conditions: List[ColumnElement[bool]]) -> List[StatsBucket]:
+    """
+    Count bugs per value of a column (GROUP BY), most frequent first.
+    """
+    count = func.count()
+    stmt = select(column, count).where(*conditions).group_by(column).order_by(count.desc(), column)
+    return [
+        StatsBucket(value=getattr(value, "value", value), count=value_count)
+        for value, value_count in session.execute(stmt).all()
+    ]
+
+def _tag_counts(session: Session, conditions: List[ColumnElement[bool]]) -> List[StatsBucket]:
+    """
+    Count bugs per tag (GROUP BY over bug_tags), most frequent first.
+    """
+    count = func.count()
+    stmt = select(Tag.name, count).select_from(bug_tags).join(Tag, Tag.id == bug_tags.c.tag_id)
+    if conditions:
+        stmt = stmt.join(Bug, Bug.id == bug_tags.c.bug_id).where(*conditions)
+    stmt = stmt.group_by(Tag.name).order_by(count.desc(), Tag.name)
+    return [StatsBucket(value=name, count=name_count) for name, name_count in session.execute(stmt).all()]
+
+def _daily_counts(session: Session, conditions: List[ColumnElement[bool]],
+                  since: Optional[datetime]) -> List[DailyBugStats]:
+    """
+    Count bugs opened (by created_at) and closed per day.
+    Close time is not recorded, so a bug counts as closed on the day of its last update while being CLOSED.
+    """
+    days: dict[date, DailyBugStats] = {}
+
+    def bucket(day) -> DailyBugStats:
+        day = day if isinstance(day, date) else date.fromisoformat(day)
+        return days.setdefault(day, DailyBugStats(day=day, opened=0, closed=0))
+
+    opened_day = day_of(session, Bug.created_at)
+    opened_stmt = select(opened_day, func.count()).where(*conditions)
+    if since is not None:
+        opened_stmt = opened_stmt.where(Bug.created_at >= since)
+    for day, day_count in session.execute(opened_stmt.group_by(opened_day)).all():
+        bucket(day).opened = day_count
+
+    closed_day = day_of(session, Bug.updated_at)
+    closed_stmt = select(closed_day, func.count()).where(*conditions, Bug.status == Status.CLOSED)
+    if since is not None:
+        closed_stmt = closed_stmt.where(Bug.updated_at >= since)
+    for day, day_count in session.execute(closed_stmt.group_by(closed_day)).all():
+        bucket(day).closed = day_count
+
+    return [days[day] for day in sorted(days)]
+
+def get_bug_stats(session: Session, filters: Optional[BugFilter] = None, interval: Optional[StatsInterval] = None,
+                  since: Optional[datetime] = None) -> BugStats:
+    """
+    Aggregate bug counts in SQL, by status, priority, severity, assignee and tag.
+
+    Args:
+        session (Session): DB session.
+        filters (BugFilter | None): Requested filters, applied to all counts.
+        interval (StatsInterval | None): Also count bugs opened/closed per interval (only "day" is supported).
+        since (datetime | None): Start of the per-interval counts (all time if None).
+
+    Raises:
+        HTTPException: If DB error occurs (500).
+
+    Returns:
+        BugStats: Aggregated counts.
+    """
+    conditions = bug_filter_conditions(filters)
+    try:
+        by_status = _group_counts(session, Bug.status, conditions)
+        stats = BugStats(
+            total=sum(bucket.count for bucket in by_status),
+            by_status=by_status,
+            by_priority=_group_counts(session, Bug.priority, conditions),
+            by_severity=_group_counts(session, Bug.severity, conditions),
+            by_assignee=_group_counts(session, Bug.assigned_to, conditions),
+            by_tag=_tag_counts(session, conditions),
+        )
+        if interval == StatsInterval.DAY:
+            stats.daily = _daily_counts(session, conditions, since)
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to aggregate Bug records: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return stats
+
+def get_bug_stats_json(session: Session, filters: Optional[BugFilter] = None,
+                       interval: Optional[StatsInterval] = None, since: Optional[datetime] = None,
+                       cached: bool = False) -> bytes:
+    """
+    Encoded BugStats, optionally served from stats_cache (counts up to STATS_CACHE_TTL_SECONDS old).
+
+    Args:
+        session (Session): DB session.
+        filters (BugFilter | None): Requested filters, applied to all counts.
+        interval (StatsInterval | None): Also count bugs opened/closed per interval.
+        since (datetime | None): Start of the per-interval counts.
+        cached (bool): Allow a recently computed result.
+
+    Returns:
+        bytes: JSON body of BugStats.
+    """
+    def load() -> bytes:
+        return get_bug_stats(session, filters, interval, since).model_dump_json().encode()
+
+    if not cached:
+        return load()
+
+    filters_key = filters.model_dump_json(exclude_none=True) if filters is not None else "{}"
+    interval_key = interval.value if interval is not None else ""
+    since_key = since.isoformat() if since is not None else ""
+    return stats_cache.get_or_load(f"{filters_key}|{interval_key}|{since_key}", load)
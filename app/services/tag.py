@@ -1,9 +1,30 @@
 import logging
-from typing import List
+from typing import List, Iterable, Optional, Tuple
 from fastapi import HTTPException
+from sqlalchemy import event, select, update, delete, bindparam, tuple_, Delete, Insert, Row, Select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from app.models.association import bug_tags
 from app.models.tag import Tag
+from app.schemas.bug import TagSort
+from app.services.cache import tag_id_cache
+from app.services.helpers import dialect_insert
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.etag import version_etag
+
+DEFAULT_TAG_PAGE_SIZE = 50
+MAX_TAG_PAGE_SIZE = 500
+
+# Session.info key of tag IDs waiting for the transaction to commit (see remember_tag_ids).
+PENDING_TAG_IDS = "pending_tag_ids"
+
+# Executed with one parameter set per tag: {"tag_id": ..., "delta": ...}.
+ADJUST_TAG_COUNT = (
+    update(Tag.__table__)
+    .where(Tag.__table__.c.id == bindparam("tag_id"))
+    .values(bug_count=Tag.__table__.c.bug_count + bindparam("delta"))
+)
 
 
 def get_all_tags(session: Session) -> List[Tag]:
@@ -22,4 +43,264 @@ def get_all_tags(session: Session) -> List[Tag]:
     except SQLAlchemyError as e:
         session.rollback()
         logging.error(f"Unable to fetch tags list!: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def select_tags_page(prefix: Optional[str] = None, sort: TagSort = TagSort.NAME,
+                     limit: int = DEFAULT_TAG_PAGE_SIZE, cursor: Optional[str] = None) -> Select:
+    """
+    Build the SELECT for a single page of Tag records, keyset-paginated on (name) or (bug_count desc, id desc).
+    Fetches one row more than limit, which tells whether another page exists (see split_tags_page).
+
+    Args:
+        prefix (str | None): Only tags with names starting with prefix.
+        sort (TagSort): Order by name, or by number of bugs (most used first).
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+
+    Raises:
+        HTTPException: If cursor is malformed (400).
+
+    Returns:
+        Select: Statement selecting (id, name, bug_count) rows, in the field order of TagUsage.
+    """
+    stmt = select(Tag.id, Tag.name, Tag.bug_count)
+    if prefix:
+        # A single literal pattern (rather than startswith's "param || '%'") lets the planner use the index.
+        pattern = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        stmt = stmt.where(Tag.name.like(pattern, escape="/"))
+
+    if sort == TagSort.USAGE:
+        stmt = stmt.order_by(Tag.bug_count.desc(), Tag.id.desc())
+    else:
+        stmt = stmt.order_by(Tag.name)
+
+    if cursor is not None:
+        try:
+            if sort == TagSort.USAGE:
+                bug_count, tag_id = decode_cursor(cursor, int)
+            else:
+                name, _ = decode_cursor(cursor, str)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor!")
+        if sort == TagSort.USAGE:
+            stmt = stmt.where(tuple_(Tag.bug_count, Tag.id) < tuple_(bug_count, tag_id))
+        else:
+            stmt = stmt.where(Tag.name > name)
+
+    return stmt.limit(limit + 1)
+
+def split_tags_page(tags: List[Row], limit: int, sort: TagSort = TagSort.NAME) -> Tuple[List[Row], Optional[str]]:
+    """
+    Trim the look-ahead row fetched by select_tags_page and compute the next cursor.
+
+    Args:
+        tags (List[Row]): Rows fetched with select_tags_page.
+        limit (int): Page size used to build the statement.
+        sort (TagSort): Sort order used to build the statement.
+
+    Returns:
+        Tuple[List[Row], Optional[str]]: Tags on the page and cursor for the next page (None on last page).
+    """
+    if len(tags) <= limit:
+        return tags, None
+    tags = tags[:limit]
+    last = tags[-1]
+    return tags, encode_cursor(last.bug_count if sort == TagSort.USAGE else last.name, last.id)
+
+def get_tags_page(session: Session, prefix: Optional[str] = None, sort: TagSort = TagSort.NAME,
+                  limit: int = DEFAULT_TAG_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+    """
+    Retrieve a page of tags with their bug counts, as plain (id, name, bug_count) rows.
+
+    Args:
+        session (Session): DB session.
+        prefix (str | None): Only tags with names starting with prefix (autocomplete).
+        sort (TagSort): Order by name, or by number of bugs (most used first).
+        limit (int): Maximum number of records on the page.
+        cursor (str | None): Cursor returned with the previous page.
+
+    Raises:
+        HTTPException: If cursor is malformed (400) or DB error occurs (500).
+
+    Returns:
+        Tuple[List[Row], Optional[str]]: Tag rows and cursor for the next page (None on last page).
+    """
+    try:
+        tags = session.execute(select_tags_page(prefix, sort, limit, cursor)).all()
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to fetch tags page!: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return split_tags_page(tags, limit, sort)
+
+def tags_page_etag(tags: List[Row], next_cursor: Optional[str]) -> str:
+    """
+    Compute the ETag of a page of tags (changes with bug counts too).
+
+    Args:
+        tags (List[Row]): Tags on the page.
+        next_cursor (str | None): Cursor for the next page.
+
+    Returns:
+        str: ETag of the page.
+    """
+    return version_etag("tags", [(tag.id, tag.name, tag.bug_count) for tag in tags] + [next_cursor])
+
+def tag_count_deltas(before: Iterable[int], after: Iterable[int]) -> dict[int, int]:
+    """
+    Changes of Tag.bug_count when a bug's tags change from before to after.
+
+    Args:
+        before (Iterable[int]): Tag IDs of the bug before the change.
+        after (Iterable[int]): Tag IDs of the bug after the change.
+
+    Returns:
+        dict[int, int]: Count delta (+1 or -1) by tag ID, unchanged tags omitted.
+    """
+    before, after = set(before), set(after)
+    deltas = {tag_id: 1 for tag_id in after - before}
+    deltas.update({tag_id: -1 for tag_id in before - after})
+    return deltas
+
+def adjust_tag_counts(session: Session, deltas: dict[int, int]) -> None:
+    """
+    Apply bug count changes to tags, in the same transaction as the change of bug_tags.
+    Rows are updated in ID order, so concurrent transactions lock them in a consistent order.
+
+    Args:
+        session (Session): DB session (not committed here).
+        deltas (dict[int, int]): Count delta by tag ID.
+    """
+    params = [{"tag_id": tag_id, "delta": delta} for tag_id, delta in sorted(deltas.items()) if delta]
+    if params:
+        session.execute(ADJUST_TAG_COUNT, params)
+
+def release_bug_tags(bug_id: int) -> Delete:
+    """
+    Build the DELETE of a bug's bug_tags rows returning their tag IDs, to run right before the bug is deleted
+    (with the bug row locked, so no tag can be added meanwhile). The counts of exactly the deleted rows are
+    then decremented with adjust_tag_counts, which locks tags in ID order.
+
+    Args:
+        bug_id (int): ID of the bug.
+
+    Returns:
+        Delete: Statement deleting bug_tags rows, returning tag IDs.
+    """
+    return delete(bug_tags).where(bug_tags.c.bug_id == bug_id).returning(bug_tags.c.tag_id)
+
+def insert_missing_tags(session: Session, names: Iterable[str]) -> Insert:
+    """
+    Build an atomic INSERT ... ON CONFLICT (name) DO NOTHING of given tag names: names inserted meanwhile
+    by a concurrent transaction are skipped instead of failing on the unique constraint.
+    Add RETURNING to get the rows actually inserted.
+
+    Args:
+        session (Session | AsyncSession): DB session (used to detect the dialect).
+        names (Iterable[str]): Tag names, without duplicates.
+
+    Returns:
+        Insert: The INSERT statement.
+    """
+    # Sorted rows keep lock order consistent between concurrent inserts.
+    return (
+        dialect_insert(session, Tag)
+        .values([{"name": name} for name in sorted(names)])
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+
+def remember_tag_ids(session: Session, tag_ids: dict[str, int]) -> None:
+    """
+    Queue tag IDs read or created in the session's transaction, to be published to tag_id_cache
+    once it commits (a rolled back transaction may have created tags which don't exist then).
+
+    Args:
+        session (Session | AsyncSession): DB session.
+        tag_ids (dict[str, int]): Tag IDs by name.
+    """
+    session.info.setdefault(PENDING_TAG_IDS, {}).update(tag_ids)
+
+@event.listens_for(Session, "after_commit")
+def publish_tag_ids(session: Session) -> None:
+    tag_ids = session.info.pop(PENDING_TAG_IDS, None)
+    if tag_ids:
+        tag_id_cache.put_many(tag_ids)
+
+@event.listens_for(Session, "after_rollback")
+def discard_tag_ids(session: Session) -> None:
+    session.info.pop(PENDING_TAG_IDS, None)
+
+@event.listens_for(Tag.__table__, "after_create")
+@event.listens_for(Tag.__table__, "after_drop")
+def reset_tag_id_cache(target, connection, **kw) -> None:
+    # IDs of a recreated table are reused for other names.
+    tag_id_cache.clear()
+
+def warm_tag_id_cache(session: Session) -> None:
+    """
+    Fill tag_id_cache with the most used tags (up to its capacity).
+
+    Args:
+        session (Session): DB session.
+    """
+    stmt = select(Tag.name, Tag.id).order_by(Tag.bug_count.desc(), Tag.id).limit(tag_id_cache.max_entries)
+    try:
+        tag_id_cache.put_many(dict(session.execute(stmt).all()))
+    except SQLAlchemyError as e:
+        logging.error(f"Unable to warm the tag cache: {e}")
+
+def tag_references(session: Session, tag_ids: dict[str, int]) -> List[Tag]:
+    """
+    Persistent Tag objects for known (name, ID) pairs, without loading them: instances already in the
+    session's identity map are reused, the others are attached as if loaded (remaining attributes
+    load on access). Assigning them to Bug.tags only writes bug_tags rows.
+
+    Args:
+        session (Session | AsyncSession): DB session.
+        tag_ids (dict[str, int]): Tag IDs by name.
+
+    Returns:
+        List[Tag]: Tags ordered by ID.
+    """
+    tags = []
+    for name, tag_id in sorted(tag_ids.items(), key=lambda item: item[1]):
+        tag = session.identity_map.get(identity_key(Tag, tag_id))
+        if tag is None:
+            tag = Tag(id=tag_id, name=name)
+            make_transient_to_detached(tag)
+            session.add(tag)
+        tags.append(tag)
+    return tags
+
+def resolve_tag_ids(session: Session, tag_names: Iterable[str]) -> dict[str, int]:
+    """
+    Map tag names to IDs, creating missing tags.
+    Names are looked up in tag_id_cache first, the others with one SELECT. Missing tags are inserted with
+    insert_missing_tags(...) RETURNING, so tags created concurrently by another transaction don't fail
+    the insert; those are picked up by a final SELECT. IDs read from the DB are cached after commit.
+
+    Args:
+        session (Session): DB session (not committed here).
+        tag_names (Iterable[str]): Tag names, duplicates allowed.
+
+    Returns:
+        dict[str, int]: Tag ID for every requested name.
+    """
+    names = set(tag_names)
+    tag_ids = tag_id_cache.get_many(names)
+
+    missing = names - tag_ids.keys()
+    if not missing:
+        return tag_ids
+
+    loaded = dict(session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+    missing -= loaded.keys()
+    if missing:
+        loaded.update(session.execute(insert_missing_tags(session, missing).returning(Tag.name, Tag.id)).all())
+
+        missing -= loaded.keys()
+        if missing:
+            loaded.update(session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+
+    remember_tag_ids(session, loaded)
+    tag_ids.update(loaded)
+    return tag_ids
@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(sort_value: datetime | str | int, row_id: int) -> str:
+    """
+    Encodes a keyset position into an opaque, URL-safe cursor.
+
+    Args:
+        sort_value (datetime | str | int): Value of the sort column for the last returned row.
+        row_id (int): ID of the last returned row (tie-breaker).
+
+    Returns:
+        str: Opaque cursor string.
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_type: type = datetime) -> tuple[datetime | str | int, int]:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Opaque cursor string.
+        sort_type (type): Expected type of the sort value (datetime, str or int).
+
+    Raises:
+        ValueError: If cursor is malformed.
+
+    Returns:
+        tuple[datetime | str | int, int]: Sort value and row ID of the keyset position.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif type(sort_value) is not sort_type:
+            raise TypeError(f"Expected {sort_type.__name__} sort value")
+        return sort_value, int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor!") from e
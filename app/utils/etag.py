@@ -0,0 +1,62 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+
+def bug_etag(bug_id: int, updated_at: datetime) -> str:
+    """
+    Strong ETag of a single bug, derived from its ID and modification time.
+
+    Args:
+        bug_id (int): ID of the bug.
+        updated_at (datetime): Modification time of the bug (naive values are treated as UTC).
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    microseconds = int(updated_at.timestamp()) * 1_000_000 + updated_at.microsecond
+    return f'"{bug_id}-{microseconds}"'
+
+def version_etag(prefix: str, parts: Iterable) -> str:
+    """
+    Strong ETag of a collection, derived from values identifying its version.
+
+    Args:
+        prefix (str): Collection name.
+        parts (Iterable): Values that change whenever the collection changes.
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return f'"{prefix}-{digest.hexdigest()[:20]}"'
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison) or If-Match (strong comparison) header against an ETag.
+
+    Args:
+        header (str | None): Header value, e.g. '"a", W/"b"' or '*'.
+        etag (str): Current ETag of the resource.
+        weak (bool): Use weak comparison (W/ prefixes are ignored).
+
+    Returns:
+        bool: True if any listed ETag matches (or header is '*').
+    """
+    if header is None:
+        return False
+    for candidate in (value.strip() for value in header.split(",")):
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,259 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, event
+
+from app.utils.metrics import Histogram
+
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "false").lower() in ("1", "true", "yes")
+INSTRUMENTATION_STRICT = os.getenv("INSTRUMENTATION_STRICT", "false").lower() in ("1", "true", "yes")
+DEFAULT_QUERY_BUDGET = int(os.getenv("INSTRUMENTATION_QUERY_BUDGET", "10"))
+
+# Statement budgets by route ("METHOD /path/{param}"), None for no budget. Other routes get DEFAULT_QUERY_BUDGET.
+ROUTE_QUERY_BUDGETS: dict[str, Optional[int]] = {
+    # Statement count grows with the number of rows (export batches, insertmanyvalues batches).
+    "GET /bugs/export": None,
+    "POST /bugs/bulk": None,
+    "PATCH /bugs/bulk": None,
+}
+
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised in strict mode when a request runs more SQL statements than its route's budget.
+    """
+
+
+class RequestStats:
+    """
+    Measurements of a single request, filled in by the engine listeners and InstrumentedRoute.
+
+    Attributes:
+        route (str | None): Matched route, "METHOD /path/{param}".
+        statements (int): Number of executed SQL statements.
+        db_time (float): Time spent executing them, in seconds.
+        endpoint_done (float | None): perf_counter() when the endpoint returned.
+        serialization_time (float): Time between the endpoint's return and the finished response, in seconds.
+    """
+    __slots__ = ("route", "statements", "db_time", "endpoint_done", "serialization_time")
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.statements = 0
+        self.db_time = 0.0
+        self.endpoint_done: Optional[float] = None
+        self.serialization_time = 0.0
+
+
+# Stats of the request being handled. Copied into threadpool workers of sync endpoints, so they see the same object.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class RouteMetrics:
+    """
+    Histograms of a single route.
+    """
+    def __init__(self):
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_time = Histogram(TIME_BUCKETS)
+        self.serialization_time = Histogram(TIME_BUCKETS)
+        self.latency = Histogram(TIME_BUCKETS)
+        self.budget_exceeded = 0
+
+
+class RequestMetrics:
+    """
+    Per-route request metrics, rendered in the Prometheus text format.
+    """
+    HISTOGRAMS = (
+        ("statements", "http_request_db_statements", "SQL statements executed per request."),
+        ("db_time", "http_request_db_seconds", "Time spent executing SQL statements per request."),
+        ("serialization_time", "http_request_serialization_seconds",
+         "Time spent building the response after the endpoint returned."),
+        ("latency", "http_request_duration_seconds", "Total request latency."),
+    )
+
+    def __init__(self):
+        self._routes: dict[str, RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def route(self, route: str) -> RouteMetrics:
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics()
+            return metrics
+
+    def record(self, stats: RequestStats, latency: float) -> RouteMetrics:
+        metrics = self.route(stats.route or UNMATCHED_ROUTE)
+        metrics.statements.observe(stats.statements)
+        metrics.db_time.observe(stats.db_time)
+        metrics.serialization_time.observe(stats.serialization_time)
+        metrics.latency.observe(latency)
+        return metrics
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """
+        Returns:
+            str: All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            routes = sorted(self._routes.items())
+
+        lines = []
+        for attribute, name, description in self.HISTOGRAMS:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for route, metrics in routes:
+                snapshot = getattr(metrics, attribute).snapshot()
+                label = f'route="{route}"'
+                for bound, count in snapshot["buckets"].items():
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {snapshot['sum']}")
+                lines.append(f"{name}_count{{{label}}} {snapshot['count']}")
+
+        lines.append("# HELP http_request_query_budget_exceeded_total Requests over their route's query budget.")
+        lines.append("# TYPE http_request_query_budget_exceeded_total counter")
+        for route, metrics in routes:
+            lines.append(f'http_request_query_budget_exceeded_total{{route="{route}"}} {metrics.budget_exceeded}')
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def query_budget(route: str) -> Optional[int]:
+    """
+    Args:
+        route (str): Route, "METHOD /path/{param}".
+
+    Returns:
+        int | None: Maximum number of SQL statements per request, None for no budget.
+    """
+    return ROUTE_QUERY_BUDGETS.get(route, DEFAULT_QUERY_BUDGET)
+
+
+def instrument_engine(bind: Engine) -> None:
+    """
+    Count SQL statements and their execution time into the stats of the current request.
+
+    Args:
+        bind (Engine): Engine to instrument (sync_engine of an async one).
+    """
+    @event.listens_for(bind, "before_cursor_execute")
+    def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["statement_started"] = perf_counter()
+
+    @event.listens_for(bind, "after_cursor_execute")
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += perf_counter() - conn.info.pop("statement_started", perf_counter())
+
+
+def _mark_endpoint_done() -> None:
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.endpoint_done = perf_counter()
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """
+    Wrap an endpoint to record when it returned. The signature (and so dependency injection) is preserved.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_async_endpoint(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+        return timed_async_endpoint
+
+    @functools.wraps(endpoint)
+    def timed_endpoint(*args, **kwargs):
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _mark_endpoint_done()
+    return timed_endpoint
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute which names the route in the request stats and measures serialization:
+    validation and encoding of the returned value into the response, after the endpoint returned.
+    Without InstrumentationMiddleware (no stats for the request) it only adds a context variable lookup.
+    """
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def instrumented_handler(request):
+            stats = current_request_stats.get()
+            if stats is not None:
+                stats.route = f"{request.method} {self.path_format}"
+            response = await handler(request)
+            if stats is not None and stats.endpoint_done is not None:
+                stats.serialization_time = perf_counter() - stats.endpoint_done
+            return response
+
+        return instrumented_handler
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware recording statement count, DB time, serialization time and latency of every request
+    into request_metrics, by route.
+
+    Args:
+        app: Wrapped ASGI application.
+        metrics (RequestMetrics): Registry to record into.
+        strict (bool): Raise QueryBudgetExceeded when a request goes over its route's query budget
+            (used by the tests); otherwise it is logged and counted.
+    """
+    def __init__(self, app, metrics: RequestMetrics = request_metrics, strict: bool = INSTRUMENTATION_STRICT):
+        self.app = app
+        self.metrics = metrics
+        self.strict = strict
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_stats.reset(token)
+            route_metrics = self.metrics.record(stats, perf_counter() - started)
+
+        budget = query_budget(stats.route) if stats.route is not None else None
+        if budget is not None and stats.statements > budget:
+            route_metrics.budget_exceeded += 1
+            message = f"{stats.route} ran {stats.statements} SQL statements, over its budget of {budget}"
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logging.warning(message)
@@ -0,0 +1,47 @@
+import threading
+from typing import Sequence
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed upper bounds, in the Prometheus style (cumulative buckets).
+
+    Attributes:
+        buckets (tuple[float, ...]): Sorted bucket upper bounds (+Inf is implicit).
+        count (int): Number of observed values.
+        sum (float): Sum of observed values.
+    """
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {"buckets": {upper bound: cumulative count, ..., "+Inf": count}, "count": int, "sum": float}
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, value_sum = self.count, self.sum
+
+        buckets = {}
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = total
+        return {"buckets": buckets, "count": total, "sum": value_sum}
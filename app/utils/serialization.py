@@ -0,0 +1,37 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+# orjson is optional; pydantic-core's encoder (always installed) produces the same JSON.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Encode plain data (dicts, lists, datetimes, enums) to JSON in a single pass, without model validation.
+    The output matches the one of Pydantic models holding the same values (UTC datetimes end with "Z").
+
+    Args:
+        content (Any): Data to encode.
+
+    Returns:
+        bytes: JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoding its content with dump_json; pre-encoded bytes are sent as they are.
+    Endpoints returning it skip response_model validation, so the content must already have the documented shape.
+    """
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
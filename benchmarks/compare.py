@@ -0,0 +1,90 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def relative_change(before: float, after: float) -> Optional[float]:
+    """
+    Returns:
+        float | None: (after - before) / before, None when there is no baseline value.
+    """
+    if not before:
+        return None
+    return (after - before) / before
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.10) -> List[dict]:
+    """
+    Compare the scenarios of two benchmark runs.
+    A scenario regressed when its p95 latency rose, its throughput dropped or its SQL statements per request grew
+    by more than the threshold, or when it started failing requests.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        current (dict): Results of the run to check.
+        threshold (float): Tolerated relative change, 0.10 for 10%.
+
+    Returns:
+        List[dict]: One row per scenario of the current run, with the changes and a regression flag.
+    """
+    rows = []
+    for name, after in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            rows.append({"scenario": name, "p95_change": None, "throughput_change": None,
+                         "statements_change": None, "regression": False})
+            continue
+
+        p95_change = relative_change(before["p95_ms"], after["p95_ms"])
+        throughput_change = relative_change(before["throughput_rps"], after["throughput_rps"])
+        statements_change = relative_change(before.get("sql_statements_per_request") or 0,
+                                            after.get("sql_statements_per_request") or 0)
+        regression = (
+            (p95_change is not None and p95_change > threshold)
+            or (throughput_change is not None and throughput_change < -threshold)
+            or (statements_change is not None and statements_change > threshold)
+            or (after["errors"] > 0 and before["errors"] == 0)
+        )
+        rows.append({"scenario": name, "p95_change": p95_change, "throughput_change": throughput_change,
+                     "statements_change": statements_change, "regression": regression})
+    return rows
+
+def format_comparison(rows: List[dict]) -> str:
+    """
+    Returns:
+        str: Comparison rows as a text table.
+    """
+    def percent(change: Optional[float]) -> str:
+        return "n/a" if change is None else f"{change:+.1%}"
+
+    lines = [f"{'scenario':<18} {'p95':>9} {'throughput':>11} {'statements':>11}"]
+    for row in rows:
+        lines.append(
+            f"{row['scenario']:<18} {percent(row['p95_change']):>9} {percent(row['throughput_change']):>11} "
+            f"{percent(row['statements_change']):>11}{'  REGRESSION' if row['regression'] else ''}"
+        )
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Load benchmark of the bug tracker API.
+
+Seeds a reproducible dataset, drives every scenario with concurrent clients (in-process over ASGI, or over HTTP
+against a running server) and reports latency percentiles, throughput and SQL statements per request.
+
+    python -m benchmarks.run --bugs 100000 --concurrency 16 --output results.json --baseline previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark.db"
+DATASET_SIZES = (10_000, 100_000, 1_000_000)
+
+METRIC_LINE = re.compile(r'^http_request_db_statements_(sum|count)\{route="([^"]+)"\} (\S+)$')
+
+
+@dataclass
+class Scenario:
+    """
+    A benchmarked request.
+
+    Attributes:
+        name (str): Scenario name in the results.
+        route (str): Route as recorded by the instrumentation, "METHOD /path/{param}".
+        build (Callable): Builds (method, url, json body) of a request from a random generator and the dataset size.
+    """
+    name: str
+    route: str
+    build: Callable[[random.Random, int], tuple]
+
+
+@dataclass
+class ScenarioResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+def _new_bug(rng: random.Random, tag_names: List[str]) -> dict:
+    return {
+        "title": f"Benchmark bug {rng.randrange(10 ** 9)}",
+        "description": "Created by the benchmark suite",
+        "status": "OPEN",
+        "priority": rng.choice(["LOW", "MEDIUM", "HIGH"]),
+        "severity": rng.choice(["MINOR", "MAJOR", "CRITICAL"]),
+        "submitter": "benchmark",
+        "assigned_to": None,
+        "tags": rng.sample(tag_names, 2),
+    }
+
+def build_scenarios(tag_names: List[str]) -> List[Scenario]:
+    """
+    Args:
+        tag_names (List[str]): Tag vocabulary of the dataset, most used first.
+
+    Returns:
+        List[Scenario]: Benchmarked requests, reads first so writes don't skew them.
+    """
+    common, prefixes = tag_names[:10], ["c", "co", "component-1", "p", "s"]
+    return [
+        Scenario("list_bugs", "GET /bugs", lambda rng, n: ("GET", "/bugs?limit=50", None)),
+        Scenario("list_bugs_summary", "GET /bugs", lambda rng, n: ("GET", "/bugs?limit=50&fields=summary", None)),
+        Scenario("list_bugs_by_tag", "GET /bugs",
+                 lambda rng, n: ("GET", f"/bugs?limit=50&tag={rng.choice(common)}", None)),
+        Scenario("get_bug", "GET /bug/{bug_id}", lambda rng, n: ("GET", f"/bug/{rng.randint(1, n)}", None)),
+        Scenario("tags_prefix", "GET /tags",
+                 lambda rng, n: ("GET", f"/tags?prefix={rng.choice(prefixes)}&limit=20", None)),
+        Scenario("bug_stats", "GET /bugs/stats", lambda rng, n: ("GET", "/bugs/stats", None)),
+        Scenario("create_bug", "POST /bugs", lambda rng, n: ("POST", "/bugs", _new_bug(rng, tag_names))),
+        Scenario("tag_bug", "PATCH /bug/{bug_id}",
+                 lambda rng, n: ("PATCH", f"/bug/{rng.randint(1, n)}", {"tags": rng.sample(common, 1)})),
+    ]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Linearly interpolated percentile.
+
+    Args:
+        values (List[float]): Samples.
+        q (float): Percentile, 0-100.
+
+    Returns:
+        float: The percentile, 0.0 for no samples.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def parse_statement_counts(exposition: str) -> Dict[str, tuple[float, float]]:
+    """
+    Args:
+        exposition (str): Output of GET /metrics.
+
+    Returns:
+        Dict[str, tuple[float, float]]: (statement sum, request count) by route.
+    """
+    totals: Dict[str, Dict[str, float]] = {}
+    for line in exposition.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            kind, route, value = match.groups()
+            totals.setdefault(route, {})[kind] = float(value)
+    return {route: (values.get("sum", 0.0), values.get("count", 0.0)) for route, values in totals.items()}
+
+def summarize(result: ScenarioResult, statements: Optional[float]) -> dict:
+    """
+    Args:
+        result (ScenarioResult): Measurements of a scenario.
+        statements (float | None): SQL statements per request, None if the server does not record them.
+
+    Returns:
+        dict: Scenario entry of the results file (latencies in milliseconds).
+    """
+    latencies = [latency * 1000 for latency in result.latencies]
+    return {
+        "requests": len(latencies),
+        "errors": result.errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / result.elapsed, 1) if result.elapsed else 0.0,
+        "sql_statements_per_request": round(statements, 2) if statements is not None else None,
+    }
+
+
+async def run_scenario(client, scenario: Scenario, bug_count: int, requests: int, concurrency: int,
+                       seed: int) -> ScenarioResult:
+    """
+    Send `requests` requests of a scenario from `concurrency` concurrent clients.
+
+    Args:
+        client (httpx.AsyncClient): Client of the benchmarked app.
+        scenario (Scenario): Scenario to run.
+        bug_count (int): Size of the dataset, IDs are 1..bug_count.
+        requests (int): Total number of requests.
+        concurrency (int): Number of concurrent clients.
+        seed (int): Seed of the request generators.
+
+    Returns:
+        ScenarioResult: Latencies of the successful requests, error count and wall time.
+    """
+    result = ScenarioResult()
+    remaining = iter(range(requests))
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        for _ in remaining:
+            method, url, body = scenario.build(rng, bug_count)
+            started = perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            if failed:
+                result.errors += 1
+            else:
+                result.latencies.append(perf_counter() - started)
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    result.elapsed = perf_counter() - started
+    return result
+
+async def run_benchmark(client, tag_names: List[str], bug_count: int, requests: int, concurrency: int,
+                        seed: int = 42, only: Optional[List[str]] = None) -> Dict[str, dict]:
+    """
+    Run all scenarios one after another.
+
+    Args:
+        client (httpx.AsyncClient): Client of the benchmarked app.
+        tag_names (List[str]): Tag vocabulary of the dataset.
+        bug_count (int): Size of the dataset.
+        requests (int): Requests per scenario.
+        concurrency (int): Concurrent clients per scenario.
+        seed (int): Seed of the request generators.
+        only (List[str] | None): Names of the scenarios to run, all if None.
+
+    Returns:
+        Dict[str, dict]: Summary by scenario name.
+    """
+    results = {}
+    for scenario in build_scenarios(tag_names):
+        if only and scenario.name not in only:
+            continue
+        # Warm-up: fills pools and caches the way a running server has them.
+        await run_scenario(client, scenario, bug_count, min(requests, 20), concurrency, seed + 1)
+        before = parse_statement_counts((await client.get("/metrics")).text)
+        result = await run_scenario(client, scenario, bug_count, requests, concurrency, seed)
+        after = parse_statement_counts((await client.get("/metrics")).text)
+
+        statements = None
+        if scenario.route in after:
+            sum_before, count_before = before.get(scenario.route, (0.0, 0.0))
+            sum_after, count_after = after[scenario.route]
+            if count_after > count_before:
+                statements = (sum_after - sum_before) / (count_after - count_before)
+        results[scenario.name] = summarize(result, statements)
+        print(f"{scenario.name:>18}: {json.dumps(results[scenario.name])}", file=sys.stderr)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the bug tracker API.")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL", DEFAULT_DATABASE_URL),
+                        help="Database to seed and benchmark (in-process mode).")
+    parser.add_argument("--bugs", type=int, default=DATASET_SIZES[0],
+                        help=f"Dataset size, e.g. {', '.join(map(str, DATASET_SIZES))}.")
+    parser.add_argument("--reseed", action="store_true", help="Seed again even if the dataset has the right size.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients.")
+    parser.add_argument("--scenario", action="append", help="Run only this scenario (repeatable).")
+    parser.add_argument("--mode", choices=("inprocess", "http"), default="inprocess",
+                        help="Drive the app over ASGI in this process, or a running server over HTTP.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server URL in http mode.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="Compare against a previous results file.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative p95/throughput change reported as a regression.")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.mode == "inprocess":
+        # The app reads its configuration on import.
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ["INSTRUMENTATION_ENABLED"] = "true"
+
+    import httpx
+    from app.db.session import engine
+    from benchmarks.compare import compare_results, format_comparison
+    from benchmarks.seed import dataset_size, seed_database, tag_vocabulary
+
+    if args.mode == "inprocess":
+        if args.reseed or dataset_size(engine) != args.bugs:
+            print(f"Seeding {args.bugs} bugs into {engine.url!r}...", file=sys.stderr)
+            seed_database(engine, args.bugs, args.seed)
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+        dialect = engine.dialect.name
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        dialect = None
+
+    async def run() -> Dict[str, dict]:
+        async with client:
+            return await run_benchmark(client, tag_vocabulary(args.bugs), args.bugs, args.requests,
+                                       args.concurrency, args.seed, args.scenario)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "mode": args.mode,
+            "dialect": dialect,
+            "bugs": args.bugs,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": asyncio.run(run()),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare_results(json.load(f), results, args.threshold)
+        print(format_comparison(comparison))
+        return 1 if any(row["regression"] for row in comparison) else 0
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
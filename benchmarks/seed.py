@@ -0,0 +1,132 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence
+
+from sqlalchemy import Connection, Engine, insert, select, func, text, update
+
+from app.db.init_db import init_db
+from app.db.session import Base
+from app.models.association import bug_tags
+from app.models.bug import Bug
+from app.models.tag import Tag
+from app.schemas.bug import Status, Priority, Severity
+
+SEED_BATCH_SIZE = 10_000
+
+# Most used tags, the rest of the vocabulary is a long tail of component tags.
+COMMON_TAGS = [
+    "ui", "backend", "api", "database", "auth", "performance", "crash", "regression", "security", "docs",
+    "mobile", "frontend", "deployment", "ci", "flaky-test", "localization", "accessibility", "billing",
+    "search", "notifications", "export", "import", "onboarding", "settings", "reporting", "email",
+]
+TITLE_WORDS = [
+    "error", "fails", "when", "saving", "login", "page", "timeout", "slow", "button", "missing", "crash",
+    "after", "update", "invalid", "response", "broken", "link", "report", "export", "search", "filter",
+]
+# Weights of 0, 1, 2, 3 and 4 tags per bug.
+TAGS_PER_BUG_WEIGHTS = [15, 35, 30, 15, 5]
+STATUS_WEIGHTS = {Status.OPEN: 45, Status.IN_PROGRESS: 20, Status.CLOSED: 35}
+PRIORITY_WEIGHTS = {Priority.LOW: 30, Priority.MEDIUM: 50, Priority.HIGH: 20}
+SEVERITY_WEIGHTS = {Severity.MINOR: 50, Severity.MAJOR: 35, Severity.CRITICAL: 15}
+
+
+def tag_vocabulary(bug_count: int) -> List[str]:
+    """
+    Tag names for a dataset: common tags plus one component tag per 200 bugs.
+
+    Args:
+        bug_count (int): Number of bugs in the dataset.
+
+    Returns:
+        List[str]: Tag names, most used first.
+    """
+    return COMMON_TAGS + [f"component-{i}" for i in range(max(bug_count // 200, 10))]
+
+def zipf_weights(size: int, exponent: float = 1.1) -> List[float]:
+    """
+    Returns:
+        List[float]: Zipf-distributed weights of ranks 1..size, so a few tags are on most bugs.
+    """
+    return [1 / rank ** exponent for rank in range(1, size + 1)]
+
+def advance_bug_id_sequence(connection: Connection) -> None:
+    """
+    Move the ID sequence of bugs past the IDs inserted explicitly by the seeders, so bugs created
+    afterwards (create_bug scenario) don't collide with them. SQLite needs nothing: it uses the maximum ID.
+
+    Args:
+        connection (Connection): Connection of the seeding transaction.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(
+            "SELECT setval(pg_get_serial_sequence('bugs', 'id'), coalesce(max(id), 1), max(id) IS NOT NULL) FROM bugs"
+        ))
+
+def seed_database(bind: Engine, bug_count: int, seed: int = 42,
+                  tags_per_bug_weights: Sequence[float] = TAGS_PER_BUG_WEIGHTS) -> None:
+    """
+    Recreate the schema and fill it with a reproducible dataset.
+    Bugs are spread over the last year (created_at ascending with ID) and carry 0-4 Zipf-distributed tags.
+
+    Args:
+        bind (Engine): Engine of the benchmark database.
+        bug_count (int): Number of bugs to create.
+        seed (int): Seed of the random generator; the same seed produces the same data.
+        tags_per_bug_weights (Sequence[float]): Weights of 0, 1, 2, ... tags per bug
+            (tags drawn twice are kept once, so popular tags lower the average a little).
+    """
+    rng = random.Random(seed)
+    Base.metadata.drop_all(bind)
+    init_db(bind)
+
+    tag_names = tag_vocabulary(bug_count)
+    weights = zipf_weights(len(tag_names))
+    assignees = [f"user_{i}" for i in range(200)] + [None] * 40
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=365) / max(bug_count, 1)
+
+    with bind.begin() as connection:
+        connection.execute(insert(Tag), [{"name": name, "bug_count": 0} for name in tag_names])
+        tag_ids = dict(connection.execute(select(Tag.name, Tag.id)).all())
+
+        for start in range(0, bug_count, SEED_BATCH_SIZE):
+            bug_rows, association_rows = [], []
+            for bug_id in range(start + 1, min(start + SEED_BATCH_SIZE, bug_count) + 1):
+                created_at = now - timedelta(days=365) + step * bug_id
+                bug_rows.append({
+                    "id": bug_id,
+                    "title": " ".join(rng.choices(TITLE_WORDS, k=rng.randint(3, 8))),
+                    "description": " ".join(rng.choices(TITLE_WORDS, k=rng.randint(10, 40))),
+                    "status": rng.choices(list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values()))[0],
+                    "priority": rng.choices(list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values()))[0],
+                    "severity": rng.choices(list(SEVERITY_WEIGHTS), list(SEVERITY_WEIGHTS.values()))[0],
+                    "assigned_to": rng.choice(assignees),
+                    "submitter": rng.choice(assignees[:50]),
+                    "created_at": created_at,
+                    "updated_at": created_at + timedelta(hours=rng.randint(0, 72)),
+                })
+                tag_count = rng.choices(range(len(tags_per_bug_weights)), tags_per_bug_weights)[0]
+                for name in set(rng.choices(tag_names, weights, k=tag_count)):
+                    association_rows.append({"bug_id": bug_id, "tag_id": tag_ids[name]})
+
+            connection.execute(insert(Bug), bug_rows)
+            if association_rows:
+                connection.execute(insert(bug_tags), association_rows)
+
+        counts = (
+            select(func.count())
+            .select_from(bug_tags)
+            .where(bug_tags.c.tag_id == Tag.id)
+            .scalar_subquery()
+        )
+        connection.execute(update(Tag).values(bug_count=counts))
+        advance_bug_id_sequence(connection)
+
+def dataset_size(bind: Engine) -> int:
+    """
+    Returns:
+        int: Number of bugs in the database, 0 if the schema does not exist.
+    """
+    init_db(bind)
+    with bind.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(Bug))
@@ -0,0 +1,218 @@
+"""
+Benchmark of duplicate detection (app.services.similarity) at scale.
+
+Seeds bugs written by automated reporters: a share of them are repeated crash reports (the same template with
+a few words and the numbers changed), the rest are unrelated texts over a large vocabulary. Then measures:
+
+    indexing   time to compute the LSH buckets of a bug (added to every create and text update)
+    lookup     latency of find_similar_bugs for new reports of known crashes and for unrelated texts,
+               candidates fetched per lookup and recall (a bug of the same crash found)
+
+    python -m benchmarks.similarity --bugs 1000000 --output similarity.json
+"""
+import argparse
+import json
+import random
+import sys
+from itertools import accumulate
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Engine, create_engine, insert, select, func
+from sqlalchemy.orm import Session
+
+from app.db.init_db import init_db
+from app.db.session import Base, enable_sqlite_foreign_keys
+from app.models.bug import Bug
+from app.models.bug_similarity import bug_similarity_buckets
+from app.schemas.bug import Status, Priority, Severity
+from app.services.similarity import bucket_rows, select_similar_candidates, lsh_buckets, shingles, rank_similar, \
+    SIMILARITY_THRESHOLD
+from benchmarks.run import DEFAULT_DATABASE_URL, percentile
+from benchmarks.seed import advance_bug_id_sequence
+
+SEED_BATCH_SIZE = 10_000
+VOCABULARY_SIZE = 20_000
+# Copies of a crash per report on average: the bigger the clusters, the more candidates a lookup fetches.
+REPORTS_PER_CRASH = 20
+
+
+def word_vocabulary(size: int = VOCABULARY_SIZE) -> List[str]:
+    # Letters only: tokens with digits are all the same to the similarity index.
+    words = []
+    for index in range(size):
+        word = ""
+        while True:
+            index, letter = divmod(index, 26)
+            word += chr(ord("a") + letter)
+            if not index:
+                break
+        words.append(word + "x")
+    return words
+
+def zipf_cum_weights(size: int = VOCABULARY_SIZE) -> List[float]:
+    # Cumulative, so random.choices doesn't sum the weights of the whole vocabulary on every call.
+    return list(accumulate(1 / rank for rank in range(1, size + 1)))
+
+def crash_template(rng: random.Random, vocabulary: List[str], cum_weights: List[float]) -> Tuple[List[str], List[str]]:
+    return (rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(4, 8)),
+            rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(15, 40)))
+
+def crash_report(rng: random.Random, template: Tuple[List[str], List[str]], vocabulary: List[str]) -> Tuple[str, str]:
+    """
+    Returns:
+        Tuple[str, str]: Title and description of a new report of a crash: one word of the description
+            replaced, another address and process ID.
+    """
+    title, description = template
+    description = list(description)
+    description[rng.randrange(len(description))] = rng.choice(vocabulary)
+    return (f"{' '.join(title)} at 0x{rng.randrange(2 ** 32):x}",
+            f"{' '.join(description)} pid {rng.randrange(1, 65536)}")
+
+def seed_similarity_dataset(bind: Engine, bug_count: int, duplicate_share: float = 0.3,
+                            seed: int = 42) -> List[Tuple[List[str], List[str]]]:
+    """
+    Recreate the schema and fill it with bugs and their similarity buckets.
+
+    Args:
+        bind (Engine): Engine of the benchmark database.
+        bug_count (int): Number of bugs to create.
+        duplicate_share (float): Share of bugs that are reports of a repeated crash.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        List[Tuple[List[str], List[str]]]: Templates (title and description words) of the crashes reported
+            at least once.
+    """
+    rng = random.Random(seed)
+    Base.metadata.drop_all(bind)
+    init_db(bind)
+
+    vocabulary = word_vocabulary()
+    cum_weights = zipf_cum_weights()
+    crashes = [crash_template(rng, vocabulary, cum_weights)
+               for _ in range(max(int(bug_count * duplicate_share / REPORTS_PER_CRASH), 1))]
+
+    reported = set()
+    with bind.begin() as connection:
+        for start in range(0, bug_count, SEED_BATCH_SIZE):
+            bug_rows = []
+            for bug_id in range(start + 1, min(start + SEED_BATCH_SIZE, bug_count) + 1):
+                if rng.random() < duplicate_share:
+                    crash = rng.randrange(len(crashes))
+                    reported.add(crash)
+                    title, description = crash_report(rng, crashes[crash], vocabulary)
+                else:
+                    title, description = (" ".join(words) for words in crash_template(rng, vocabulary, cum_weights))
+                bug_rows.append({
+                    "id": bug_id, "title": title, "description": description, "status": Status.OPEN,
+                    "priority": Priority.MEDIUM, "severity": Severity.MAJOR, "submitter": "benchmark",
+                })
+            connection.execute(insert(Bug), bug_rows)
+            connection.execute(insert(bug_similarity_buckets),
+                               bucket_rows((row["id"], row["title"], row["description"]) for row in bug_rows))
+        advance_bug_id_sequence(connection)
+    return [crashes[index] for index in sorted(reported)]
+
+def measure_lookups(bind: Engine, texts: List[Tuple[str, str]]) -> Tuple[dict, List[list]]:
+    """
+    Args:
+        bind (Engine): Engine of the benchmark database.
+        texts (List[Tuple[str, str]]): Titles and descriptions to look up.
+
+    Returns:
+        Tuple[dict, List[list]]: Latencies (ms, bucket computation included) and candidates per lookup,
+            and the similar bugs found for each text.
+    """
+    latencies, candidate_counts, results = [], [], []
+    with Session(bind) as session:
+        for title, description in texts:
+            started = perf_counter()
+            shingle_hashes = shingles(title, description)
+            candidates = session.execute(select_similar_candidates(lsh_buckets(shingle_hashes))).all()
+            similar = rank_similar(shingle_hashes, candidates, SIMILARITY_THRESHOLD, 10)
+            latencies.append((perf_counter() - started) * 1000)
+            candidate_counts.append(len(candidates))
+            results.append(similar)
+    return {
+        "lookups": len(texts),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "candidates_mean": round(sum(candidate_counts) / len(candidate_counts), 1) if candidate_counts else 0.0,
+    }, results
+
+def benchmark_similarity(bind: Engine, crashes: List[Tuple[List[str], List[str]]], lookups: int = 200,
+                         seed: int = 7) -> Dict[str, dict]:
+    """
+    Measure indexing cost and lookups of new reports of known crashes and of unrelated texts.
+
+    Args:
+        bind (Engine): Engine of a database seeded by seed_similarity_dataset.
+        crashes (List[Tuple[List[str], List[str]]]): Templates of crashes reported in the dataset.
+        lookups (int): Lookups per kind.
+        seed (int): Seed of the queries (different from the dataset's, so they are new reports).
+
+    Returns:
+        Dict[str, dict]: Measurements: indexing, duplicate_lookup (with recall) and unrelated_lookup.
+    """
+    rng = random.Random(seed)
+    vocabulary = word_vocabulary()
+    cum_weights = zipf_cum_weights()
+    queried = [rng.randrange(len(crashes)) for _ in range(lookups)]
+    duplicates = [crash_report(rng, crashes[index], vocabulary) for index in queried]
+    unrelated = [tuple(" ".join(words) for words in crash_template(rng, vocabulary, cum_weights))
+                 for _ in range(lookups)]
+
+    started = perf_counter()
+    for title, description in duplicates + unrelated:
+        lsh_buckets(shingles(title, description))
+    indexing_us = (perf_counter() - started) / (2 * lookups) * 1_000_000
+
+    with Session(bind) as session:
+        bugs = session.scalar(select(func.count()).select_from(Bug))
+        buckets = session.scalar(select(func.count()).select_from(bug_similarity_buckets))
+
+    duplicate_stats, found = measure_lookups(bind, duplicates)
+    # Found if a report of the same crash is among the similar bugs.
+    found_count = sum(
+        any(bug.title.startswith(" ".join(crashes[index][0]) + " at ") for bug in similar)
+        for index, similar in zip(queried, found)
+    )
+    duplicate_stats["recall"] = round(found_count / len(queried), 3) if queried else None
+    unrelated_stats, found = measure_lookups(bind, unrelated)
+    unrelated_stats["false_positives"] = sum(1 for similar in found if similar)
+
+    return {
+        "indexing": {"bugs": bugs, "buckets": buckets, "buckets_per_bug_us": round(indexing_us, 1)},
+        "duplicate_lookup": duplicate_stats,
+        "unrelated_lookup": unrelated_stats,
+    }
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--bugs", type=int, default=1_000_000)
+    parser.add_argument("--duplicate-share", type=float, default=0.3, help="Share of repeated crash reports.")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per kind.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    bind = create_engine(args.database_url)
+    enable_sqlite_foreign_keys(bind)
+    print(f"Seeding {args.bugs} bugs and their similarity buckets...", file=sys.stderr)
+    crashes = seed_similarity_dataset(bind, args.bugs, args.duplicate_share, args.seed)
+
+    results = benchmark_similarity(bind, crashes, args.lookups)
+    output = json.dumps({"bugs": args.bugs, **results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,190 @@
+"""
+Benchmark of the strategies for loading bugs with their tags.
+
+    joinedload    one LEFT OUTER JOIN: every bug row is repeated once per tag and de-duplicated in Python
+    selectinload  bugs, then their tags with one IN query per 500 bugs (app.services.bug.get_all_bugs)
+    batched       bug columns and (bug_id, tag) rows of bug_tags JOIN tags, without ORM objects
+                  (GET /bugs and the export)
+
+Reports rows and values (rows x columns) fetched from the database, statements, peak Python memory and latency
+of each strategy. joinedload fetches the fewest rows (one per bug and tag), but each of them carries all bug
+columns again.
+
+    python -m benchmarks.tag_loading --bugs 100000 --tags-per-bug 5-10 --output tag_loading.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import Engine, create_engine, event, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.db.session import enable_sqlite_foreign_keys
+from app.models.bug import Bug
+from app.services.bug import BUG_RESPONSE_COLUMNS, select_bug_tags, bug_response_dicts
+from benchmarks.run import DEFAULT_DATABASE_URL
+from benchmarks.seed import seed_database
+
+# Same batch size as selectinload, which also keeps IN lists under the bound parameter limit of SQLite.
+TAG_BATCH_SIZE = 500
+
+
+def load_joined(session: Session) -> List[Bug]:
+    return list(session.scalars(select(Bug).options(joinedload(Bug.tags))).unique().all())
+
+def load_selectin(session: Session) -> List[Bug]:
+    return list(session.scalars(select(Bug).options(selectinload(Bug.tags))).all())
+
+def load_batched(session: Session) -> List[dict]:
+    rows = session.execute(select(*BUG_RESPONSE_COLUMNS)).all()
+    tag_rows = []
+    for start in range(0, len(rows), TAG_BATCH_SIZE):
+        bug_ids = [row.id for row in rows[start:start + TAG_BATCH_SIZE]]
+        tag_rows.extend(session.execute(select_bug_tags(bug_ids)).all())
+    return bug_response_dicts(rows, tag_rows)
+
+STRATEGIES: Dict[str, Callable[[Session], list]] = {
+    "joinedload": load_joined,
+    "selectinload": load_selectin,
+    "batched": load_batched,
+}
+
+
+def tag_names_by_bug(bugs: list) -> Dict[int, frozenset]:
+    """
+    Args:
+        bugs (list): Result of a strategy (Bug objects or dicts).
+
+    Returns:
+        Dict[int, frozenset]: Tag names by bug ID, to check that strategies load the same data.
+    """
+    if bugs and isinstance(bugs[0], dict):
+        return {bug["id"]: frozenset(tag["name"] for tag in bug["tags"]) for bug in bugs}
+    return {bug.id: frozenset(tag.name for tag in bug.tags) for bug in bugs}
+
+def rows_fetched(bind: Engine, statements: List[Tuple[str, object]]) -> Tuple[int, int]:
+    """
+    Count the rows and values returned by executed SELECTs, by running each of them again.
+
+    Args:
+        bind (Engine): Engine the statements were executed on.
+        statements (List[Tuple[str, object]]): SQL and DBAPI parameters, as sent to the database.
+
+    Returns:
+        Tuple[int, int]: Total number of rows and of values.
+    """
+    rows = values = 0
+    with bind.connect() as connection:
+        for statement, parameters in statements:
+            result = connection.exec_driver_sql(statement, parameters)
+            count = sum(1 for _ in result)
+            rows += count
+            values += count * len(result.keys())
+    return rows, values
+
+def measure(bind: Engine, load: Callable[[Session], list], repeat: int = 3) -> Tuple[dict, list]:
+    """
+    Run a strategy on a fresh session: once traced (statements, rows and memory), then repeat times timed.
+
+    Args:
+        bind (Engine): Engine of the benchmark database.
+        load (Callable[[Session], list]): Strategy.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        Tuple[dict, list]: Measurements and the result of the traced run.
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", record_statement)
+    tracemalloc.start()
+    try:
+        with Session(bind) as session:
+            result = load(session)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        event.remove(bind, "before_cursor_execute", record_statement)
+
+    latencies = []
+    for _ in range(repeat):
+        started = perf_counter()
+        with Session(bind) as session:
+            load(session)
+        latencies.append(perf_counter() - started)
+
+    rows, values = rows_fetched(bind, statements)
+    return {
+        "bugs": len(result),
+        "rows_fetched": rows,
+        "values_fetched": values,
+        "statements": len(statements),
+        "peak_memory_mb": round(peak / 2 ** 20, 1),
+        "median_ms": round(statistics.median(latencies) * 1000, 1),
+        "min_ms": round(min(latencies) * 1000, 1),
+    }, result
+
+def compare_tag_loading(bind: Engine, repeat: int = 3) -> Dict[str, dict]:
+    """
+    Measure every strategy on the seeded database and check that they load the same tags.
+
+    Args:
+        bind (Engine): Engine of the benchmark database.
+        repeat (int): Number of timed runs per strategy.
+
+    Raises:
+        AssertionError: If strategies disagree on the loaded data.
+
+    Returns:
+        Dict[str, dict]: Measurements by strategy name.
+    """
+    results, expected = {}, None
+    for name, load in STRATEGIES.items():
+        results[name], loaded = measure(bind, load, repeat)
+        loaded = tag_names_by_bug(loaded)
+        assert expected is None or loaded == expected, f"{name} loaded different tags"
+        expected = loaded
+    return results
+
+def parse_range(value: str) -> range:
+    low, _, high = value.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--bugs", type=int, default=100_000)
+    parser.add_argument("--tags-per-bug", type=parse_range, default=parse_range("5-10"),
+                        help="Tags per bug, uniformly distributed (e.g. 5-10).")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    bind = create_engine(args.database_url)
+    enable_sqlite_foreign_keys(bind)
+    weights = [1 if count in args.tags_per_bug else 0 for count in range(args.tags_per_bug.stop)]
+    print(f"Seeding {args.bugs} bugs with {args.tags_per_bug.start}-{args.tags_per_bug.stop - 1} tags...",
+          file=sys.stderr)
+    seed_database(bind, args.bugs, args.seed, weights)
+
+    results = compare_tag_loading(bind, args.repeat)
+    for name, result in results.items():
+        print(f"{name:>13}: {json.dumps(result)}", file=sys.stderr)
+    output = json.dumps({"bugs": args.bugs, "strategies": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
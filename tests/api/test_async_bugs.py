@@ -0,0 +1,77 @@
+from app.schemas.bug import Status, BugUpdate
+from tests.api.test_bugs import bug_create
+
+
+def test_async_get_all_bugs_empty(async_client):
+    response = async_client.get("/bugs")
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+
+def test_async_post_and_get_bug(async_client):
+    payload = bug_create.model_copy(update={"tags": ["async", "tag"]})
+    response_post = async_client.post("/bugs", json=payload.model_dump())
+    assert response_post.status_code == 201
+    assert {tag["name"] for tag in response_post.json()["tags"]} == {"async", "tag"}
+
+    response_get = async_client.get("/bug/1")
+    assert response_get.status_code == 200
+    assert response_get.json()["title"] == bug_create.title
+
+    response_tags = async_client.get("/tags")
+    assert {tag["name"] for tag in response_tags.json()["items"]} == {"async", "tag"}
+
+def test_async_patch_put_delete_bug(async_client):
+    payload = bug_create.model_copy(update={"tags": ["first"]})
+    assert async_client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+    bug_update = BugUpdate.model_validate({"status": Status.CLOSED, "tags": ["second"]})
+    response_patch = async_client.patch("/bug/1", json=bug_update.model_dump(exclude_unset=True))
+    assert response_patch.status_code == 204
+
+    bug_data = async_client.get("/bug/1").json()
+    assert bug_data["status"] == Status.CLOSED.value
+    assert {tag["name"] for tag in bug_data["tags"]} == {"first", "second"}
+
+    put_payload = bug_create.model_copy(update={"title": "PUT title", "tags": ["third"]})
+    response_put = async_client.put("/bug/1", json=put_payload.model_dump())
+    assert response_put.status_code == 200
+    assert response_put.json()["title"] == "PUT title"
+    assert [tag["name"] for tag in response_put.json()["tags"]] == ["third"]
+
+    assert async_client.delete("/bug/1").status_code == 204
+    assert async_client.get("/bug/1").status_code == 404
+    assert async_client.delete("/bug/1").status_code == 404
+
+def test_async_get_all_bugs_paginated(async_client):
+    for i in range(3):
+        payload = bug_create.model_copy(update={"title": f"Bug {i}"})
+        assert async_client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+    first_page = async_client.get("/bugs", params={"limit": 2}).json()
+    assert [bug["id"] for bug in first_page["items"]] == [3, 2]
+
+    second_page = async_client.get("/bugs", params={"limit": 2, "cursor": first_page["next_cursor"]}).json()
+    assert [bug["id"] for bug in second_page["items"]] == [1]
+    assert second_page["next_cursor"] is None
+
+def test_async_get_all_bugs_sparse_fields(async_client):
+    async_client.post("/bugs", json=bug_create.model_dump())
+
+    items = async_client.get("/bugs", params={"fields": "summary"}).json()["items"]
+    assert items == [{"id": 1, "title": bug_create.title, "status": "OPEN", "priority": "HIGH", "assigned_to": None}]
+
+def test_async_bug_etags(async_client):
+    assert async_client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+
+    etag = async_client.get("/bug/1").headers["ETag"]
+    assert async_client.get("/bug/1", headers={"If-None-Match": etag}).status_code == 304
+
+    response_patch = async_client.patch("/bug/1", json={"title": "Changed"}, headers={"If-Match": etag})
+    assert response_patch.status_code == 204
+    assert async_client.patch("/bug/1", json={"title": "Lost"}, headers={"If-Match": etag}).status_code == 412
+    assert async_client.get("/bug/1").headers["ETag"] == response_patch.headers["ETag"]
+
+    tags_etag = async_client.get("/tags").headers["ETag"]
+    assert async_client.get("/tags", headers={"If-None-Match": tags_etag}).status_code == 304
+    bugs_etag = async_client.get("/bugs").headers["ETag"]
+    assert async_client.get("/bugs", headers={"If-None-Match": bugs_etag}).status_code == 304
@@ -1,5 +1,13 @@
+import csv
+import io
+import json
 import pytest
-from app.schemas.bug import Status, Priority, Severity, BugCreate, BugUpdate
+from sqlalchemy import select
+from app.db.functions import utcnow
+from app.models.association import bug_tags
+from app.models.tag import Tag
+from app.schemas.bug import Status, Priority, Severity, BugCreate, BugUpdate, BugSummary
+from app.services.bug import create_bug, delete_bug
 
 bug_create = BugCreate(
         title="Test title",
@@ -15,7 +23,88 @@ bug_create = BugCreate(
 def test_get_all_bugs_empty(client):
     response = client.get("/bugs")
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
+
+def test_get_all_bugs_paginated(client):
+    for i in range(5):
+        response = client.post("/bugs", json=bug_create.model_copy(update={"title": f"Bug {i}"}).model_dump())
+        assert response.status_code == 201
+
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get("/bugs", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen_ids.extend(bug["id"] for bug in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen_ids == [5, 4, 3, 2, 1]
+
+def test_get_all_bugs_matches_bug_response(client):
+    client.post("/bugs", json=bug_create.model_copy(update={"tags": None}).model_dump())
+    client.post("/bugs", json=bug_create.model_copy(update={"assigned_to": "dev", "tags": ["b", "a"]}).model_dump())
+
+    # Items encoded from DB rows are identical to BugResponse serialization of GET /bug/{id}.
+    items = client.get("/bugs").json()["items"]
+    assert [item["id"] for item in items] == [2, 1]
+    assert items == [client.get(f"/bug/{item['id']}").json() for item in items]
+    assert {tag["name"] for tag in items[0]["tags"]} == {"a", "b"}
+
+def test_get_all_bugs_sparse_fields(client, sql_statements):
+    for i in range(3):
+        client.post("/bugs", json=bug_create.model_copy(update={"title": f"Bug {i}"}).model_dump())
+
+    sql_statements.clear()
+    page = client.get("/bugs", params={"fields": "summary", "limit": 2}).json()
+    # Page rows only: no tags query, descriptions are not selected.
+    assert len(sql_statements) == 1
+    assert "description" not in sql_statements[0]
+    assert [BugSummary.model_validate(item).model_dump(mode="json") for item in page["items"]] == page["items"]
+    assert [item["title"] for item in page["items"]] == ["Bug 2", "Bug 1"]
+
+    # Pagination keeps working without created_at in the fields.
+    next_page = client.get("/bugs", params={"fields": "summary", "limit": 2, "cursor": page["next_cursor"]}).json()
+    assert [item["id"] for item in next_page["items"]] == [1]
+
+    items = client.get("/bugs", params={"fields": "tags, title"}).json()["items"]
+    assert list(items[0]) == ["title", "tags"]
+    assert {tag["name"] for tag in items[0]["tags"]} == set(bug_create.tags)
+
+def test_get_all_bugs_unknown_field(client):
+    response = client.get("/bugs", params={"fields": "title,secret"})
+    assert response.status_code == 400
+
+def test_get_all_bugs_invalid_cursor(client):
+    response = client.get("/bugs", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize(
+    ("params", "expected_titles"),
+    [
+        ({"status": Status.CLOSED.value}, {"Closed"}),
+        ({"assigned_to": "user_1"}, {"Assigned"}),
+        ({"tag": "backend"}, {"Assigned", "Closed"}),
+        ({"tag": "backend", "status": Status.OPEN.value}, {"Assigned"}),
+        ({"tag": "missing"}, set()),
+    ]
+)
+def test_get_all_bugs_filtered(client, params, expected_titles):
+    payloads = [
+        bug_create.model_copy(update={"title": "Plain", "tags": ["frontend"]}),
+        bug_create.model_copy(update={"title": "Assigned", "assigned_to": "user_1", "tags": ["backend"]}),
+        bug_create.model_copy(update={"title": "Closed", "status": Status.CLOSED, "tags": ["backend", "ui"]}),
+    ]
+    for payload in payloads:
+        assert client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+    response = client.get("/bugs", params=params)
+    assert response.status_code == 200
+    assert {bug["title"] for bug in response.json()["items"]} == expected_titles
 
 def test_get_bug_by_id_empty(client):
     response = client.get("/bug/1")
@@ -162,3 +251,267 @@ def test_delete_bug_unsuccessful(client):
     response_delete = client.delete("/bug/1")
     assert response_delete.status_code == 404
 
+
+def test_export_bugs_ndjson(client):
+    for i in range(3):
+        payload = bug_create.model_copy(update={"title": f"Bug {i}", "tags": ["export", f"tag{i}"]})
+        assert client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+    response = client.get("/bugs/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Bug 0", "Bug 1", "Bug 2"]
+    assert {tag["name"] for tag in rows[1]["tags"]} == {"export", "tag1"}
+    assert rows[0]["status"] == Status.OPEN.value
+
+def test_export_bugs_csv_filtered(client):
+    payloads = [
+        bug_create.model_copy(update={"title": "Open", "tags": ["a", "b"]}),
+        bug_create.model_copy(update={"title": "Closed", "status": Status.CLOSED, "tags": []}),
+    ]
+    for payload in payloads:
+        assert client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+    response = client.get("/bugs/export", params={"format": "csv", "status": Status.OPEN.value})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Open"
+    assert set(rows[0]["tags"].split(";")) == {"a", "b"}
+
+def test_post_bugs_bulk(client):
+    items = [
+        bug_create.model_copy(update={"title": "Bulk 0", "tags": ["bulk", "ci"]}).model_dump(),
+        {"title": "", "description": "Invalid"},
+        bug_create.model_copy(update={"title": "Bulk 2", "submitter": None, "tags": ["ci", "ci", "new"]}).model_dump(),
+        bug_create.model_copy(update={"title": "Bulk 3", "tags": None}).model_dump(),
+    ]
+    response = client.post("/bugs/bulk", json=items)
+    assert response.status_code == 201
+
+    result = response.json()
+    assert [item["index"] for item in result["created"]] == [0, 2, 3]
+    assert [item["index"] for item in result["errors"]] == [1]
+
+    for item in result["created"]:
+        bug_data = client.get(f"/bug/{item['id']}").json()
+        assert bug_data["title"] == items[item["index"]]["title"]
+        assert {tag["name"] for tag in bug_data["tags"]} == set(items[item["index"]]["tags"] or [])
+
+    assert client.get(f"/bug/{result['created'][1]['id']}").json()["submitter"] == "system"
+    tags = client.get("/tags").json()["items"]
+    assert {tag["name"]: tag["bug_count"] for tag in tags} == {"bulk": 1, "ci": 2, "new": 1}
+
+def test_post_bugs_bulk_existing_tags(client):
+    assert client.post("/bugs", json=bug_create.model_copy(update={"tags": ["old"]}).model_dump()).status_code == 201
+
+    items = [bug_create.model_copy(update={"tags": ["old", "fresh"]}).model_dump()]
+    response = client.post("/bugs/bulk", json=items)
+    assert response.status_code == 201
+    assert response.json()["errors"] == []
+
+    tags = client.get("/tags").json()["items"]
+    assert [(tag["name"], tag["bug_count"]) for tag in tags] == [("fresh", 1), ("old", 2)]
+
+def test_patch_bugs_bulk_by_ids(client):
+    items = [bug_create.model_copy(update={"title": f"Bulk {i}", "tags": ["old"]}).model_dump() for i in range(4)]
+    assert client.post("/bugs/bulk", json=items).status_code == 201
+
+    body = {"ids": [1, 3, 99], "update": {"status": Status.CLOSED.value, "tags": ["old", "triaged"]}}
+    response = client.patch("/bugs/bulk", json=body)
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+
+    for bug_id, expected_status, expected_tags in [(1, "CLOSED", {"old", "triaged"}), (2, "OPEN", {"old"})]:
+        bug_data = client.get(f"/bug/{bug_id}").json()
+        assert bug_data["status"] == expected_status
+        assert {tag["name"] for tag in bug_data["tags"]} == expected_tags
+
+def test_patch_bugs_bulk_by_filter(client):
+    items = [
+        bug_create.model_copy(update={"assigned_to": "user_1"}).model_dump(),
+        bug_create.model_copy(update={"assigned_to": "user_2"}).model_dump(),
+        bug_create.model_copy(update={"assigned_to": "user_1"}).model_dump(),
+    ]
+    assert client.post("/bugs/bulk", json=items).status_code == 201
+
+    body = {"filter": {"assigned_to": "user_1"}, "update": {"assigned_to": "user_3"}}
+    response = client.patch("/bugs/bulk", json=body)
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+
+    assignees = [bug["assigned_to"] for bug in client.get("/bugs").json()["items"]]
+    assert sorted(assignees) == ["user_2", "user_3", "user_3"]
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"update": {"status": "CLOSED"}},
+        {"ids": [1], "filter": {"status": "OPEN"}, "update": {"status": "CLOSED"}},
+        {"filter": {}, "update": {"status": "CLOSED"}},
+        {"ids": [1], "update": {}},
+    ]
+)
+def test_patch_bugs_bulk_invalid(client, body):
+    response = client.patch("/bugs/bulk", json=body)
+    assert response.status_code == 422
+
+@pytest.mark.parametrize("bug_create", [bug_create])
+def test_get_bug_cached_and_invalidated(client, bug_create):
+    assert client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+    hits_before = client.get("/metrics/cache").json()["bug"]["hits"]
+
+    first = client.get("/bug/1")
+    second = client.get("/bug/1")
+    assert first.json() == second.json()
+    assert client.get("/metrics/cache").json()["bug"]["hits"] == hits_before + 1
+
+    assert client.patch("/bug/1", json={"title": "Changed"}).status_code == 204
+    assert client.get("/bug/1").json()["title"] == "Changed"
+
+    assert client.put("/bug/1", json=bug_create.model_copy(update={"title": "Put"}).model_dump()).status_code == 200
+    assert client.get("/bug/1").json()["title"] == "Put"
+
+    assert client.patch("/bugs/bulk", json={"ids": [1], "update": {"title": "Bulk"}}).status_code == 200
+    assert client.get("/bug/1").json()["title"] == "Bulk"
+
+    assert client.delete("/bug/1").status_code == 204
+    assert client.get("/bug/1").status_code == 404
+
+@pytest.mark.parametrize("bug_create", [bug_create])
+def test_get_bug_etag_not_modified(client, bug_create):
+    assert client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+
+    response = client.get("/bug/1")
+    etag = response.headers["ETag"]
+
+    # Both cached and uncached bugs are answered without a body.
+    for _ in range(2):
+        response_not_modified = client.get("/bug/1", headers={"If-None-Match": etag})
+        assert response_not_modified.status_code == 304
+        assert response_not_modified.headers["ETag"] == etag
+        assert response_not_modified.content == b""
+        client.post("/bugs", json=bug_create.model_dump())
+
+    assert client.patch("/bug/1", json={"title": "Changed"}).status_code == 204
+    response_changed = client.get("/bug/1", headers={"If-None-Match": etag})
+    assert response_changed.status_code == 200
+    assert response_changed.headers["ETag"] != etag
+    assert response_changed.json()["title"] == "Changed"
+
+@pytest.mark.parametrize("bug_create", [bug_create])
+def test_update_bug_if_match(client, bug_create):
+    assert client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+    etag = client.get("/bug/1").headers["ETag"]
+
+    response_patch = client.patch("/bug/1", json={"title": "First"}, headers={"If-Match": etag})
+    assert response_patch.status_code == 204
+    new_etag = response_patch.headers["ETag"]
+    assert new_etag != etag
+
+    # A writer still holding the old ETag loses.
+    put_payload = bug_create.model_copy(update={"title": "Second"}).model_dump()
+    assert client.put("/bug/1", json=put_payload, headers={"If-Match": etag}).status_code == 412
+    assert client.patch("/bug/1", json={"title": "Second"}, headers={"If-Match": etag}).status_code == 412
+    assert client.get("/bug/1").json()["title"] == "First"
+
+    response_put = client.put("/bug/1", json=put_payload, headers={"If-Match": new_etag})
+    assert response_put.status_code == 200
+    assert response_put.headers["ETag"] == client.get("/bug/1").headers["ETag"]
+
+def test_get_all_bugs_etag(client, sql_statements):
+    assert client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+
+    sql_statements.clear()
+    etag = client.get("/bugs").headers["ETag"]
+    # Without If-None-Match the ETag comes from the page rows: page and tags queries only.
+    assert len(sql_statements) == 2
+    assert client.get("/bugs", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/bugs", params={"status": "CLOSED"}, headers={"If-None-Match": etag}).status_code == 200
+
+    assert client.patch("/bug/1", json={"status": "CLOSED"}).status_code == 204
+    assert client.get("/bugs", headers={"If-None-Match": etag}).status_code == 200
+
+def test_get_all_bugs_etag_with_sparse_fields_and_next_page(client):
+    for i in range(3):
+        client.post("/bugs", json=bug_create.model_copy(update={"title": f"Bug {i}"}).model_dump())
+
+    # The ETag of a response is the one If-None-Match is checked against for the same fields.
+    params = {"fields": "title", "limit": 2}
+    etag = client.get("/bugs", params=params).headers["ETag"]
+    assert client.get("/bugs", params=params, headers={"If-None-Match": etag}).status_code == 304
+    # The same fields listed differently: same representation.
+    same = {"fields": "title, title", "limit": 2}
+    assert client.get("/bugs", params=same, headers={"If-None-Match": etag}).status_code == 304
+    # Other representations of the page have their own ETags.
+    for other in ({"limit": 2}, {"fields": "summary", "limit": 2}):
+        response = client.get("/bugs", params=other, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+def test_write_statement_counts(client, sql_statements):
+    def statements_of(request):
+        sql_statements.clear()
+        response = request()
+        assert response.status_code < 300
+        return len(sql_statements)
+
+    # Responses are built from what the writes returned: no refresh nor lazy loads.
+    untagged = bug_create.model_copy(update={"tags": None}).model_dump()
+    # Bug row, its similarity buckets and the lookup of duplicates.
+    assert statements_of(lambda: client.post("/bugs", json=untagged)) == 3
+    # Bug row, then the buckets of the new text replace the old ones.
+    assert statements_of(lambda: client.patch("/bug/1", json={"title": "Changed"})) == 3
+    assert statements_of(lambda: client.put("/bug/1", json=untagged)) == 4
+    # Lock of the bug row, its bug_tags (none, so no tag counts), bug row (buckets go by cascade)
+    # and the tombstone for incremental sync.
+    assert statements_of(lambda: client.delete("/bug/1")) == 4
+
+    bug_id = client.post("/bugs", json=bug_create.model_copy(update={"tags": ["a"]}).model_dump()).json()["id"]
+    # Bug row, lookup and insert of the new tag ("a" is cached), tag counts and bug_tags statements.
+    assert statements_of(lambda: client.patch(f"/bug/{bug_id}", json={"tags": ["a", "b"]})) == 5
+    # Bug with its tags, tag counts, bug row and bug_tags: "b" is cached since the PATCH committed,
+    # the text is unchanged so the buckets are kept.
+    put_payload = bug_create.model_copy(update={"tags": ["b"]}).model_dump()
+    assert statements_of(lambda: client.put(f"/bug/{bug_id}", json=put_payload)) == 4
+
+def test_delete_bug_cascades_to_bug_tags(session_client):
+    bug = create_bug(session_client, bug_create.model_copy(update={"tags": ["a", "b"]}))
+    other = create_bug(session_client, bug_create.model_copy(update={"tags": ["b"]}))
+    delete_bug(session_client, bug.id)
+
+    assert session_client.scalars(select(bug_tags.c.bug_id)).all() == [other.id]
+    assert dict(session_client.execute(select(Tag.name, Tag.bug_count)).all()) == {"a": 0, "b": 1}
+
+def test_timestamps_set_by_database(client):
+    first = client.post("/bugs", json=bug_create.model_dump()).json()
+    client.post("/bugs/bulk", json=[bug_create.model_dump()])
+    second = client.get("/bug/2").json()
+
+    # Stamped per write, not once per process.
+    assert first["created_at"] == first["updated_at"]
+    assert first["created_at"] < second["created_at"] == second["updated_at"]
+
+    # Every write path bumps updated_at, including tag-only changes.
+    versions = [first["updated_at"]]
+    for request in (
+        lambda: client.patch("/bug/1", json={"tags": ["other"]}),
+        lambda: client.put("/bug/1", json=bug_create.model_dump()),
+        lambda: client.patch("/bugs/bulk", json={"ids": [1], "update": {"tags": ["more"]}}),
+    ):
+        assert request().status_code < 300
+        bug = client.get("/bug/1").json()
+        assert bug["created_at"] == first["created_at"]
+        versions.append(bug["updated_at"])
+    assert versions == sorted(set(versions))
+
+def test_timestamps_have_microseconds(session_client):
+    # Writes within the same millisecond still get distinct times (ETags, sync cursors).
+    first = session_client.scalar(select(utcnow()))
+    session_client.commit()
+    second = session_client.scalar(select(utcnow()))
+    assert first < second
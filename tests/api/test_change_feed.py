@@ -0,0 +1,27 @@
+from app.services.change_feed import change_feed
+from tests.api.test_bugs import bug_create
+
+
+def test_change_feed_websocket(client):
+    with client.websocket_connect("/bugs/events/ws") as websocket:
+        bug_id = client.post("/bugs", json=bug_create.model_dump()).json()["id"]
+        client.patch(f"/bug/{bug_id}", json={"title": "Changed"})
+        client.put(f"/bug/{bug_id}", json=bug_create.model_dump())
+        client.post("/bugs/bulk", json=[bug_create.model_dump()])
+        client.delete(f"/bug/{bug_id}")
+
+        events = [websocket.receive_json() for _ in range(5)]
+        assert [(event["type"], event["bug_id"]) for event in events] == [
+            ("created", bug_id), ("updated", bug_id), ("updated", bug_id), ("created", bug_id + 1),
+            ("deleted", bug_id),
+        ]
+
+    # Resuming after the second event replays the rest.
+    with client.websocket_connect(f"/bugs/events/ws?last_event_id={events[1]['id']}") as websocket:
+        assert [websocket.receive_json()["id"] for _ in range(3)] == [event["id"] for event in events[2:]]
+
+def test_change_feed_failed_write_not_published(client):
+    last_sequence = change_feed.stats()["last_sequence"]
+    assert client.delete("/bug/12345").status_code == 404
+    assert client.patch("/bug/12345", json={"title": "Changed"}).status_code == 404
+    assert change_feed.stats()["last_sequence"] == last_sequence
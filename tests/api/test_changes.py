@@ -0,0 +1,55 @@
+import pytest
+from app.services import changes
+from tests.api.test_bugs import bug_create
+
+
+@pytest.fixture
+def settled(monkeypatch):
+    monkeypatch.setattr(changes, "CHANGES_SETTLE_SECONDS", 0)
+
+def sync(client, since=None, limit=2):
+    """Follow next_cursor until caught up, like a syncing client."""
+    bugs, deleted = {}, set()
+    while True:
+        params = {"limit": limit} if since is None else {"limit": limit, "since": since}
+        response = client.get("/bugs/changes", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["bugs"]) + len(page["deleted"]) <= limit
+        deleted.update(page["deleted"])
+        bugs.update((bug["id"], bug) for bug in page["bugs"])
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            return bugs, deleted, since
+
+def test_bug_changes_since_cursor(client, settled):
+    for i in range(5):
+        client.post("/bugs", json=bug_create.model_copy(update={"title": f"Bug {i}"}).model_dump())
+
+    bugs, deleted, cursor = sync(client)
+    assert sorted(bugs) == [1, 2, 3, 4, 5] and deleted == set()
+    assert bugs[1] == client.get("/bug/1").json()
+
+    client.patch("/bug/2", json={"title": "Changed"})
+    client.patch("/bugs/bulk", json={"ids": [3], "update": {"assigned_to": "dev"}})
+    client.delete("/bug/4")
+    client.post("/bugs/bulk", json=[bug_create.model_dump()])
+
+    bugs, deleted, cursor = sync(client, cursor)
+    assert sorted(bugs) == [2, 3, 6]
+    assert (bugs[2]["title"], bugs[3]["assigned_to"]) == ("Changed", "dev")
+    assert deleted == {4}
+
+    assert sync(client, cursor)[:2] == ({}, set())
+
+def test_bug_changes_settle_window(client):
+    client.post("/bugs", json=bug_create.model_dump())
+
+    # Recent changes are repeated until they are older than the settle window, so late commits are not missed.
+    bugs, _, cursor = sync(client)
+    assert sorted(bugs) == [1]
+    assert sorted(sync(client, cursor)[0]) == [1]
+
+def test_bug_changes_invalid_cursor(client):
+    response = client.get("/bugs/changes", params={"since": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import update, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.idempotency_key import IdempotencyKey
+from app.routers import bug_router
+from app.services import idempotency
+from app.services.cache import idempotency_cache
+from app.services.idempotency import purge_expired_idempotency_keys, request_hash, as_utc, IDEMPOTENCY_LEASE_SECONDS
+from tests.api.test_bugs import bug_create
+
+KEY = {"Idempotency-Key": "3f9a1c2e-retry-test"}
+
+
+def test_create_bug_retry_returns_stored_response(client, sql_statements):
+    first = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    sql_statements.clear()
+    retry = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.content == first.content
+    # Answered by the front cache.
+    assert sql_statements == []
+
+    # Without the front cache, a single SELECT of the stored response.
+    idempotency_cache.clear()
+    retry = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert retry.status_code == 201 and retry.content == first.content
+    assert len(sql_statements) == 1 and sql_statements[0].lstrip().startswith("SELECT")
+
+    assert len(client.get("/bugs").json()["items"]) == 1
+
+def test_create_bug_keys_are_per_client(client):
+    first = client.post("/bugs", json=bug_create.model_dump(), headers={**KEY, "X-Client-ID": "ci-1"})
+    other = client.post("/bugs", json=bug_create.model_dump(), headers={**KEY, "X-Client-ID": "ci-2"})
+    assert (first.json()["id"], other.json()["id"]) == (1, 2)
+
+def test_create_bug_key_reused_for_different_body(client):
+    client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    response = client.post("/bugs", json={**bug_create.model_dump(), "title": "Other"}, headers=KEY)
+    assert response.status_code == 422
+    assert len(client.get("/bugs").json()["items"]) == 1
+
+def test_create_bug_key_in_progress(client, session_client):
+    session_client.execute(IdempotencyKey.__table__.insert().values(
+        client="ci", key=KEY["Idempotency-Key"], request_hash=request_hash(bug_create.model_dump_json().encode()),
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    ))
+    session_client.commit()
+    response = client.post("/bugs", json=bug_create.model_dump(), headers={**KEY, "X-Client-ID": "ci"})
+    assert response.status_code == 409
+
+def test_create_bug_expired_key_runs_again(client, session_client):
+    first = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    session_client.execute(update(IdempotencyKey).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    session_client.commit()
+    idempotency_cache.clear()
+
+    retry = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert retry.status_code == 201 and "Idempotent-Replayed" not in retry.headers
+    assert retry.json()["id"] == first.json()["id"] + 1
+
+def test_create_bug_stale_placeholder_is_taken_over(client, session_client, monkeypatch):
+    def fail(*args):
+        raise SQLAlchemyError("connection lost")
+
+    key_row = select(IdempotencyKey.status_code, IdempotencyKey.expires_at)
+    # The bug is created but its response can't be stored: the placeholder is only leased.
+    with monkeypatch.context() as patched:
+        patched.setattr(idempotency, "store_idempotent_response", fail)
+        first = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert first.status_code == 201
+    status_code, expires_at = session_client.execute(key_row).one()
+    assert status_code is None
+    assert as_utc(expires_at) <= datetime.now(timezone.utc) + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+    assert client.post("/bugs", json=bug_create.model_dump(), headers=KEY).status_code == 409
+
+    session_client.execute(update(IdempotencyKey).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    session_client.commit()
+    retry = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert retry.status_code == 201 and "Idempotent-Replayed" not in retry.headers
+    # The stored response is kept for the full TTL.
+    session_client.expire_all()
+    status_code, expires_at = session_client.execute(key_row).one()
+    assert status_code == 201
+    assert as_utc(expires_at) > datetime.now(timezone.utc) + timedelta(hours=1)
+
+def test_create_bug_invalid_key(client):
+    response = client.post("/bugs", json=bug_create.model_dump(), headers={"Idempotency-Key": "x" * 256})
+    assert response.status_code == 400
+
+def test_create_bug_failure_releases_key(client, monkeypatch):
+    def fail(session, bug):
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(bug_router, "create_bug", fail)
+        assert client.post("/bugs", json=bug_create.model_dump(), headers=KEY).status_code == 500
+
+    retry = client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert retry.status_code == 201 and "Idempotent-Replayed" not in retry.headers
+
+def test_create_bugs_bulk_retry(client):
+    items = [bug_create.model_dump(), {"title": ""}, bug_create.model_dump()]
+    first = client.post("/bugs/bulk", json=items, headers=KEY)
+    assert first.status_code == 201
+    assert [item["id"] for item in first.json()["created"]] == [1, 2]
+
+    retry = client.post("/bugs/bulk", json=items, headers=KEY)
+    assert retry.status_code == 201 and retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(client.get("/bugs").json()["items"]) == 2
+
+def test_purge_expired_idempotency_keys(client, session_client):
+    client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    client.post("/bugs", json=bug_create.model_dump(), headers={"Idempotency-Key": "other"})
+    session_client.execute(update(IdempotencyKey).where(IdempotencyKey.key == "other").values(
+        expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+    ))
+    session_client.commit()
+
+    assert purge_expired_idempotency_keys(session_client) == 1
+    assert session_client.query(IdempotencyKey.key).all() == [(KEY["Idempotency-Key"],)]
+
+def test_async_create_bug_retry(async_client):
+    first = async_client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    idempotency_cache.clear()
+    retry = async_client.post("/bugs", json=bug_create.model_dump(), headers=KEY)
+    assert retry.status_code == 201 and retry.content == first.content
+    assert retry.headers["Idempotent-Replayed"] == "true"
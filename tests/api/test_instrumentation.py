@@ -0,0 +1,39 @@
+import pytest
+from app.utils import instrumentation
+from app.utils.instrumentation import QueryBudgetExceeded, request_metrics
+from tests.api.test_bugs import bug_create
+
+
+def test_metrics_per_route(client):
+    assert client.post("/bugs", json=bug_create.model_copy(update={"tags": None}).model_dump()).status_code == 201
+    assert client.get("/bug/1").status_code == 200
+    assert client.get("/bugs").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    # Cache miss: a single SELECT.
+    assert 'http_request_db_statements_sum{route="GET /bug/{bug_id}"} 1' in body
+    assert 'http_request_db_statements_count{route="POST /bugs"} 1' in body
+
+    bugs_metrics = request_metrics.route("GET /bugs")
+    # Page rows (the ETag is computed from them) and tags of the page.
+    assert bugs_metrics.statements.sum == 2
+    assert bugs_metrics.db_time.sum > 0
+    assert bugs_metrics.serialization_time.sum > 0
+    assert bugs_metrics.latency.sum >= bugs_metrics.db_time.sum
+
+def test_metrics_async_routes(async_client):
+    assert async_client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+    assert async_client.get("/bug/1").status_code == 200
+
+    assert request_metrics.route("GET /bug/{bug_id}").statements.sum == 1
+
+def test_strict_mode_query_budget(client, monkeypatch):
+    monkeypatch.setitem(instrumentation.ROUTE_QUERY_BUDGETS, "GET /bugs", 0)
+
+    with pytest.raises(QueryBudgetExceeded, match="GET /bugs ran 1 SQL statements"):
+        client.get("/bugs")
+    assert request_metrics.route("GET /bugs").budget_exceeded == 1
@@ -0,0 +1,9 @@
+def test_get_pool_metrics(client):
+    response = client.get("/metrics/pool")
+    assert response.status_code == 200
+    assert "pool_class" in response.json()["sync"]
+
+def test_get_replica_metrics(client):
+    response = client.get("/metrics/replica")
+    assert response.status_code == 200
+    assert response.json()["configured"] is False
@@ -0,0 +1,58 @@
+from app.schemas.bug import Status
+from tests.api.test_bugs import bug_create
+
+
+def post_bugs(client, *title_desc_pairs, **update):
+    for title, description in title_desc_pairs:
+        payload = bug_create.model_copy(update={"title": title, "description": description, **update})
+        assert client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+def search_titles(client, **params):
+    response = client.get("/bugs/search", params=params)
+    assert response.status_code == 200
+    return [bug["title"] for bug in response.json()["items"]]
+
+def test_search_bugs_ranked(client):
+    post_bugs(
+        client,
+        ("Login page crashes", "Crash after submitting the form"),
+        ("Crash on logout", "Logout crashes the app, crash log attached"),
+        ("Slow dashboard", "Dashboard takes ages to load"),
+    )
+
+    assert search_titles(client, q="crash") == ["Crash on logout", "Login page crashes"]
+    assert search_titles(client, q="dashboard") == ["Slow dashboard"]
+    assert search_titles(client, q="crash logout") == ["Crash on logout"]
+    assert search_titles(client, q="missing") == []
+
+def test_search_bugs_paginated_and_filtered(client):
+    post_bugs(client, *[(f"Timeout {i}", "Request timeout") for i in range(3)])
+    post_bugs(client, ("Timeout closed", "Request timeout"), status=Status.CLOSED)
+
+    response = client.get("/bugs/search", params={"q": "timeout", "limit": 2})
+    first_page = response.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next_offset"] == 2
+
+    second_page = client.get("/bugs/search", params={"q": "timeout", "limit": 2, "offset": 2}).json()
+    assert len(second_page["items"]) == 2
+    assert second_page["next_offset"] is None
+
+    assert search_titles(client, q="timeout", status=Status.CLOSED.value) == ["Timeout closed"]
+
+def test_search_bugs_follows_writes(client):
+    post_bugs(client, ("Broken export", "CSV export is empty"))
+    assert search_titles(client, q="export") == ["Broken export"]
+
+    assert client.patch("/bug/1", json={"title": "Broken import"}).status_code == 204
+    assert search_titles(client, q="import") == ["Broken import"]
+
+    post_bugs(client, ("Another export issue", "NDJSON export"))
+    assert search_titles(client, q="ndjson") == ["Another export issue"]
+
+    assert client.delete("/bug/2").status_code == 204
+    assert search_titles(client, q="ndjson") == []
+
+def test_search_bugs_requires_query(client):
+    assert client.get("/bugs/search").status_code == 422
+    assert client.get("/bugs/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,69 @@
+from app.schemas.bug import Status
+from tests.api.test_bugs import bug_create
+
+CRASH = bug_create.model_copy(update={
+    "title": "Crash in renderer at 0x7ffe12",
+    "description": "Segfault in paint() while scrolling the timeline view, pid 4242",
+    "tags": None,
+})
+
+
+def crash_report(number: int) -> dict:
+    return CRASH.model_copy(update={"title": f"Crash in renderer at 0x{number:x}"}).model_dump()
+
+def test_create_bug_suggests_open_duplicates(client):
+    first = client.post("/bugs", json=crash_report(1)).json()
+    assert first["similar"] == []
+    client.post("/bugs", json=bug_create.model_dump())
+    client.post("/bugs", json={**crash_report(3), "status": Status.CLOSED.value})
+
+    similar = client.post("/bugs", json=crash_report(4)).json()["similar"]
+    # Reports differing only in numbers are identical; the closed one is not suggested.
+    assert similar == [{
+        "id": 1, "title": first["title"], "status": "OPEN", "priority": first["priority"],
+        "assigned_to": None, "similarity": 1.0,
+    }]
+
+def test_get_similar_bugs(client):
+    client.post("/bugs", json=crash_report(1))
+    client.post("/bugs", json={**crash_report(2), "status": Status.CLOSED.value})
+    client.post("/bugs", json={**crash_report(3), "description": CRASH.description + " after resizing"})
+    client.post("/bugs", json=bug_create.model_dump())
+
+    response = client.get("/bug/1/similar")
+    assert response.status_code == 200
+    similar = response.json()
+    assert [bug["id"] for bug in similar] == [2, 3]
+    assert similar[0]["similarity"] == 1.0 > similar[1]["similarity"] >= 0.6
+
+    assert [bug["id"] for bug in client.get("/bug/1/similar", params={"threshold": 1}).json()] == [2]
+    assert [bug["id"] for bug in client.get("/bug/1/similar", params={"limit": 1}).json()] == [2]
+    assert client.get("/bug/4/similar").json() == []
+    assert client.get("/bug/99/similar").status_code == 404
+
+def test_similar_bugs_follow_updates(client):
+    client.post("/bugs", json=crash_report(1))
+    client.post("/bugs", json=bug_create.model_dump())
+    assert client.get("/bug/1/similar").json() == []
+
+    client.patch("/bug/2", json={"title": CRASH.title, "description": CRASH.description})
+    assert [bug["id"] for bug in client.get("/bug/1/similar").json()] == [2]
+
+    client.patch("/bugs/bulk", json={"ids": [2], "update": {"description": "Something else entirely"}})
+    assert client.get("/bug/1/similar").json() == []
+
+    client.put("/bug/2", json=crash_report(2))
+    assert [bug["id"] for bug in client.get("/bug/1/similar").json()] == [2]
+
+    client.delete("/bug/2")
+    assert client.get("/bug/1/similar").json() == []
+
+def test_bulk_created_bugs_are_indexed(client):
+    client.post("/bugs/bulk", json=[crash_report(1), bug_create.model_dump(), crash_report(2)])
+    assert [bug["id"] for bug in client.get("/bug/1/similar").json()] == [3]
+
+def test_async_create_bug_suggests_duplicates(async_client):
+    async_client.post("/bugs", json=crash_report(1))
+    response = async_client.post("/bugs", json=crash_report(2))
+    assert response.status_code == 201
+    assert [bug["id"] for bug in response.json()["similar"]] == [1]
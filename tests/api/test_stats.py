@@ -0,0 +1,55 @@
+from datetime import date, datetime, timezone
+from app.schemas.bug import Status, Priority
+from tests.api.test_bugs import bug_create
+
+
+def test_get_bug_stats_empty(client):
+    response = client.get("/bugs/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 0, "by_status": [], "by_priority": [], "by_severity": [], "by_assignee": [], "by_tag": [],
+        "daily": None
+    }
+
+def test_get_bug_stats(client):
+    payloads = [
+        bug_create.model_copy(update={"assigned_to": "alice", "tags": ["ui", "db"]}),
+        bug_create.model_copy(update={"assigned_to": "alice", "status": Status.CLOSED, "tags": ["ui"]}),
+        bug_create.model_copy(update={"assigned_to": None, "priority": Priority.LOW, "tags": None}),
+    ]
+    for payload in payloads:
+        assert client.post("/bugs", json=payload.model_dump()).status_code == 201
+
+    stats = client.get("/bugs/stats").json()
+    assert stats["total"] == 3
+    assert stats["by_status"] == [{"value": "OPEN", "count": 2}, {"value": "CLOSED", "count": 1}]
+    assert stats["by_priority"] == [{"value": "HIGH", "count": 2}, {"value": "LOW", "count": 1}]
+    assert stats["by_severity"] == [{"value": "CRITICAL", "count": 3}]
+    assert {(b["value"], b["count"]) for b in stats["by_assignee"]} == {("alice", 2), (None, 1)}
+    assert stats["by_tag"] == [{"value": "ui", "count": 2}, {"value": "db", "count": 1}]
+
+    filtered = client.get("/bugs/stats", params={"tag": "ui"}).json()
+    assert filtered["total"] == 2
+    assert filtered["by_tag"] == [{"value": "ui", "count": 2}, {"value": "db", "count": 1}]
+
+def test_get_bug_stats_daily(client):
+    for status in (Status.OPEN, Status.CLOSED):
+        bug = bug_create.model_copy(update={"status": status}).model_dump()
+        assert client.post("/bugs", json=bug).status_code == 201
+
+    daily = client.get("/bugs/stats", params={"interval": "day"}).json()["daily"]
+    assert sum(day["opened"] for day in daily) == 2
+    assert sum(day["closed"] for day in daily) == 1
+    assert all(date.fromisoformat(day["day"]) for day in daily)
+
+    future = datetime(2100, 1, 1, tzinfo=timezone.utc).isoformat()
+    assert client.get("/bugs/stats", params={"interval": "day", "since": future}).json()["daily"] == []
+
+def test_get_bug_stats_cached(client):
+    assert client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+    assert client.get("/bugs/stats", params={"cached": True}).json()["total"] == 1
+
+    assert client.post("/bugs", json=bug_create.model_dump()).status_code == 201
+    # Cached counts may lag behind writes until the entry expires.
+    assert client.get("/bugs/stats", params={"cached": True}).json()["total"] == 1
+    assert client.get("/bugs/stats").json()["total"] == 2
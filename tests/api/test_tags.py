@@ -15,6 +15,59 @@ def test_tag_duplicate(client):
     request_get = client.get("/tags")
     assert request_get.status_code == 200
 
-    tag_data = request_get.json()
+    tag_data = request_get.json()["items"]
     assert len(tag_data) == 1
     assert any(tag["name"] == "test" for tag in tag_data)
+
+def test_get_all_tags_etag(client):
+    etag = client.get("/tags").headers["ETag"]
+    assert client.get("/tags", headers={"If-None-Match": etag}).status_code == 304
+
+    assert client.post("/bugs", json=bug_create.model_copy(update={"tags": ["new"]}).model_dump()).status_code == 201
+    response = client.get("/tags", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_get_tags_counts_follow_writes(client):
+    assert client.post("/bugs", json=bug_create.model_copy(update={"tags": ["a", "b"]}).model_dump()).status_code == 201
+    assert client.post("/bugs", json=bug_create.model_copy(update={"tags": ["a"]}).model_dump()).status_code == 201
+
+    def counts():
+        return {tag["name"]: tag["bug_count"] for tag in client.get("/tags").json()["items"]}
+
+    assert counts() == {"a": 2, "b": 1}
+
+    assert client.patch("/bug/2", json={"tags": ["b", "c"]}).status_code == 204
+    assert counts() == {"a": 2, "b": 2, "c": 1}
+
+    assert client.put("/bug/1", json=bug_create.model_copy(update={"tags": ["c"]}).model_dump()).status_code == 200
+    assert counts() == {"a": 1, "b": 1, "c": 2}
+
+    assert client.patch("/bugs/bulk", json={"ids": [1, 2], "update": {"tags": ["a", "d"]}}).status_code == 200
+    assert counts() == {"a": 2, "b": 1, "c": 2, "d": 2}
+
+    assert client.delete("/bug/2").status_code == 204
+    assert counts() == {"a": 1, "b": 0, "c": 1, "d": 1}
+
+def test_get_tags_prefix_sort_and_pages(client):
+    for tags in (["api", "app", "db"], ["app", "db"], ["app"], ["a_b"]):
+        assert client.post("/bugs", json=bug_create.model_copy(update={"tags": tags}).model_dump()).status_code == 201
+
+    names = [tag["name"] for tag in client.get("/tags", params={"prefix": "ap"}).json()["items"]]
+    assert names == ["api", "app"]
+    # LIKE wildcards in the prefix are matched literally.
+    assert [tag["name"] for tag in client.get("/tags", params={"prefix": "a_"}).json()["items"]] == ["a_b"]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"sort": "usage", "limit": 1} if cursor is None else {"sort": "usage", "limit": 1, "cursor": cursor}
+        page = client.get("/tags", params=params).json()
+        seen.extend((tag["name"], tag["bug_count"]) for tag in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen[:2] == [("app", 3), ("db", 2)]
+    assert sorted(seen[2:]) == [("a_b", 1), ("api", 1)]
+
+    assert client.get("/tags", params={"cursor": "not-a-cursor"}).status_code == 400
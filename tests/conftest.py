@@ -1,11 +1,19 @@
 import os
 from contextlib import contextmanager
 import pytest
-from sqlalchemy import create_engine
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from starlette.testclient import TestClient
 from app.main import app
-from app.db.session import get_db, Base
+from app.db.init_db import init_db
+from app.db.session import get_db, get_read_db, get_async_db, to_async_url, enable_sqlite_foreign_keys, Base
+from app.routers import async_bug_router, async_tag_router
+from app.services.cache import bug_cache, stats_cache, idempotency_cache
+from app.utils.instrumentation import (
+    INSTRUMENTATION_ENABLED, InstrumentationMiddleware, instrument_engine, request_metrics
+)
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,18 +22,47 @@ TEST_DB = os.getenv("TEST_DATABASE_URL")
 if not TEST_DB:
     raise ValueError("TEST_DATABASE_URL is not set")
 engine = create_engine(TEST_DB)
+enable_sqlite_foreign_keys(engine)
+instrument_engine(engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def override_get_db():
     with SessionLocal() as session:
         yield session
 
 app.dependency_overrides[get_db] = override_get_db
+# No replica in tests: read-only endpoints use the test database as well.
+app.dependency_overrides[get_read_db] = override_get_db
+
+# Each TestClient runs its own event loop, so async connections must not be pooled across tests.
+async_engine = create_async_engine(to_async_url(TEST_DB), poolclass=NullPool)
+enable_sqlite_foreign_keys(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_engine)
+
+async def override_get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+async_app = FastAPI()
+async_app.include_router(async_bug_router.router)
+async_app.include_router(async_tag_router.router)
+async_app.dependency_overrides[get_async_db] = override_get_async_db
+
+# Tests run in strict mode: a request over its route's query budget fails the test.
+if not INSTRUMENTATION_ENABLED:
+    app.add_middleware(InstrumentationMiddleware, strict=True)
+async_app.add_middleware(InstrumentationMiddleware, strict=True)
 
 @contextmanager
 def restart_db():
-    Base.metadata.create_all(bind=engine)
+    init_db(engine)
+    bug_cache.clear()
+    stats_cache.clear()
+    idempotency_cache.clear()
+    request_metrics.clear()
     try:
         yield
     finally:
@@ -36,9 +73,29 @@ def client():
     with restart_db():
         yield TestClient(app)
 
+@pytest.fixture(scope="function")
+def async_client():
+    with restart_db():
+        yield TestClient(async_app)
+
 @pytest.fixture(scope="function")
 def session_client():
     with restart_db():
         with SessionLocal() as session:
             yield session
 
+@pytest.fixture(scope="function")
+def sql_statements():
+    """
+    SQL statements executed on the test engine while the test runs (clear() it to start counting).
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
@@ -0,0 +1,119 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from sqlalchemy import select, func
+
+from app.main import app
+from app.models.association import bug_tags
+from app.models.bug import Bug
+from app.models.tag import Tag
+from benchmarks.compare import compare_results
+from benchmarks.run import percentile, parse_statement_counts, run_benchmark
+from benchmarks.seed import seed_database, tag_vocabulary
+from benchmarks.similarity import seed_similarity_dataset, benchmark_similarity
+from benchmarks.tag_loading import compare_tag_loading
+from tests.api.test_bugs import bug_create
+from tests.conftest import engine
+
+
+@pytest.mark.parametrize(
+    ("values", "q", "expected"),
+    [
+        ([], 50, 0.0),
+        ([5.0], 99, 5.0),
+        ([1.0, 2.0, 3.0, 4.0], 50, 2.5),
+        ([float(i) for i in range(1, 101)], 95, 95.05),
+    ]
+)
+def test_percentile(values, q, expected):
+    assert percentile(values, q) == pytest.approx(expected)
+
+def test_parse_statement_counts():
+    exposition = "\n".join([
+        '# TYPE http_request_db_statements histogram',
+        'http_request_db_statements_bucket{route="GET /bugs",le="2"} 3',
+        'http_request_db_statements_sum{route="GET /bugs"} 6.0',
+        'http_request_db_statements_count{route="GET /bugs"} 3',
+        'http_request_db_seconds_sum{route="GET /bugs"} 0.01',
+    ])
+    assert parse_statement_counts(exposition) == {"GET /bugs": (6.0, 3.0)}
+
+def test_compare_results_flags_regressions():
+    def scenario(p95, throughput, statements=1.0, errors=0):
+        return {"p95_ms": p95, "throughput_rps": throughput, "sql_statements_per_request": statements,
+                "errors": errors}
+
+    baseline = {"scenarios": {"stable": scenario(10, 100), "slower": scenario(10, 100),
+                              "chattier": scenario(10, 100, 1.0), "failing": scenario(10, 100)}}
+    current = {"scenarios": {"stable": scenario(10.5, 98), "slower": scenario(15, 70),
+                             "chattier": scenario(10, 100, 3.0), "failing": scenario(10, 100, errors=2),
+                             "new": scenario(10, 100)}}
+
+    rows = {row["scenario"]: row for row in compare_results(baseline, current, threshold=0.1)}
+    assert {name for name, row in rows.items() if row["regression"]} == {"slower", "chattier", "failing"}
+    assert rows["slower"]["p95_change"] == pytest.approx(0.5)
+    assert rows["new"]["p95_change"] is None
+
+def test_seed_database(session_client):
+    seed_database(engine, 500, seed=1)
+
+    assert session_client.scalar(select(func.count()).select_from(Bug)) == 500
+    assert session_client.scalar(select(func.count()).select_from(Tag)) == len(tag_vocabulary(500))
+    assert session_client.scalar(select(func.count()).select_from(bug_tags)) > 0
+    # Counters match the associations.
+    assert session_client.scalar(select(func.sum(Tag.bug_count))) == \
+        session_client.scalar(select(func.count()).select_from(bug_tags))
+
+def test_create_bug_after_seeding(client):
+    # Seeders insert explicit IDs: new bugs (create_bug scenario) must not collide with them.
+    seed_database(engine, 50, seed=1)
+    response = client.post("/bugs", json=bug_create.model_dump())
+    assert response.status_code == 201
+    assert response.json()["id"] == 51
+
+    seed_similarity_dataset(engine, 20, seed=1)
+    response = client.post("/bugs", json=bug_create.model_dump())
+    assert response.status_code == 201
+    assert response.json()["id"] == 21
+
+def test_run_benchmark_in_process(session_client):
+    seed_database(engine, 200, seed=1)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            return await run_benchmark(client, tag_vocabulary(200), 200, requests=10, concurrency=2,
+                                       only=["list_bugs", "get_bug"])
+
+    results = asyncio.run(run())
+    assert set(results) == {"list_bugs", "get_bug"}
+    assert all(result["requests"] == 10 and result["errors"] == 0 for result in results.values())
+    assert results["list_bugs"]["sql_statements_per_request"] is not None
+
+# 100000 reproduces the reference comparison, the default keeps the suite fast.
+TAG_LOADING_BENCHMARK_BUGS = int(os.getenv("TAG_LOADING_BENCHMARK_BUGS", "500"))
+
+def test_compare_tag_loading(session_client):
+    # 5 to 10 tags per bug.
+    seed_database(engine, TAG_LOADING_BENCHMARK_BUGS, seed=1, tags_per_bug_weights=[0] * 5 + [1] * 6)
+    associations = session_client.scalar(select(func.count()).select_from(bug_tags))
+
+    results = compare_tag_loading(engine, repeat=1)
+    joined, selectin, batched = results["joinedload"], results["selectinload"], results["batched"]
+    assert {result["bugs"] for result in results.values()} == {TAG_LOADING_BENCHMARK_BUGS}
+
+    # The join repeats all bug columns on every tag row; batched strategies fetch each bug once.
+    assert joined["rows_fetched"] == associations
+    assert selectin["rows_fetched"] == batched["rows_fetched"] == TAG_LOADING_BENCHMARK_BUGS + associations
+    assert batched["values_fetched"] <= selectin["values_fetched"] < joined["values_fetched"] / 2
+    assert selectin["peak_memory_mb"] < joined["peak_memory_mb"]
+
+def test_benchmark_similarity(session_client):
+    crashes = seed_similarity_dataset(engine, 2000, seed=1)
+    results = benchmark_similarity(engine, crashes, lookups=20)
+
+    assert results["indexing"]["bugs"] == 2000
+    assert results["duplicate_lookup"]["recall"] >= 0.9
+    assert results["unrelated_lookup"]["false_positives"] == 0
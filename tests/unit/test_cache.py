@@ -0,0 +1,98 @@
+from app.services.cache import LRUCacheBackend, ResponseCache, TagIdCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUCacheBackend(max_entries=2, ttl_seconds=60)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    assert backend.get("a") == b"1"
+
+    backend.set("c", b"3")
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+    assert backend.stats()["evictions"] == 1
+
+def test_lru_backend_expires_entries():
+    clock = FakeClock()
+    backend = LRUCacheBackend(max_entries=10, ttl_seconds=5, clock=clock)
+    backend.set("a", b"1")
+
+    clock.now = 4.9
+    assert backend.get("a") == b"1"
+    clock.now = 5.0
+    assert backend.get("a") is None
+    assert backend.stats() == {"entries": 0, "evictions": 0, "expirations": 1}
+
+def test_response_cache_read_through():
+    cache = ResponseCache(LRUCacheBackend(), "test")
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return b"body"
+
+    assert cache.get_or_load(1, loader) == b"body"
+    assert cache.get_or_load(1, loader) == b"body"
+    assert len(loads) == 1
+    assert cache.get_or_load(2, lambda: None) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+
+def test_response_cache_skips_store_after_concurrent_invalidation():
+    cache = ResponseCache(LRUCacheBackend(), "test")
+
+    value, token = cache.lookup(1)
+    assert value is None
+    cache.invalidate(1)
+    cache.store(1, b"stale", token)
+
+    assert cache.lookup(1)[0] is None
+
+def test_response_cache_drops_store_racing_an_invalidation():
+    class RacingBackend(LRUCacheBackend):
+        def set_if_version(self, key, value, version):
+            # The invalidation runs (and deletes the key) right before the write.
+            cache.invalidate(1)
+            super().set_if_version(key, value, version)
+
+    cache = ResponseCache(RacingBackend(), "test")
+    value, token = cache.lookup(1)
+    cache.store(1, b"stale", token)
+
+    assert cache.lookup(1)[0] is None
+
+def test_response_cache_skips_store_after_invalidation_by_another_worker():
+    # Workers have their own ResponseCache, the backend is shared (like Redis).
+    backend = LRUCacheBackend()
+    loading, writing = ResponseCache(backend, "test"), ResponseCache(backend, "test")
+
+    value, token = loading.lookup(1)
+    writing.invalidate(1)
+    loading.store(1, b"stale", token)
+    assert loading.lookup(1)[0] is None
+
+    value, token = loading.lookup(1)
+    loading.store(1, b"fresh", token)
+    assert writing.lookup(1)[0] == b"fresh"
+
+def test_tag_id_cache_lru():
+    cache = TagIdCache(max_entries=2)
+    cache.put_many({"a": 1, "b": 2})
+    assert cache.get_many(["a", "c"]) == {"a": 1}
+
+    cache.put_many({"c": 3})
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["evictions"]) == (3, 2, 2, 1)
+
+    cache.clear()
+    assert cache.get_many(["a"]) == {}
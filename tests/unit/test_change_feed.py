@@ -0,0 +1,154 @@
+import asyncio
+import json
+
+from app.schemas.bug import ChangeType
+from app.services.change_feed import ChangeFeed, format_sse
+
+
+async def take(events, count):
+    return [await asyncio.wait_for(anext(events), 1) for _ in range(count)]
+
+def test_change_feed_fan_out():
+    async def run():
+        feed = ChangeFeed()
+        first, second = feed.subscribe(), feed.subscribe()
+        feed.publish(ChangeType.CREATED, [1, 2])
+        feed.publish(ChangeType.DELETED, [1])
+
+        received = await take(first, 3)
+        assert [json.loads(event.data) for event in received] == [
+            {"id": f"{feed.generation}-1", "type": "created", "bug_id": 1},
+            {"id": f"{feed.generation}-2", "type": "created", "bug_id": 2},
+            {"id": f"{feed.generation}-3", "type": "deleted", "bug_id": 1},
+        ]
+        assert [event.id for event in await take(second, 3)] == [event.id for event in received]
+
+    asyncio.run(run())
+
+def test_change_feed_resume_and_reset():
+    async def run():
+        feed = ChangeFeed(history_size=3)
+        feed.publish(ChangeType.CREATED, [1, 2, 3, 4])
+
+        resumed = feed.subscribe(f"{feed.generation}-2")
+        assert [event.sequence for event in await take(resumed, 2)] == [3, 4]
+
+        # Event 1 is gone from the history, events of another process are unknown.
+        for last_event_id in (f"{feed.generation}-0", "other-3", "garbage"):
+            reset, = await take(feed.subscribe(last_event_id), 1)
+            assert reset.type == ChangeType.RESET
+
+        feed.publish(ChangeType.UPDATED, [4])
+        assert [event.sequence for event in await take(resumed, 1)] == [5]
+
+    asyncio.run(run())
+
+def test_change_feed_drops_slow_subscriber():
+    async def run():
+        feed = ChangeFeed(queue_size=2)
+        slow, fast = feed.subscribe(), feed.subscribe()
+        await asyncio.sleep(0)
+        for bug_id in range(3):
+            feed.publish(ChangeType.CREATED, [bug_id])
+            await take(fast, 1)
+        await asyncio.sleep(0)
+
+        # The overflowed stream ends, it resumes from the history when the client reconnects.
+        assert [event async for event in slow] == []
+        assert feed.stats()["dropped_subscribers"] == 1
+        resumed = feed.subscribe(f"{feed.generation}-1")
+        assert [event.sequence for event in await take(resumed, 2)] == [2, 3]
+
+    asyncio.run(run())
+
+def test_change_feed_heartbeat_and_sse_format():
+    async def run():
+        feed = ChangeFeed()
+        events = feed.subscribe(heartbeat=0.01)
+        assert await take(events, 1) == [None]
+        feed.publish(ChangeType.UPDATED, [7])
+        event, = await take(events, 1)
+        return event
+
+    event = asyncio.run(run())
+    assert format_sse(None) == b": heartbeat\n\n"
+    assert format_sse(event) == (
+        b"id: %s\nevent: updated\ndata: %s\n\n" % (event.id.encode(), event.data)
+    )
+
+class FakeConnection:
+    def __init__(self, notifications):
+        self.notifications = notifications
+        self.listener = None
+        self.termination_listener = None
+        self.closed = False
+        self.fail = False
+
+    async def add_listener(self, channel, callback):
+        self.listener = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listener = callback
+
+    async def execute(self, query, channel, payload):
+        if self.fail:
+            raise OSError("connection reset")
+        self.notifications.append(json.loads(payload))
+        asyncio.get_running_loop().call_soon(self.listener, self, 1, channel, payload)
+
+    def is_closed(self):
+        return self.closed
+
+    def terminate(self):
+        self.closed = True
+
+    async def close(self):
+        self.closed = True
+
+def test_postgres_relay_falls_back_and_reconnects(monkeypatch):
+    import asyncpg
+
+    from app.services import change_feed
+
+    async def run():
+        notifications, connections = [], []
+
+        async def connect(dsn):
+            connections.append(FakeConnection(notifications))
+            return connections[-1]
+
+        monkeypatch.setattr(asyncpg, "connect", connect)
+        monkeypatch.setattr(change_feed, "RELAY_RECONNECT_DELAY_SECONDS", 0.01)
+        feed = ChangeFeed()
+        relay = change_feed.PostgresChangeRelay(feed, "postgresql://localhost/bugs")
+        await relay.start()
+        events = feed.subscribe()
+        await asyncio.sleep(0)
+
+        feed.publish(ChangeType.CREATED, [1])
+        assert [event.type for event in await take(events, 1)] == [ChangeType.CREATED]
+
+        # A failed notification is dispatched locally, after a RESET: changes of other processes are missed.
+        connections[0].fail = True
+        feed.publish(ChangeType.UPDATED, [1])
+        assert [event.type for event in await take(events, 2)] == [ChangeType.RESET, ChangeType.UPDATED]
+        assert connections[0].closed
+        feed.publish(ChangeType.DELETED, [1])
+        assert [event.type for event in await take(events, 1)] == [ChangeType.DELETED]
+
+        # Reconnected: a RESET is broadcast to the processes that missed the local changes.
+        assert [event.type for event in await take(events, 1)] == [ChangeType.RESET]
+        assert len(connections) == 2 and notifications[-1]["type"] == "reset"
+
+        # The connection is closed by the server.
+        connections[1].closed = True
+        connections[1].termination_listener(connections[1])
+        feed.publish(ChangeType.CREATED, [2])
+        assert [event.type for event in await take(events, 3)] == [ChangeType.RESET, ChangeType.CREATED,
+                                                                   ChangeType.RESET]
+        assert len(connections) == 3
+
+        await relay.stop()
+        assert feed.relay is None and connections[2].closed
+
+    asyncio.run(run())
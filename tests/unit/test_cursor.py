@@ -0,0 +1,23 @@
+import pytest
+from datetime import datetime, timezone
+from app.utils.cursor import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor) == (created_at, 42)
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "WzEsMl0"])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor!"):
+        decode_cursor(cursor)
+
+@pytest.mark.parametrize("sort_value, sort_type", [("name", str), (7, int)])
+def test_cursor_round_trip_sort_types(sort_value, sort_type):
+    assert decode_cursor(encode_cursor(sort_value, 3), sort_type) == (sort_value, 3)
+
+def test_decode_cursor_wrong_sort_type():
+    with pytest.raises(ValueError, match="Invalid cursor!"):
+        decode_cursor(encode_cursor("name", 3), int)
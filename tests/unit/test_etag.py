@@ -0,0 +1,28 @@
+import pytest
+from datetime import datetime, timezone
+from app.utils.etag import bug_etag, version_etag, etag_matches
+
+
+def test_bug_etag_naive_is_utc():
+    updated_at = datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+
+    assert bug_etag(1, updated_at) == bug_etag(1, updated_at.replace(tzinfo=None))
+    assert bug_etag(1, updated_at) != bug_etag(2, updated_at)
+    assert bug_etag(1, updated_at) != bug_etag(1, updated_at.replace(microsecond=679))
+
+def test_version_etag():
+    assert version_etag("bugs", [1, 2]) == version_etag("bugs", (1, 2))
+    assert version_etag("bugs", [1, 2]) != version_etag("bugs", [2, 1])
+    assert version_etag("bugs", []).startswith('"bugs-')
+
+@pytest.mark.parametrize("header, weak, expected", [
+    (None, True, False),
+    ('"a"', False, True),
+    ('"b", "a"', False, True),
+    ('"b"', True, False),
+    ("*", False, True),
+    ('W/"a"', True, True),
+    ('W/"a"', False, False),
+])
+def test_etag_matches(header, weak, expected):
+    assert etag_matches(header, '"a"', weak) is expected
@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine, delete, inspect, select
+
+from app.db.init_db import init_db
+from app.db.session import enable_sqlite_foreign_keys
+from app.models.association import bug_tags
+from app.models.bug import Bug
+from app.models.tag import Tag
+from app.schemas.bug import Status, Priority, Severity
+
+
+def test_sqlite_migrations_upgrade_old_schema(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    enable_sqlite_foreign_keys(bind)
+    # Tables as created before tags.bug_count and the ON DELETE CASCADE of bug_tags.bug_id.
+    Bug.__table__.create(bind)
+    with bind.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE tags (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE)")
+        connection.exec_driver_sql(
+            "CREATE TABLE bug_tags (bug_id INTEGER REFERENCES bugs (id), tag_id INTEGER REFERENCES tags (id), "
+            "PRIMARY KEY (bug_id, tag_id))"
+        )
+        bug = {"title": "Bug", "description": "desc", "status": Status.OPEN, "priority": Priority.LOW,
+               "severity": Severity.MINOR, "submitter": "old"}
+        connection.execute(Bug.__table__.insert(), [bug, bug])
+        connection.exec_driver_sql("INSERT INTO tags (id, name) VALUES (1, 'a'), (2, 'b')")
+        connection.exec_driver_sql("INSERT INTO bug_tags (bug_id, tag_id) VALUES (1, 1), (1, 2), (2, 1)")
+
+    init_db(bind)
+    init_db(bind)
+
+    with bind.begin() as connection:
+        assert dict(connection.execute(select(Tag.name, Tag.bug_count)).all()) == {"a": 2, "b": 1}
+        assert "ix_bug_tags_tag_id_bug_id" in {index["name"] for index in inspect(connection).get_indexes("bug_tags")}
+        connection.execute(delete(Bug).where(Bug.id == 1))
+        assert connection.execute(select(bug_tags.c.bug_id, bug_tags.c.tag_id)).all() == [(2, 1)]
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from app.db.pool import InstrumentedQueuePool, pool_stats, engine_options
+
+
+@pytest.fixture
+def instrumented_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+def test_pool_stats_records_checkouts(instrumented_engine):
+    with instrumented_engine.connect():
+        stats = pool_stats(instrumented_engine.pool)
+        assert stats["checked_out"] == 1
+
+    stats = pool_stats(instrumented_engine.pool)
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert stats["checked_out"] == 0
+    assert stats["wait_time"]["count"] == 1
+    assert stats["wait_time"]["buckets"]["+Inf"] == 1
+    assert stats["checkout_failures"] == 0
+
+def test_pool_stats_records_timeouts(instrumented_engine):
+    with instrumented_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            instrumented_engine.connect()
+
+    stats = pool_stats(instrumented_engine.pool)
+    assert stats["checkout_failures"] == 1
+    assert stats["checkout_timeouts"] == 1
+
+def test_engine_options_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "true")
+
+    options = engine_options("postgresql://user:pass@db:5432/appdb")
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 10
+    assert options["pool_pre_ping"] is True
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert engine_options("sqlite:///bugs.db") == {}
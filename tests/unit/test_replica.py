@@ -0,0 +1,73 @@
+import time
+
+from fastapi import FastAPI, HTTPException
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from app.db.replica import ReplicaRouter, ReadYourWritesMiddleware, READ_PRIMARY_COOKIE
+from tests.conftest import engine
+
+primary = sessionmaker(bind=engine)
+replica = sessionmaker(bind=engine)
+
+
+def request(cookie: str = "") -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [(b"cookie", cookie.encode())]})
+
+def test_replica_router_without_replica():
+    assert ReplicaRouter(primary).session_factory(request()) is primary
+
+def test_replica_router_read_your_writes():
+    router = ReplicaRouter(primary, replica)
+
+    assert router.session_factory(request()) is replica
+    assert router.session_factory(request(f"{READ_PRIMARY_COOKIE}={time.time() + 5}")) is primary
+    assert router.session_factory(request(f"{READ_PRIMARY_COOKIE}={time.time() - 5}")) is replica
+    assert router.session_factory(request(f"{READ_PRIMARY_COOKIE}=garbage")) is replica
+
+    stats = router.stats()
+    assert (stats["replica_reads"], stats["primary_reads"]) == (3, 1)
+    assert stats["primary_reasons"] == {"read_your_writes": 1, "lag": 0}
+    # Not a standby: no lag.
+    assert stats["lag_seconds"] == 0.0
+
+def test_replica_router_lag(monkeypatch):
+    router = ReplicaRouter(primary, replica, max_lag=5, lag_check_interval=60)
+    measurements = iter([10.0, 0.0])
+    monkeypatch.setattr(router, "measure_lag", lambda: next(measurements))
+
+    # Lag is measured once per interval, a lagging replica is skipped.
+    assert router.session_factory(request()) is primary
+    assert router.session_factory(request()) is primary
+    assert router.stats()["primary_reasons"]["lag"] == 2
+
+    router.lag_check_interval = 0
+    assert router.session_factory(request()) is replica
+
+    # Unknown lag (replica unreachable) is treated as too much lag.
+    monkeypatch.setattr(router, "measure_lag", lambda: None)
+    assert router.session_factory(request()) is primary
+    assert "db_replica_lag_seconds NaN" in router.render()
+
+def test_read_your_writes_middleware():
+    app = FastAPI()
+
+    @app.get("/items")
+    def read():
+        return []
+
+    @app.post("/items")
+    def write(fail: bool = False):
+        if fail:
+            raise HTTPException(status_code=409)
+        return {}
+
+    client = TestClient(ReadYourWritesMiddleware(app, seconds=5))
+    assert READ_PRIMARY_COOKIE not in client.get("/items").cookies
+    assert READ_PRIMARY_COOKIE not in client.post("/items", params={"fail": True}).cookies
+
+    started = time.time()
+    response = client.post("/items")
+    assert started + 5 <= float(response.cookies[READ_PRIMARY_COOKIE]) <= time.time() + 5
+    assert "Max-Age=5" in response.headers["set-cookie"]
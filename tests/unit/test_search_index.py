@@ -0,0 +1,57 @@
+from app.services.search_index import InvertedIndex, tokenize
+
+
+def build_index():
+    index = InvertedIndex()
+    index.built = True
+    index.add(1, "Login crash", "App crashes on login")
+    index.add(2, "Slow page", "Login page is slow")
+    index.add(3, "Crash report", "Crash crash crash")
+    return index
+
+def test_tokenize():
+    assert tokenize("Crash on LOGIN, again!") == ["crash", "on", "login", "again"]
+
+def test_inverted_index_search():
+    index = build_index()
+
+    assert [bug_id for bug_id, _ in index.search("crash")] == [3, 1]
+    assert [bug_id for bug_id, _ in index.search("login crash")] == [1]
+    assert index.search("unknown") == []
+    assert index.search("   ") == []
+
+def test_inverted_index_update_and_remove():
+    index = build_index()
+
+    index.add(2, "Crash when slow", "")
+    assert {bug_id for bug_id, _ in index.search("crash")} == {1, 2, 3}
+    assert [bug_id for bug_id, _ in index.search("login")] == [1]
+
+    index.remove(3)
+    assert {bug_id for bug_id, _ in index.search("crash")} == {1, 2}
+
+def test_inverted_index_not_built_ignores_writes():
+    index = InvertedIndex()
+    index.add(1, "Login crash", "")
+    index.built = True
+    assert index.search("crash") == []
+
+def test_inverted_index_keeps_writes_made_during_build():
+    index = InvertedIndex()
+
+    class Session:
+        def execute(self, stmt):
+            # Committed after the SELECT read the table: only known from the services' calls.
+            index.add(2, "Crash on save", "")
+            index.remove(1)
+            return self
+
+        def all(self):
+            return [(1, "Login crash", ""), (3, "Slow page", "")]
+
+    index.build(Session())
+    assert index.built
+    assert [bug_id for bug_id, _ in index.search("crash")] == [2]
+
+    index.add(4, "Another crash", "")
+    assert {bug_id for bug_id, _ in index.search("crash")} == {2, 4}
@@ -0,0 +1,38 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.schemas.bug import BugResponse, Status, Priority, Severity
+from app.utils import serialization
+from app.utils.serialization import FastJSONResponse, dump_json
+
+bug = {
+    "id": 1,
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+    "submitter": "system",
+    "title": "Title",
+    "description": "Description",
+    "status": Status.IN_PROGRESS,
+    "priority": Priority.HIGH,
+    "severity": Severity.MINOR,
+    "assigned_to": None,
+    "tags": [{"id": 1, "name": "tag"}],
+}
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dump_json_matches_pydantic(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    assert dump_json([bug]) == b"[" + BugResponse.model_validate(bug).model_dump_json().encode() + b"]"
+
+def test_fast_json_response():
+    assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
+    response = FastJSONResponse({"items": [bug], "next_cursor": None}, headers={"ETag": '"x"'})
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)["items"][0]["status"] == "IN PROGRESS"
+    assert response.headers["ETag"] == '"x"'
@@ -0,0 +1,49 @@
+from sqlalchemy import insert, select, func
+
+from app.models.bug import Bug
+from app.models.bug_similarity import bug_similarity_buckets
+from app.schemas.bug import Status, Priority, Severity
+from app.services.similarity import shingles, jaccard, lsh_buckets, backfill_similarity_index, BANDS
+from tests.conftest import engine
+
+CRASH = ("Crash in renderer at 0x7ffe12", "Segfault in paint() while scrolling the timeline view, pid 4242")
+
+
+def test_shingles_ignore_numbers_and_case():
+    assert shingles(*CRASH) == shingles("crash in RENDERER at 0x00aa01", CRASH[1].replace("4242", "17"))
+    assert shingles("Crash", "") == shingles("crash", None) != set()
+    assert shingles("", "") == set()
+
+def test_jaccard():
+    first, second = shingles("login page broken", ""), shingles("login page slow", "")
+    assert jaccard(first, first) == 1.0
+    assert jaccard(first, second) == 1 / 3
+    assert jaccard(first, set()) == 0.0
+
+def test_lsh_buckets_of_near_duplicates_collide():
+    buckets = lsh_buckets(shingles(*CRASH))
+    assert len(buckets) == BANDS
+    assert buckets == lsh_buckets(shingles(*CRASH))
+
+    near = lsh_buckets(shingles("Crash in renderer at 0x1", CRASH[1] + " again"))
+    unrelated = lsh_buckets(shingles("Export to CSV drops the header", "Columns are shifted by one"))
+    assert set(buckets) & set(near)
+    assert not set(buckets) & set(unrelated)
+    assert lsh_buckets(set()) == []
+
+def test_backfill_similarity_index(session_client):
+    bug = {"status": Status.OPEN, "priority": Priority.LOW, "severity": Severity.MINOR, "submitter": "loader"}
+    session_client.execute(insert(Bug), [
+        {**bug, "title": CRASH[0], "description": CRASH[1]},
+        {**bug, "title": "!!!", "description": "..."},
+        {**bug, "title": "Export broken", "description": "CSV export fails"},
+    ])
+    session_client.commit()
+
+    assert backfill_similarity_index(engine, batch_size=2) == 3
+    indexed = session_client.execute(
+        select(bug_similarity_buckets.c.bug_id, func.count()).group_by(bug_similarity_buckets.c.bug_id)
+    ).all()
+    # The bug without words has no buckets.
+    assert dict(indexed) == {1: BANDS, 3: BANDS}
+    assert backfill_similarity_index(engine) == 1
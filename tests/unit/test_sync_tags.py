@@ -1,9 +1,17 @@
+import threading
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from app.models.bug import Bug
-from app.schemas.bug import Status, Priority, Severity
-from app.services.bug import sync_tags, get_bug_by_id
+from app.models.tag import Tag
+from app.schemas.bug import Status, Priority, Severity, BugCreate
+from app.services.bug import sync_tags, get_bug_by_id, create_bug
 from app.services.helpers import Operation
-from app.services.tag import get_all_tags
+from app.services.cache import tag_id_cache
+from app.services.tag import get_all_tags, resolve_tag_ids, warm_tag_id_cache
+from tests.conftest import SessionLocal
 
 @pytest.mark.parametrize(
     ("bug_orm", "tags", "expected_tags", "expected_ids"),
@@ -88,3 +96,80 @@ def test_sync_tags_put_duplicate(session_client):
         expected_tags=["tags", "put", "duplicate"],
         expected_ids=[1, 2, 3],
     )
+
+def test_resolve_tag_ids(session_client):
+    first = resolve_tag_ids(session_client, ["alpha", "beta", "alpha"])
+    session_client.commit()
+    assert set(first) == {"alpha", "beta"}
+
+    second = resolve_tag_ids(session_client, ["beta", "gamma"])
+    session_client.commit()
+    assert second["beta"] == first["beta"]
+    assert {tag.name: tag.id for tag in get_all_tags(session_client)} == {**first, **second}
+
+    assert resolve_tag_ids(session_client, []) == {}
+
+def test_sync_tags_concurrent_new_tags(session_client, sql_statements):
+    writers, tag_names = 8, ["shared", "concurrent", "new"]
+    barrier = threading.Barrier(writers)
+    db_errors, failures = [], []
+
+    def create_with_shared_tags(index):
+        try:
+            with SessionLocal() as session:
+                barrier.wait(timeout=30)
+                try:
+                    create_bug(session, BugCreate(title=f"Bug {index}", description="desc", status=Status.OPEN,
+                                                  priority=Priority.HIGH, severity=Severity.CRITICAL, submitter=None,
+                                                  assigned_to=None, tags=tag_names))
+                except SQLAlchemyError as e:
+                    db_errors.append(e)
+        except BaseException as e:  # noqa: BLE001 - exceptions of threads are lost, reported by the test below
+            failures.append(e)
+            barrier.abort()
+
+    threads = [threading.Thread(target=create_with_shared_tags, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    statements = len(sql_statements)
+
+    if failures:
+        pytest.fail(f"Writer thread failed: {failures[0]!r}")
+    # Concurrent inserts of the same tags must not surface as IntegrityError.
+    assert db_errors == []
+    assert sorted(tag.name for tag in get_all_tags(session_client)) == sorted(tag_names)
+    assert dict(session_client.execute(select(Tag.name, Tag.bug_count)).all()) == {name: writers for name in tag_names}
+    # Per writer at most: tag lookup, tag insert, lookup of tags inserted concurrently, bug, bug_tags, tag counts,
+    # similarity buckets.
+    assert statements <= writers * 7
+
+def test_tag_ids_cached_after_commit_only(session_client):
+    tag_id_cache.clear()
+    bug = Bug(title="Title", description="desc", status=Status.OPEN, priority=Priority.HIGH,
+              severity=Severity.CRITICAL, tags=[])
+    session_client.add(bug)
+    session_client.commit()
+
+    sync_tags(session_client, bug, ["rolled-back"])
+    session_client.rollback()
+    assert tag_id_cache.get_many(["rolled-back"]) == {}
+
+    sync_tags(session_client, bug, ["committed"])
+    session_client.commit()
+    assert tag_id_cache.get_many(["committed"]) == {"committed": bug.tags[0].id}
+
+    # Known tags are attached by ID, without querying the tags table.
+    with patch.object(session_client, "execute", wraps=session_client.execute) as execute:
+        sync_tags(session_client, bug, ["committed"], Operation.PUT)
+    assert execute.call_count == 0
+    assert [tag.name for tag in bug.tags] == ["committed"]
+
+def test_warm_tag_id_cache(session_client):
+    resolve_tag_ids(session_client, ["warm", "cold"])
+    session_client.commit()
+    tag_id_cache.clear()
+
+    warm_tag_id_cache(session_client)
+    assert set(tag_id_cache.get_many(["warm", "cold"])) == {"warm", "cold"}